@@ -0,0 +1,164 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+# Bump when rendering changes the output for the same inputs, so stored artifacts are not reused
+RENDER_VERSION = 1
+DEFAULT_ARTIFACT_STORE_MAX_MB = 1024
+META_FILENAME = ".artifact.json"
+
+# Plan fields that don't affect the rendered document
+VOLATILE_PLAN_KEYS = ("plan_id", "jd_compaction")
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def plan_hash(plan: dict) -> str:
+    """ Hash of the plan content that reaches the document (ids and diagnostics excluded). """
+    content = {k: v for k, v in plan.items() if k not in VOLATILE_PLAN_KEYS}
+    return _sha256(json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False))
+
+
+def artifact_key(resume_hash: str, job_description: str, plan: dict, renderer: str) -> str:
+    """
+    Content address of a generated resume: identical resume file, job description and plan
+    (rendered by the same renderer and render version) always produce the same document.
+    """
+    material = {
+        "resume": resume_hash,
+        "job": _sha256(job_description or ""),
+        "plan": plan_hash(plan),
+        "renderer": renderer,
+        "render_version": RENDER_VERSION,
+    }
+    return _sha256(json.dumps(material, sort_keys=True))
+
+
+class ArtifactStore:
+    """
+    Generated documents on disk, one directory per artifact key holding the document (under
+    its download name) and a metadata file with its strong ETag, size and creation time.
+    The metadata is written last, so an artifact is only visible once complete. Least
+    recently used artifacts are evicted beyond max_bytes.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sizes = None # key -> (last_access, size), loaded on first use
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _meta_path(self, key: str) -> str:
+        return os.path.join(self.directory, key, META_FILENAME)
+
+    def read_meta(self, key: str):
+        """ Returns an artifact's metadata (with its file path), or None. """
+        try:
+            with open(self._meta_path(key), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        meta["path"] = os.path.join(self.directory, key, meta["filename"])
+        return meta if os.path.isfile(meta["path"]) else None
+
+    def get(self, key: str):
+        """ Looks up an artifact for reuse; counts hits and misses and refreshes its recency. """
+        meta = self.read_meta(key)
+        with self._lock:
+            if meta is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._load_sizes()
+            self._sizes[key] = (time.time(), meta["size"])
+        return meta
+
+    def put(self, key: str, content, filename: str) -> dict:
+        """ Stores a rendered document (bytes or buffer) under key and returns its metadata. """
+        directory = os.path.join(self.directory, key)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, filename)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.partial"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+        digest = hashlib.sha256(content).hexdigest()
+        meta = {"filename": filename, "etag": f'"{digest}"', "size": len(memoryview(content)), "created_at": time.time()}
+        temp_meta = f"{self._meta_path(key)}.{os.getpid()}.{threading.get_ident()}.partial"
+        with open(temp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(temp_meta, self._meta_path(key))
+
+        with self._lock:
+            self._load_sizes()
+            self._sizes[key] = (time.time(), meta["size"])
+            self._evict(keep=key)
+        return dict(meta, path=path)
+
+    def _load_sizes(self):
+        if self._sizes is not None:
+            return
+        self._sizes = {}
+        if not os.path.isdir(self.directory):
+            return
+        for entry in os.scandir(self.directory):
+            meta = self.read_meta(entry.name) if entry.is_dir() else None
+            if meta:
+                self._sizes[entry.name] = (meta["created_at"], meta["size"])
+
+    def _evict(self, keep: str):
+        total = sum(size for _, size in self._sizes.values())
+        for key, (_, size) in sorted(self._sizes.items(), key=lambda item: item[1][0]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            del self._sizes[key]
+            total -= size
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._load_sizes()
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._sizes),
+                "bytes": sum(size for _, size in self._sizes.values()),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_artifact_store() -> ArtifactStore:
+    """
+    Returns the process-wide artifact store. Configured through environment variables:
+      ARTIFACT_STORE_DIR     where artifacts are kept (default backend/generated)
+      ARTIFACT_STORE_MAX_MB  disk budget before least recently used artifacts are evicted
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(
+                os.getenv("ARTIFACT_STORE_DIR", "backend/generated"),
+                int(float(os.getenv("ARTIFACT_STORE_MAX_MB", DEFAULT_ARTIFACT_STORE_MAX_MB)) * 1024 * 1024),
+            )
+        return _store
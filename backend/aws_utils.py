@@ -1,4 +1,5 @@
 import boto3
+import io
 import os
 import json
 from botocore.exceptions import ClientError
@@ -47,6 +48,16 @@ def upload_file_to_s3(file_path, object_name):
         print(f"Error uploading to S3: {e}")
         return False
 
+def upload_fileobj_to_s3(fileobj, object_name, content_type=None):
+    # upload_fileobj switches to a multipart upload for large bodies
+    try:
+        extra_args = {"ContentType": content_type} if content_type else None
+        s3_client.upload_fileobj(fileobj, RESUME_BUCKET, object_name, ExtraArgs=extra_args)
+        return True
+    except ClientError as e:
+        print(f"Error uploading to S3: {e}")
+        return False
+
 def get_presigned_url(object_name, expiration=3600):
     try:
         response = s3_client.generate_presigned_url('get_object',
@@ -65,3 +76,14 @@ def download_file_from_s3(object_name, file_path):
     except ClientError as e:
         print(f"Error downloading from S3: {e}")
         return False
+
+def read_s3_object(object_name):
+    """ Downloads an object into memory; returns a BytesIO positioned at the start, or None. """
+    buffer = io.BytesIO()
+    try:
+        s3_client.download_fileobj(RESUME_BUCKET, object_name, buffer)
+    except ClientError as e:
+        print(f"Error downloading from S3: {e}")
+        return None
+    buffer.seek(0)
+    return buffer
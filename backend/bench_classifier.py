@@ -0,0 +1,108 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import io
+import os
+import random
+import sys
+import time
+from docx import Document
+
+# Micro-benchmark for paragraph classification over synthetic 1-30 page resumes.
+# Compares the compiled section classifier with the original inline implementation
+# (kept below as the baseline) and checks both agree on every paragraph.
+# Usage: python backend/bench_classifier.py [pages ...]
+
+try:
+    from section_classifier import get_classifier, LOCALE_VOCABULARIES
+except ImportError:
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from section_classifier import get_classifier, LOCALE_VOCABULARIES
+
+PARAGRAPHS_PER_PAGE = 40
+
+def _legacy_paragraph_info(paragraph, experience_headers, summary_headers, stop_headers):
+    """ The pre-classifier implementation, for comparison. """
+    text = paragraph.text.strip()
+    if not text:
+        return "empty", ""
+    lower_text = text.lower()
+    is_bold = paragraph.runs and paragraph.runs[0].bold
+    is_heading_style = paragraph.style.name.startswith('Heading')
+    is_caps = len(text) < 50 and text.isupper()
+    if is_heading_style or is_caps or (is_bold and len(text) < 50):
+        if any(h in lower_text for h in experience_headers):
+            return "experience_section_header", text
+        if any(h in lower_text for h in summary_headers):
+            return "summary_section_header", text
+        if any(sh in lower_text for sh in stop_headers):
+            return "stop_section_header", text
+    is_bullet = False
+    try:
+        if (paragraph._p.pPr is not None and paragraph._p.pPr.numPr is not None) or \
+           'list' in paragraph.style.name.lower() or text.startswith(('•', '-', '–', '*', '·', '◦')):
+            is_bullet = True
+    except: pass
+    if is_bullet:
+        return "bullet", text
+    return "text", text
+
+def build_synthetic_resume(pages: int, seed: int = 0) -> Document:
+    """ Builds a resume of roughly `pages` pages mixing heading styles, bold/caps headers and bullet kinds. """
+    rng = random.Random(seed)
+    doc = Document()
+    doc.add_paragraph("JANE DOE")
+    doc.add_paragraph("jane@example.com | +1 555 0100")
+    doc.add_heading("Professional Summary", level=1)
+    doc.add_paragraph("Engineer with a decade of experience building distributed systems. " * 3)
+    doc.add_heading("Professional Experience", level=1)
+    words = "designed built migrated led scaled automated reduced improved services pipelines latency costs teams".split()
+    while len(doc.paragraphs) < pages * PARAGRAPHS_PER_PAGE:
+        header = doc.add_paragraph()
+        header.add_run(f"Senior Engineer | Company {len(doc.paragraphs)} | 2019 - 2023").bold = rng.random() < 0.5
+        doc.add_paragraph("Remote, USA")
+        for _ in range(rng.randint(3, 8)):
+            sentence = " ".join(rng.choice(words) for _ in range(rng.randint(8, 20)))
+            kind = rng.random()
+            if kind < 0.6:
+                doc.add_paragraph(sentence.capitalize(), style="List Bullet")
+            elif kind < 0.9:
+                doc.add_paragraph("• " + sentence.capitalize())
+            else:
+                doc.add_paragraph(sentence.capitalize())
+        doc.add_paragraph("")
+    doc.add_heading("Technical Skills", level=1)
+    doc.add_paragraph("Python, Go, Kubernetes, AWS, PostgreSQL")
+    doc.add_paragraph("EDUCATION")
+    doc.add_paragraph("B.S. Computer Science")
+    # Round-trip through bytes so the benchmark sees a parsed document like an upload
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return Document(buffer)
+
+def bench(pages: int, repeat: int = 3):
+    doc = build_synthetic_resume(pages)
+    paragraphs = doc.paragraphs
+    en = LOCALE_VOCABULARIES["en"]
+    classifier = get_classifier()
+
+    legacy_best = new_best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        legacy = [_legacy_paragraph_info(p, en["experience"], en["summary"], en["stop"]) for p in paragraphs]
+        legacy_best = min(legacy_best, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        compiled = classifier.classify_document(doc)
+        new_best = min(new_best, time.perf_counter() - start)
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+    n = len(paragraphs)
+    print(f"{pages:>5} {n:>10} {legacy_best / n * 1e6:>14.1f} {new_best / n * 1e6:>14.1f} "
+          f"{legacy_best / new_best:>8.2f}x {mismatches:>11}")
+
+if __name__ == "__main__":
+    page_counts = [int(p) for p in sys.argv[1:]] or [1, 2, 5, 10, 20, 30]
+    print(f"{'pages':>5} {'paragraphs':>10} {'legacy us/para':>14} {'new us/para':>14} {'speedup':>9} {'mismatches':>11}")
+    for pages in page_counts:
+        bench(pages)
@@ -0,0 +1,132 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import io
+import json
+import os
+import random
+import resource
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from docx import Document
+from docx.shared import Inches
+
+# Benchmark: python-docx renderer vs streaming document.xml renderer vs cached template vs
+# incremental re-render of the last rendition, rendering several variants of one large
+# document (each variant edits one paragraph, like a plan tweak in the preview UI). Each renderer runs in a fresh
+# subprocess so peak RSS (VmHWM) is measured per renderer.
+# Usage: python backend/bench_render.py [pages] [images] [image_megapixels] [variants]
+
+try:
+    from resume_index import build_resume_index, compute_edits, plan_skeleton_from_index
+except ImportError:
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from resume_index import build_resume_index, compute_edits, plan_skeleton_from_index
+
+def _noise_png(width: int, height: int, seed: int) -> bytes:
+    """ A valid, incompressible RGB PNG (think headshots or scanned logos). """
+    rng = random.Random(seed)
+    row = width * 3
+    raw = b"".join(b"\x00" + rng.randbytes(row) for _ in range(height))
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+def build_large_resume(path: str, pages: int, images: int, megapixels: float):
+    rng = random.Random(0)
+    doc = Document()
+    side = int((megapixels * 1_000_000) ** 0.5)
+    for i in range(images):
+        doc.add_picture(io.BytesIO(_noise_png(side, side, i)), width=Inches(1.5))
+    doc.add_heading("Professional Summary", level=1)
+    doc.add_paragraph("Engineer with a decade of experience building distributed systems.")
+    doc.add_heading("Professional Experience", level=1)
+    words = "designed built migrated led scaled automated reduced improved services pipelines latency costs".split()
+    while len(doc.paragraphs) < pages * 40:
+        doc.add_paragraph(f"Senior Engineer | Company {len(doc.paragraphs)} | 2019 - 2023")
+        for _ in range(6):
+            doc.add_paragraph(" ".join(rng.choice(words) for _ in range(14)).capitalize(), style="List Bullet")
+    doc.add_heading("Education", level=1)
+    doc.add_paragraph("B.S. Computer Science")
+    doc.save(path)
+
+def _peak_rss_kb() -> int:
+    """ Peak RSS of this process. ru_maxrss survives exec on Linux, VmHWM does not. """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def _child(renderer: str, original: str, edits_path: str, output: str, variants: str):
+    """ Renders the variants and reports wall time and peak RSS as JSON. """
+    with open(edits_path) as f:
+        edits = {int(k): v for k, v in json.load(f).items()}
+    from resume_generator import apply_edits, render_template
+    from docx_stream_renderer import render_docx
+    from template_cache import get_template
+    baseline_kb = _peak_rss_kb()
+    start = time.perf_counter()
+    for variant in range(int(variants)):
+        # Vary one paragraph so each render is a distinct document
+        variant_edits = {**edits, min(edits): f"Variant {variant}"}
+        if renderer == "python-docx":
+            doc = Document(original)
+            apply_edits(doc, variant_edits)
+            doc.save(output)
+        elif renderer == "stream":
+            render_docx(original, variant_edits, output)
+        elif renderer == "incremental":
+            render_template(get_template(original), variant_edits, output, rendition_key="bench")
+        else:
+            get_template(original).render(variant_edits, output)
+    elapsed = time.perf_counter() - start
+    peak_kb = _peak_rss_kb()
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": peak_kb / 1024, "delta_rss_mb": (peak_kb - baseline_kb) / 1024}))
+
+def main(pages: int, images: int, megapixels: float, variants: int):
+    workdir = tempfile.mkdtemp(prefix="bench_render_")
+    original = os.path.join(workdir, "large.docx")
+    build_large_resume(original, pages, images, megapixels)
+
+    index = build_resume_index(original)
+    plan = plan_skeleton_from_index(index)
+    plan["summary"]["optimized"] = "Tailored summary for the target role."
+    for entry in plan["experience_entries"]:
+        entry["optimized_bullets"] = [f"Tailored: {b}" for b in entry["bullets"]] + ["Added bullet one", "Added bullet two"]
+    edits = compute_edits(index, plan)
+    edits_path = os.path.join(workdir, "edits.json")
+    with open(edits_path, "w") as f:
+        json.dump(edits, f)
+
+    print(f"Document: {os.path.getsize(original) / 1e6:.1f} MB, {index['paragraph_count']} paragraphs, "
+          f"{images} images, {len(edits)} edits, {variants} variants")
+    print(f"{'renderer':>12} {'seconds':>8} {'ms/variant':>11} {'peak RSS MB':>12} {'render RSS MB':>14}")
+    outputs = {}
+    for renderer in ("python-docx", "stream", "template", "incremental"):
+        outputs[renderer] = os.path.join(workdir, f"out_{renderer}.docx")
+        result = subprocess.run([sys.executable, __file__, "--child", renderer, original, edits_path, outputs[renderer], str(variants)],
+                                capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{renderer:>12} {stats['seconds']:>8.2f} {stats['seconds'] / variants * 1000:>11.1f} "
+              f"{stats['peak_rss_mb']:>12.1f} {stats['delta_rss_mb']:>14.1f}")
+
+    texts = [[p.text for p in Document(path).paragraphs] for path in outputs.values()]
+    print("Outputs equivalent:", all(t == texts[0] for t in texts))
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(*sys.argv[2:7])
+    else:
+        args = sys.argv[1:]
+        main(int(args[0]) if args else 30, int(args[1]) if len(args) > 1 else 6,
+             float(args[2]) if len(args) > 2 else 4.0, int(args[3]) if len(args) > 3 else 10)
@@ -0,0 +1,119 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+import os
+import random
+import re
+import sys
+import time
+from bs4 import BeautifulSoup
+
+# Benchmark: job page extraction time per page, on the offline fixture corpus padded to the
+# size of real job board pages (inline bundles, tracking JSON and "similar jobs" markup).
+# Compares the original BeautifulSoup html.parser pipeline (kept below as the baseline) with
+# the JSON-LD / site-adapter extractor.
+# Usage: python backend/bench_scraper.py [page_kb] [repeat]
+
+try:
+    from job_extractors import clean_company_name, company_from_slug, extract_job_posting
+except ImportError:
+    sys.path.append(os.path.join(os.getcwd(), 'backend'))
+    from job_extractors import clean_company_name, company_from_slug, extract_job_posting
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "job_pages")
+
+def _legacy_find_hiring_organization(data):
+    if isinstance(data, list):
+        for item in data:
+            name = _legacy_find_hiring_organization(item)
+            if name:
+                return name
+    elif isinstance(data, dict):
+        if "@graph" in data:
+            return _legacy_find_hiring_organization(data["@graph"])
+        org = data.get("hiringOrganization")
+        if isinstance(org, list) and org:
+            org = org[0]
+        if isinstance(org, dict):
+            return clean_company_name(org.get("name"))
+        return clean_company_name(org)
+    return None
+
+def _legacy_extract(content: bytes, url: str) -> dict:
+    """ The pre-adapter implementation (full html.parser soup for every page), for comparison. """
+    soup = BeautifulSoup(content, 'html.parser')
+    company_name = None
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            company_name = _legacy_find_hiring_organization(json.loads(script.string or ""))
+        except (ValueError, TypeError):
+            continue
+        if company_name:
+            break
+    if not company_name:
+        org_link = soup.find(class_="topcard__org-name-link") or \
+                   soup.find(class_="top-card-layout__company-name") or \
+                   soup.find(attrs={"data-testid": "company-name"})
+        company_name = clean_company_name(org_link.get_text(strip=True)) if org_link else None
+    if not company_name:
+        og_title = soup.find("meta", property="og:title")
+        title = (og_title.get("content") if og_title else None) or (soup.title.string if soup.title else None) or ""
+        match = re.match(r"^(.+?) hiring ", title) or re.search(r" at ([^|]+?)\s*(\||$)", title)
+        company_name = clean_company_name(match.group(1)) if match else None
+    company_name = company_name or company_from_slug(url)
+
+    job_container = soup.find(class_="description__text") or \
+                    soup.find(class_="show-more-less-html__markup") or \
+                    soup.find(class_="jobs-description__content") or \
+                    soup.find("article")
+    if job_container:
+        text = job_container.get_text(separator='\n', strip=True)
+    else:
+        for script in soup(["script", "style", "header", "footer", "nav"]):
+            script.decompose()
+        text = soup.get_text(separator='\n', strip=True)
+    return {"company_name": company_name, "description": text[:50000]}
+
+def pad_page(content: bytes, target_bytes: int, seed: int = 0) -> bytes:
+    """ Grows a page to target_bytes with the bulk real job pages carry around the posting. """
+    rng = random.Random(seed)
+    words = "engineer senior remote hybrid platform data backend cloud staff lead analyst manager".split()
+    bundle = b"<script>window.__bundle=" + json.dumps({"modules": [rng.randbytes(48).hex() for _ in range(target_bytes // 200)]}).encode() + b";</script>"
+    cards = []
+    while len(bundle) + sum(map(len, cards)) < target_bytes - len(content):
+        title = " ".join(rng.choice(words) for _ in range(3)).title()
+        cards.append(f'<li class="job-card"><a href="/jobs/view/{rng.randint(10**9, 10**10)}"><h3 class="base-search-card__title">{title}</h3>'
+                     f'<span class="job-card__company">Company {rng.randint(1, 999)}</span></a></li>'.encode())
+    padding = bundle + b'<section class="similar-jobs"><ul>' + b"".join(cards) + b"</ul></section>"
+    end = content.rfind(b"</body>")
+    return content[:end] + padding + content[end:] if end >= 0 else content + padding
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main(page_kb: int, repeat: int):
+    with open(os.path.join(FIXTURES_DIR, "expected.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    print(f"{'page':>26} {'KB':>6} {'source':>9} {'legacy ms':>10} {'adapter ms':>11} {'speedup':>8} {'company agrees':>15}")
+    legacy_total = new_total = 0.0
+    for name, case in sorted(expected.items()):
+        with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+            content = pad_page(f.read(), page_kb * 1024)
+        legacy = _best(lambda: _legacy_extract(content, case["url"]), repeat)
+        new = _best(lambda: extract_job_posting(content, case["url"]), repeat)
+        legacy_total += legacy
+        new_total += new
+        posting = extract_job_posting(content, case["url"])
+        agrees = posting["company_name"] == _legacy_extract(content, case["url"])["company_name"]
+        print(f"{name:>26} {len(content) / 1024:>6.0f} {posting['source']:>9} {legacy * 1000:>10.1f} {new * 1000:>11.1f} "
+              f"{legacy / new:>7.1f}x {str(agrees):>15}")
+    print(f"{'total':>26} {'':>6} {'':>9} {legacy_total * 1000:>10.1f} {new_total * 1000:>11.1f} {legacy_total / new_total:>7.1f}x")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1536, int(args[1]) if len(args) > 1 else 3)
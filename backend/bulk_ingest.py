@@ -0,0 +1,257 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.exc import IntegrityError
+from .database import Base, SessionLocal, engine, migrate_missing_columns
+from .models import JobPost, Plan
+from .scraper import normalize_job_url, validate_url
+from .job_cache import JOB_CACHE_FIELDS, is_fresh, refresh_job_posting
+from .job_dedup import index_job_post
+from .http_client import close_http_client
+
+# Scrapes in flight across all hosts, and per host (with request starts spaced by the interval)
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", 16))
+INGEST_HOST_CONCURRENCY = int(os.getenv("INGEST_HOST_CONCURRENCY", 2))
+INGEST_HOST_INTERVAL = float(os.getenv("INGEST_HOST_INTERVAL", 0.5))
+# Attempts per URL for transient failures, backing off exponentially from the base delay
+INGEST_MAX_ATTEMPTS = int(os.getenv("INGEST_MAX_ATTEMPTS", 3))
+INGEST_RETRY_BASE_SECONDS = float(os.getenv("INGEST_RETRY_BASE_SECONDS", 1.0))
+# Results are written in one transaction per batch, or sooner when results arrive slowly
+INGEST_COMMIT_BATCH = int(os.getenv("INGEST_COMMIT_BATCH", 25))
+INGEST_COMMIT_INTERVAL = float(os.getenv("INGEST_COMMIT_INTERVAL", 1.0))
+# Longest Retry-After honoured before giving up on a URL
+MAX_RETRY_AFTER_SECONDS = 60.0
+# URLs per IN (...) query, well under SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+
+class HostLimiter:
+    """
+    Politeness per host: at most `concurrency` requests in flight to a host, and request
+    starts spaced at least `interval` seconds apart. defer() holds every request to a host
+    back, e.g. after it answered 429 or failed.
+    """
+
+    def __init__(self, concurrency: int, interval: float):
+        self.interval = interval
+        self._slots = defaultdict(lambda: asyncio.Semaphore(concurrency))
+        self._next_start = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        async with self._slots[host]:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+    def defer(self, host: str, delay: float):
+        resume_at = asyncio.get_running_loop().time() + delay
+        self._next_start[host] = max(self._next_start.get(host, 0.0), resume_at)
+
+
+def _backoff(attempt: int, base: float, retry_after: float = None) -> float:
+    """ Exponential backoff with full jitter, or the server's Retry-After when it is longer. """
+    delay = random.uniform(0, base * 2 ** (attempt - 1))
+    return max(delay, min(retry_after or 0.0, MAX_RETRY_AFTER_SECONDS))
+
+
+def _load_stored(urls: list) -> dict:
+    """ url -> (job id, JOB_CACHE_FIELDS) for the URLs already stored. """
+    session = SessionLocal()
+    try:
+        stored = {}
+        for i in range(0, len(urls), LOOKUP_CHUNK):
+            for job in session.query(JobPost).filter(JobPost.url.in_(urls[i:i + LOOKUP_CHUNK])):
+                stored[job.url] = (job.id, {field: getattr(job, field) for field in JOB_CACHE_FIELDS})
+        return stored
+    finally:
+        session.close()
+
+
+def _store_outcomes(outcomes: list) -> dict:
+    """
+    Writes a batch of (url, outcome) results in one transaction, with the same rules as
+    /validate-url: plans are dropped only for changed descriptions, and new or changed
+    descriptions are linked to their near-duplicates. Failed scrapes of new URLs are not
+    stored. Returns url -> job id for the rows written.
+    """
+    writes = [(url, outcome) for url, outcome in outcomes if outcome["fields"] and outcome["status"] != "failed"]
+    if not writes:
+        return {}
+    session = SessionLocal()
+    try:
+        for attempt in range(2):
+            urls = [url for url, _ in writes]
+            jobs = {job.url: job for job in session.query(JobPost).filter(JobPost.url.in_(urls))}
+            for url, outcome in writes:
+                job = jobs.get(url)
+                if outcome["status"] == "changed" and job is not None:
+                    session.query(Plan).filter(Plan.job_id == job.id).delete()
+                if job is None:
+                    job = jobs[url] = JobPost(url=url)
+                    session.add(job)
+                for field, value in outcome["fields"].items():
+                    setattr(job, field, value)
+            try:
+                for url, outcome in writes:
+                    if outcome["status"] in ("new", "changed"):
+                        index_job_post(session, jobs[url])
+                session.commit()
+                return {url: job.id for url, job in jobs.items()}
+            except IntegrityError:
+                # A concurrent /validate-url stored one of these URLs; the re-query updates it instead
+                session.rollback()
+                if attempt:
+                    raise
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+async def _ingest_one(url: str, stored, limiter: HostLimiter, slots: asyncio.Semaphore, results: asyncio.Queue,
+                      max_attempts: int, retry_base: float):
+    """ Refreshes one URL under the host's politeness limits, retrying transient failures; always reports a result. """
+    host = urlparse(url).hostname or ""
+    fields = stored[1] if stored else None
+    attempts = 0
+    try:
+        if fields and fields.get("description") and is_fresh(fields.get("fetched_at")):
+            # Served from the database: no request, so no politeness slot
+            outcome = refresh_job_posting(url, fields)
+        else:
+            while True:
+                attempts += 1
+                async with limiter.slot(host):
+                    async with slots:
+                        outcome = await run_in_threadpool(refresh_job_posting, url, fields)
+                if outcome["status"] != "failed" or not outcome.get("retryable") or attempts >= max_attempts:
+                    break
+                delay = _backoff(attempts, retry_base, outcome.get("retry_after"))
+                limiter.defer(host, delay)
+                await asyncio.sleep(delay)
+    except Exception as e:
+        print(f"DEBUG: Ingesting {url} failed - {e}")
+        outcome = {"status": "failed", "fields": {}, "error": str(e)}
+    await results.put((url, outcome, attempts))
+
+
+async def ingest_urls(urls: list, concurrency: int = INGEST_CONCURRENCY, host_concurrency: int = INGEST_HOST_CONCURRENCY,
+                      host_interval: float = INGEST_HOST_INTERVAL, max_attempts: int = INGEST_MAX_ATTEMPTS,
+                      retry_base: float = INGEST_RETRY_BASE_SECONDS, commit_batch: int = INGEST_COMMIT_BATCH,
+                      commit_interval: float = INGEST_COMMIT_INTERVAL):
+    """
+    Validates, dedupes and scrapes many job URLs concurrently, yielding progress events:
+      {"event": "start", "total", "unique", "invalid", "duplicates"}
+      {"event": "url", "url", "status", "job_id", "attempts", "done", "total"[, "error"][, "duplicate_of"]}
+        one per input URL; status is a job_cache freshness status, or invalid / duplicate
+      {"event": "done", "total", "statuses", "seconds"}
+    URLs are deduplicated after normalize_job_url; stored postings still fresh are served
+    without a request. Scrapes respect per-host concurrency and spacing, transient failures
+    are retried with exponential backoff, and results are committed in batches; a batch
+    that cannot be stored is rolled back and its URLs are reported as failed.
+    """
+    started = time.monotonic()
+    statuses = Counter()
+    unique = {}
+    skipped = []
+    for raw in urls:
+        url = normalize_job_url(raw)
+        if not validate_url(url):
+            skipped.append({"url": raw, "status": "invalid", "job_id": None, "attempts": 0, "error": "Please enter valid URL"})
+        elif url in unique:
+            skipped.append({"url": raw, "status": "duplicate", "job_id": None, "attempts": 0, "duplicate_of": unique[url]})
+        else:
+            unique[url] = raw
+    total = len(urls)
+    yield {"event": "start", "total": total, "unique": len(unique), "invalid": sum(s["status"] == "invalid" for s in skipped),
+           "duplicates": sum(s["status"] == "duplicate" for s in skipped)}
+    done = 0
+    for entry in skipped:
+        done += 1
+        statuses[entry["status"]] += 1
+        yield {"event": "url", **entry, "done": done, "total": total}
+
+    stored = await run_in_threadpool(_load_stored, list(unique))
+    limiter = HostLimiter(host_concurrency, host_interval)
+    slots = asyncio.Semaphore(concurrency)
+    results = asyncio.Queue()
+    tasks = [asyncio.ensure_future(_ingest_one(url, stored.get(url), limiter, slots, results, max_attempts, retry_base))
+             for url in unique]
+    loop = asyncio.get_running_loop()
+    pending = len(tasks)
+    try:
+        while pending:
+            batch = [await results.get()]
+            deadline = loop.time() + commit_interval
+            while len(batch) < min(commit_batch, pending):
+                try:
+                    batch.append(await asyncio.wait_for(results.get(), max(0.0, deadline - loop.time())))
+                except asyncio.TimeoutError:
+                    break
+            pending -= len(batch)
+            try:
+                job_ids = await run_in_threadpool(_store_outcomes, [(url, outcome) for url, outcome, _ in batch])
+            except Exception as e:
+                # The batch was rolled back: report its URLs as failed and carry on with the rest
+                print(f"DEBUG: Storing a batch of {len(batch)} results failed - {e}")
+                batch = [(url, {"status": "failed", "fields": {}, "error": f"Could not store the result: {e}"}, attempts)
+                         for url, _, attempts in batch]
+                job_ids = {}
+            for url, outcome, attempts in batch:
+                done += 1
+                statuses[outcome["status"]] += 1
+                event = {"event": "url", "url": unique[url], "status": outcome["status"],
+                         "job_id": job_ids.get(url) or (stored[url][0] if url in stored else None),
+                         "attempts": attempts, "done": done, "total": total}
+                if outcome["status"] == "failed":
+                    event["error"] = outcome.get("error") or "No job description found"
+                yield event
+    finally:
+        # The client went away mid-stream: stop scraping for it
+        for task in tasks:
+            task.cancel()
+    yield {"event": "done", "total": total, "statuses": dict(statuses), "seconds": round(time.monotonic() - started, 2)}
+
+
+def _read_urls(path: str) -> list:
+    """ One URL per line; blank lines and # comments are skipped. """
+    with (sys.stdin if path == "-" else open(path, encoding="utf-8")) as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+async def _run(args):
+    try:
+        async for event in ingest_urls(_read_urls(args.file), args.concurrency, args.per_host, args.interval,
+                                       args.attempts, commit_batch=args.commit_batch):
+            print(json.dumps(event), flush=True)
+    finally:
+        close_http_client()
+
+
+if __name__ == "__main__":
+    # Usage, from the project root: python -m backend.bulk_ingest urls.txt > progress.ndjson
+    parser = argparse.ArgumentParser(description="Scrape and store job URLs (one per line) into the local database, printing NDJSON progress.")
+    parser.add_argument("file", help="file of URLs, or - for stdin")
+    parser.add_argument("--concurrency", type=int, default=INGEST_CONCURRENCY, help="scrapes in flight across all hosts")
+    parser.add_argument("--per-host", type=int, default=INGEST_HOST_CONCURRENCY, help="scrapes in flight per host")
+    parser.add_argument("--interval", type=float, default=INGEST_HOST_INTERVAL, help="seconds between request starts per host")
+    parser.add_argument("--attempts", type=int, default=INGEST_MAX_ATTEMPTS, help="attempts per URL for transient failures")
+    parser.add_argument("--commit-batch", type=int, default=INGEST_COMMIT_BATCH, help="results per database transaction")
+    Base.metadata.create_all(bind=engine)
+    migrate_missing_columns(engine)
+    asyncio.run(_run(parser.parse_args()))
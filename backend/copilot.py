@@ -1,23 +1,222 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
 import os
-import google.generativeai as genai
+import asyncio
 import json
+from concurrent.futures import ThreadPoolExecutor
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .llm_cache import get_response_cache, make_cache_key
+    from .llm_providers import get_provider
+    from .stream_parser import IncrementalPlanParser
+    from .jd_compactor import compact_job_description, estimate_tokens
+    from .llm_scheduler import get_scheduler, PRIORITY_INTERACTIVE
+except ImportError:
+    from llm_cache import get_response_cache, make_cache_key
+    from llm_providers import get_provider
+    from stream_parser import IncrementalPlanParser
+    from jd_compactor import compact_job_description, estimate_tokens
+    from llm_scheduler import get_scheduler, PRIORITY_INTERACTIVE
+
+MODEL_NAME = 'gemini-flash-latest'
+
+# Bump whenever the batch prompt changes so cached responses from the old prompt are ignored
+PROMPT_TEMPLATE_VERSION = "batch-v1"
+FANOUT_PROMPT_TEMPLATE_VERSION = "fanout-v1"
+
+# Fan-out: resumes whose experience payload exceeds this estimated token budget are split
+# into chunks of at most this size and optimized concurrently.
+FANOUT_CHUNK_TOKEN_BUDGET = int(os.getenv("FANOUT_CHUNK_TOKEN_BUDGET", 1200))
+FANOUT_MAX_WORKERS = int(os.getenv("FANOUT_MAX_WORKERS", 8))
+
+# Job descriptions are compacted to this many tokens before prompting (see jd_compactor).
+# JD_TOKEN_COUNTER=model verifies the budget with the model's token counter, "estimate" stays local.
+JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET", 1500))
+JD_TOKEN_COUNTER = os.getenv("JD_TOKEN_COUNTER", "model")
+
+# Expected response size, charged against the tokens-per-minute quota up front
+EXPECTED_OUTPUT_TOKENS = int(os.getenv("LLM_EXPECTED_OUTPUT_TOKENS", 1000))
+
+def build_batch_prompt(summary_text: str, experience_entries: list[dict], job_description: str) -> str:
+    """
+    Builds the single batched optimization prompt (see PROMPT_TEMPLATE_VERSION).
+    """
+    # Prepare a structured payload for the AI
+    payload = {
+        "summary": summary_text,
+        "entries": [{"id": i, "header": e["header"], "bullets": e["bullets"]} for i, e in enumerate(experience_entries)]
+    }
+
+    prompt = f"""
+    You are a top-tier resume architect. 
+    
+    Job Description:
+    {job_description}
+
+    Current Resume Content (JSON):
+    {json.dumps(payload, indent=2)}
+
+    Task: 
+    1. Identify the hiring company from the Job Description.
+    2. Optimize the "summary" to be a high-impact, 3-4 sentence professional summary targeted at the JD.
+    3. For EACH experience entry:
+       - Optimize the existing bullets for impact and relevance.
+       - ADD 2-3 NEW high-impact bullets that align the candidate's background with the JD (e.g. ServiceNow, Cloud, leadership).
+       - ENSURE all bullets are SHORT, CRISP, and TO THE POINT.
+    4. Make sure the resume is optimized for the hiring company.
+    5. The new bullet points should be relevant to the job description.
+    6. The new Bullet points shoud be Quantifiable Metrics, Architectural Decision-Making, Cross-Functional Leadership, Business Alignment
+    7. Once the new bullet points are generated, cross check with the existing bullet points and remove any duplicates.
+    STRICT RULES:
+    - Return ONLY a JSON object with keys: "company_name" (string), "summary" (string) and "entries" (list of objects with "id" and "optimized_bullets" list).
+    - Each bullet MUST be a single line.
+    - DO NOT HALLUCINATE brand new jobs.
+    - Preserve dates and company names.
+    
+    Output format:
+    {{
+      "company_name": "...",
+      "summary": "...",
+      "entries": [
+        {{ "id": 0, "optimized_bullets": ["...", "...", "..."] }},
+        ...
+      ]
+    }}
+    """
+    return prompt
+
+_BULLET_RULES = """
+       - Optimize the existing bullets for impact and relevance.
+       - ADD 2-3 NEW high-impact bullets that align the candidate's background with the JD (e.g. ServiceNow, Cloud, leadership).
+       - ENSURE all bullets are SHORT, CRISP, and TO THE POINT.
+    The new Bullet points shoud be Quantifiable Metrics, Architectural Decision-Making, Cross-Functional Leadership, Business Alignment.
+    Once the new bullet points are generated, cross check with the existing bullet points and remove any duplicates."""
+
+def build_summary_prompt(summary_text: str, job_description: str) -> str:
+    """
+    Fan-out prompt for the company name and summary only (see FANOUT_PROMPT_TEMPLATE_VERSION).
+    """
+    return f"""
+    You are a top-tier resume architect.
+
+    Job Description:
+    {job_description}
+
+    Current Professional Summary:
+    {summary_text}
+
+    Task:
+    1. Identify the hiring company from the Job Description.
+    2. Optimize the summary to be a high-impact, 3-4 sentence professional summary targeted at the JD and the hiring company.
+
+    STRICT RULES:
+    - Return ONLY a JSON object with keys: "company_name" (string) and "summary" (string).
+
+    Output format:
+    {{ "company_name": "...", "summary": "..." }}
+    """
+
+def build_entries_prompt(indexed_entries: list[tuple[int, dict]], job_description: str) -> str:
+    """
+    Fan-out prompt for one chunk of experience entries.
+    Entries keep their resume-wide ids so chunk results can be merged back by id.
+    """
+    payload = [{"id": i, "header": e["header"], "bullets": e["bullets"]} for i, e in indexed_entries]
+    return f"""
+    You are a top-tier resume architect.
+
+    Job Description:
+    {job_description}
+
+    Experience Entries (JSON):
+    {json.dumps(payload, indent=2)}
+
+    Task: For EACH experience entry:{_BULLET_RULES}
+
+    STRICT RULES:
+    - Return ONLY a JSON object with key "entries" (list of objects with "id" and "optimized_bullets" list), one per input entry, using the SAME ids.
+    - Each bullet MUST be a single line.
+    - DO NOT HALLUCINATE brand new jobs.
+    - Preserve dates and company names.
+
+    Output format:
+    {{ "entries": [ {{ "id": {payload[0]["id"] if payload else 0}, "optimized_bullets": ["...", "..."] }}, ... ] }}
+    """
+
+def chunk_entries(experience_entries: list[dict], token_budget: int = FANOUT_CHUNK_TOKEN_BUDGET) -> list[list[tuple[int, dict]]]:
+    """
+    Splits entries into consecutive chunks whose estimated size fits the token budget.
+    An entry larger than the budget gets a chunk of its own.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for i, entry in enumerate(experience_entries):
+        tokens = estimate_tokens(entry["header"] + "\n".join(entry["bullets"]))
+        if current and current_tokens + tokens > token_budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append((i, entry))
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+def should_fan_out(experience_entries: list[dict], token_budget: int = FANOUT_CHUNK_TOKEN_BUDGET) -> bool:
+    """ Fan out only when the entries don't fit in a single chunk. """
+    return len(chunk_entries(experience_entries, token_budget)) > 1
+
+def merge_fanout_results(summary_text: str, experience_entries: list[dict], summary_result, chunk_results: list) -> tuple[dict, bool]:
+    """
+    Merges fan-out responses into the batch response schema.
+    A failed summary or chunk keeps the original text. Returns (result, complete),
+    where complete is False if any part failed, and result is None if every part failed.
+    """
+    if summary_result is None and all(r is None for _, r in chunk_results):
+        return None, False
+
+    complete = summary_result is not None
+    result = {"summary": summary_text, "entries": []}
+    if summary_result:
+        result.update({k: summary_result[k] for k in ("company_name", "summary") if k in summary_result})
+
+    for chunk, chunk_result in chunk_results:
+        returned = {}
+        if chunk_result:
+            returned = {e.get("id"): e for e in chunk_result.get("entries", []) if isinstance(e, dict)}
+        for i, entry in chunk:
+            if i in returned:
+                result["entries"].append({"id": i, "optimized_bullets": returned[i].get("optimized_bullets", [])})
+            else:
+                complete = False
+                result["entries"].append({"id": i, "optimized_bullets": entry["bullets"]})
+    return result, complete
+
+def parse_json_response(text: str) -> dict:
+    """ Strips markdown code fences from a model response and parses the JSON inside. """
+    clean_text = text.strip().replace('```json', '').replace('```', '').strip()
+    return json.loads(clean_text)
+
+def _company_prompt(job_description: str) -> str:
+    return f"Extract only the company name from this job description. If not found, return 'Company'.\n\nJob Description:\n{job_description}"
+
+def _safe_company_name(name: str) -> str:
+    safe_name = "".join(c for c in name.strip() if c.isalnum() or c in (' ', '_', '-')).strip()
+    return safe_name.replace(' ', '_')
 
 class ResumeCopilot:
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, priority: int = PRIORITY_INTERACTIVE):
         """
         Initializes the ResumeCopilot with an API key.
         Checks for the API key in the environment variables if not provided directly.
-        Configures the Gemini generative AI model.
+        The model backend comes from llm_providers.get_provider (LLM_PROVIDER), so a fake or
+        replayed model can stand in for Gemini. All model calls go through the quota
+        scheduler at the given priority.
         """
+        self.priority = priority
         # Prefer environment variable if not passed directly
         self.api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if self.api_key:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-flash-latest')
-        else:
-            self.model = None
+        self.provider = get_provider(self.api_key, MODEL_NAME)
+        self.last_compaction = None
 
     def enhance_content(self, original_text: str, job_description: str) -> str:
         """
@@ -25,80 +224,288 @@ class ResumeCopilot:
         """
         return f"[DEPRECATED] Content enhancement skipped."
 
-    def optimize_all_content(self, summary_text: str, experience_entries: list[dict], job_description: str) -> dict:
+    def _cache_key(self, summary_text: str, experience_entries: list[dict], job_description: str, fanout: bool) -> str:
+        version = FANOUT_PROMPT_TEMPLATE_VERSION if fanout else PROMPT_TEMPLATE_VERSION
+        # The raw description is hashed, so the compaction budget is part of the version
+        return make_cache_key(summary_text, experience_entries, job_description, f"{version}:jd{JD_TOKEN_BUDGET}", self.provider.model_name)
+
+    def _generate_text(self, prompt: str) -> str:
+        """ Runs one prompt on the provider under the quota scheduler (with retries). """
+        return get_scheduler().run(
+            lambda: self.provider.generate(prompt),
+            tokens=estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS,
+            priority=self.priority,
+        )
+
+    async def _generate_text_async(self, prompt: str) -> str:
+        """ Awaits one prompt on the provider under the quota scheduler (with retries). """
+        return await get_scheduler().run_async(
+            lambda: self.provider.generate_async(prompt),
+            tokens=estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS,
+            priority=self.priority,
+        )
+
+    async def _stream_text_async(self, prompt: str):
+        """
+        Streams one prompt under the quota scheduler. Failures before the first chunk are
+        retried like any other call; once text has been streamed, errors propagate.
+        """
+        scheduler = get_scheduler()
+        attempt = 0
+        while True:
+            await scheduler.acquire_async(estimate_tokens(prompt) + EXPECTED_OUTPUT_TOKENS, self.priority)
+            started = False
+            try:
+                async for chunk in self.provider.stream_async(prompt):
+                    started = True
+                    yield chunk
+                return
+            except Exception as e:
+                delay = None if started else scheduler.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def count_tokens(self, text: str) -> int:
+        """ Counts tokens with the provider's tokenizer (falls back to the local estimate without one). """
+        if not self.provider or JD_TOKEN_COUNTER != "model":
+            return estimate_tokens(text)
+        return self.provider.count_tokens(text)
+
+    def compact_job_description(self, job_description: str) -> str:
+        """
+        Strips boilerplate from the job description and fits it to JD_TOKEN_BUDGET.
+        The original and compacted token counts are kept in self.last_compaction.
+        """
+        compaction = compact_job_description(job_description, JD_TOKEN_BUDGET, self.count_tokens)
+        self.last_compaction = {k: compaction[k] for k in ("original_tokens", "compacted_tokens", "dropped_sections")}
+        print(f"DEBUG: JD compacted {compaction['original_tokens']} -> {compaction['compacted_tokens']} tokens")
+        return compaction["text"]
+
+    def optimize_all_content(self, summary_text: str, experience_entries: list[dict], job_description: str, fanout: bool = None) -> dict:
         """
         Batches all resume components into a SINGLE AI request to avoid rate limits.
+        Long resumes (or fanout=True) are split into concurrent chunk requests instead;
+        see optimize_fanout. Successful responses are cached by content hash.
         """
-        if not self.model:
+        if not self.provider:
             return None
 
+        if fanout is None:
+            fanout = should_fan_out(experience_entries)
+
+        cache = get_response_cache()
+        cache_key = self._cache_key(summary_text, experience_entries, job_description, fanout)
+        if cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                print(f"DEBUG: LLM cache hit {cache_key[:12]}")
+                return cached
+
         print(f"DEBUG: Optimization Request - JD Length: {len(job_description)}")
+        job_description = self.compact_job_description(job_description)
         print(f"DEBUG: JD Preview: {job_description[:200]}...")
 
-        # Prepare a structured payload for the AI
-        payload = {
-            "summary": summary_text,
-            "entries": [{"id": i, "header": e["header"], "bullets": e["bullets"]} for i, e in enumerate(experience_entries)]
-        }
+        if fanout:
+            result, complete = self.optimize_fanout(summary_text, experience_entries, job_description)
+            if cache and complete:
+                cache.set(cache_key, result)
+            return result
 
-        prompt = f"""
-        You are a top-tier resume architect. 
-        
-        Job Description:
-        {job_description}
-
-        Current Resume Content (JSON):
-        {json.dumps(payload, indent=2)}
-
-        Task: 
-        1. Identify the hiring company from the Job Description.
-        2. Optimize the "summary" to be a high-impact, 3-4 sentence professional summary targeted at the JD.
-        3. For EACH experience entry:
-           - Optimize the existing bullets for impact and relevance.
-           - ADD 2-3 NEW high-impact bullets that align the candidate's background with the JD (e.g. ServiceNow, Cloud, leadership).
-           - ENSURE all bullets are SHORT, CRISP, and TO THE POINT.
-        4. Make sure the resume is optimized for the hiring company.
-        5. The new bullet points should be relevant to the job description.
-        6. The new Bullet points shoud be Quantifiable Metrics, Architectural Decision-Making, Cross-Functional Leadership, Business Alignment
-        7. Once the new bullet points are generated, cross check with the existing bullet points and remove any duplicates.
-        STRICT RULES:
-        - Return ONLY a JSON object with keys: "company_name" (string), "summary" (string) and "entries" (list of objects with "id" and "optimized_bullets" list).
-        - Each bullet MUST be a single line.
-        - DO NOT HALLUCINATE brand new jobs.
-        - Preserve dates and company names.
+        prompt = build_batch_prompt(summary_text, experience_entries, job_description)
         
-        Output format:
-        {{
-          "company_name": "...",
-          "summary": "...",
-          "entries": [
-            {{ "id": 0, "optimized_bullets": ["...", "...", "..."] }},
-            ...
-          ]
-        }}
+        try:
+            result = parse_json_response(self._generate_text(prompt))
+            if cache:
+                cache.set(cache_key, result)
+            return result
+        except Exception as e:
+            print(f"DEBUG: AI Batch Error - {e}")
+            return None
+
+    def _generate_json(self, prompt: str):
+        """ Runs one prompt on the sync model; returns the parsed JSON or None on failure. """
+        try:
+            return parse_json_response(self._generate_text(prompt))
+        except Exception as e:
+            print(f"DEBUG: AI Fan-out Error - {e}")
+            return None
+
+    def optimize_fanout(self, summary_text: str, experience_entries: list[dict], job_description: str) -> tuple[dict, bool]:
         """
-        
+        Fan-out mode: the summary/company prompt and one prompt per entry chunk run concurrently,
+        so wall-clock time tracks the slowest chunk. Returns (result, complete) as merge_fanout_results.
+        """
+        chunks = chunk_entries(experience_entries)
+        print(f"DEBUG: Fan-out optimization - {len(experience_entries)} entries in {len(chunks)} chunks")
+        prompts = [build_summary_prompt(summary_text, job_description)] + \
+                  [build_entries_prompt(chunk, job_description) for chunk in chunks]
+        with ThreadPoolExecutor(max_workers=min(FANOUT_MAX_WORKERS, len(prompts))) as pool:
+            results = list(pool.map(self._generate_json, prompts))
+        return merge_fanout_results(summary_text, experience_entries, results[0], list(zip(chunks, results[1:])))
+
+    async def optimize_all_content_async(self, summary_text: str, experience_entries: list[dict], job_description: str, fanout: bool = None) -> dict:
+        """
+        Async variant of optimize_all_content.
+        Awaits the provider's async call, so no worker thread is held while waiting.
+        """
+        if not self.provider:
+            return None
+
+        if fanout is None:
+            fanout = should_fan_out(experience_entries)
+
+        cache = get_response_cache()
+        cache_key = self._cache_key(summary_text, experience_entries, job_description, fanout)
+        if cache:
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                print(f"DEBUG: LLM cache hit {cache_key[:12]}")
+                return cached
+
+        print(f"DEBUG: Optimization Request (async) - JD Length: {len(job_description)}")
+        job_description = await asyncio.to_thread(self.compact_job_description, job_description)
+
+        if fanout:
+            result, complete = await self.optimize_fanout_async(summary_text, experience_entries, job_description)
+            if cache and complete:
+                await asyncio.to_thread(cache.set, cache_key, result)
+            return result
+
+        prompt = build_batch_prompt(summary_text, experience_entries, job_description)
+
         try:
-            response = self.model.generate_content(prompt)
-            clean_text = response.text.strip().replace('```json', '').replace('```', '').strip()
-            result = json.loads(clean_text)
+            result = parse_json_response(await self._generate_text_async(prompt))
+            if cache:
+                await asyncio.to_thread(cache.set, cache_key, result)
             return result
         except Exception as e:
             print(f"DEBUG: AI Batch Error - {e}")
             return None
 
+    async def _generate_json_async(self, prompt: str):
+        """ Runs one prompt on the async client; returns the parsed JSON or None on failure. """
+        try:
+            return parse_json_response(await self._generate_text_async(prompt))
+        except Exception as e:
+            print(f"DEBUG: AI Fan-out Error - {e}")
+            return None
+
+    async def optimize_fanout_async(self, summary_text: str, experience_entries: list[dict], job_description: str) -> tuple[dict, bool]:
+        """
+        Async variant of optimize_fanout: all prompts are awaited concurrently with asyncio.gather.
+        """
+        chunks = chunk_entries(experience_entries)
+        print(f"DEBUG: Fan-out optimization (async) - {len(experience_entries)} entries in {len(chunks)} chunks")
+        results = await asyncio.gather(
+            self._generate_json_async(build_summary_prompt(summary_text, job_description)),
+            *[self._generate_json_async(build_entries_prompt(chunk, job_description)) for chunk in chunks]
+        )
+        return merge_fanout_results(summary_text, experience_entries, results[0], list(zip(chunks, results[1:])))
+
+    async def stream_optimize_all_content(self, summary_text: str, experience_entries: list[dict], job_description: str, fanout: bool = None):
+        """
+        Streaming variant of optimize_all_content.
+        Yields ("company_name", str), ("summary", str) and ("entry", dict) as soon as each
+        part of the JSON response is complete, then ("result", dict | None) with the full
+        parsed response (None if the model call or parsing failed).
+        In fan-out mode, events are yielded as each concurrent request finishes.
+        """
+        if not self.provider:
+            yield "result", None
+            return
+
+        if fanout is None:
+            fanout = should_fan_out(experience_entries)
+
+        cache = get_response_cache()
+        cache_key = self._cache_key(summary_text, experience_entries, job_description, fanout)
+        cached = await asyncio.to_thread(cache.get, cache_key) if cache else None
+        if cached is not None:
+            print(f"DEBUG: LLM cache hit {cache_key[:12]}")
+            if "company_name" in cached:
+                yield "company_name", cached["company_name"]
+            if "summary" in cached:
+                yield "summary", cached["summary"]
+            for entry in cached.get("entries", []):
+                yield "entry", entry
+            yield "result", cached
+            return
+
+        job_description = await asyncio.to_thread(self.compact_job_description, job_description)
+
+        if fanout:
+            chunks = chunk_entries(experience_entries)
+
+            async def run(index, prompt):
+                return index, await self._generate_json_async(prompt)
+
+            tasks = [run(-1, build_summary_prompt(summary_text, job_description))] + \
+                    [run(i, build_entries_prompt(chunk, job_description)) for i, chunk in enumerate(chunks)]
+            summary_result, chunk_results = None, [None] * len(chunks)
+            for finished in asyncio.as_completed(tasks):
+                index, partial = await finished
+                if index == -1:
+                    summary_result = partial
+                    if partial:
+                        for key in ("company_name", "summary"):
+                            if key in partial:
+                                yield key, partial[key]
+                else:
+                    chunk_results[index] = partial
+                    if partial:
+                        for entry in partial.get("entries", []):
+                            if isinstance(entry, dict):
+                                yield "entry", entry
+
+            result, complete = merge_fanout_results(summary_text, experience_entries, summary_result, list(zip(chunks, chunk_results)))
+            if cache and complete:
+                await asyncio.to_thread(cache.set, cache_key, result)
+            yield "result", result
+            return
+
+        prompt = build_batch_prompt(summary_text, experience_entries, job_description)
+        parser = IncrementalPlanParser(array_keys=("entries",))
+        chunks = []
+        try:
+            async for chunk in self._stream_text_async(prompt):
+                chunks.append(chunk)
+                for event in parser.feed(chunk):
+                    if event[0] == "member" and event[1] in ("company_name", "summary"):
+                        yield event[1], event[2]
+                    elif event[0] == "item" and isinstance(event[3], dict):
+                        yield "entry", event[3]
+            result = parse_json_response("".join(chunks))
+        except Exception as e:
+            print(f"DEBUG: AI Stream Error - {e}")
+            yield "result", None
+            return
+
+        if cache:
+            await asyncio.to_thread(cache.set, cache_key, result)
+        yield "result", result
+
     def extract_company_name(self, job_description: str) -> str:
         """
         Extracts the company name from the job description.
         """
-        if not self.model or not job_description:
+        if not self.provider or not job_description:
             return "Company"
 
-        prompt = f"Extract only the company name from this job description. If not found, return 'Company'.\n\nJob Description:\n{job_description}"
         try:
-            response = self.model.generate_content(prompt)
-            name = response.text.strip()
-            safe_name = "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).strip()
-            return safe_name.replace(' ', '_')
+            return _safe_company_name(self._generate_text(_company_prompt(job_description)))
         except:
             return "Company"
+
+    async def extract_company_name_async(self, job_description: str) -> str:
+        """
+        Async variant of extract_company_name.
+        """
+        if not self.provider or not job_description:
+            return "Company"
+
+        try:
+            return _safe_company_name(await self._generate_text_async(_company_prompt(job_description)))
+        except Exception:
+            return "Company"
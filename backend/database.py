@@ -1,6 +1,6 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -23,3 +23,24 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def migrate_missing_columns(bind=engine):
+    """
+    Lightweight forward-only migration for SQLite.
+    create_all() only creates missing tables, so columns and indexes added to existing
+    models are applied here with ALTER TABLE / CREATE INDEX.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {column_type}'))
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
@@ -8,11 +8,13 @@ import json
 try:
     from resume_generator import generate_tailored_resume
     from copilot import ResumeCopilot
+    from section_classifier import get_classifier
 except ImportError:
     import sys
     sys.path.append(os.path.join(os.getcwd(), 'backend'))
     from resume_generator import generate_tailored_resume
     from copilot import ResumeCopilot
+    from section_classifier import get_classifier
 
 def run_deep_debug(resume_path, job_desc):
     print(f"\n==========================================")
@@ -26,12 +28,8 @@ def run_deep_debug(resume_path, job_desc):
     # 1. Inspect Document Structure
     print("--- [STEP 1] Inspecting Document Paragraphs ---")
     doc = Document(resume_path)
-    experience_headers = [
-        "experience", "professional experience", "work history", 
-        "employment history", "work experience", "career history"
-    ]
-    summary_headers = ["summary", "professional summary", "objective", "profile", "professional profile"]
-    stop_headers = ["education", "skills", "projects", "technical skills", "certifications", "awards", "languages", "volunteering"]
+    classifier = get_classifier()
+    style_cache = {}
     
     in_experience = False
     in_summary = False
@@ -39,39 +37,27 @@ def run_deep_debug(resume_path, job_desc):
     summary_paras = 0
     
     for i, p in enumerate(doc.paragraphs):
-        text = p.text.strip()
-        if not text: continue
+        # Same classifier the index builder uses (see section_classifier.py)
+        p_type, text = classifier.classify(p, style_cache)
+        if p_type == "empty": continue
         
-        lower_text = text.lower()
-        is_header = False
+        is_header = p_type.endswith("_section_header")
+        if p_type == "experience_section_header":
+            print(f"  [FOUND] Experience Header at L{i}: '{text}' (Style: {p.style.name})")
+            in_experience = True
+            in_summary = False
+        elif p_type == "summary_section_header":
+            print(f"  [FOUND] Summary Header at L{i}: '{text}' (Style: {p.style.name})")
+            in_summary = True
+            in_experience = False
+        elif p_type == "stop_section_header" and (in_experience or in_summary):
+            print(f"  [STOP] Section End Header at L{i}: '{text}' (Style: {p.style.name})")
+            in_experience = False
+            in_summary = False
         
-        # Header Detection Logic (Match resume_generator.py)
-        if p.style.name.startswith('Heading') or (len(text) < 50 and text.isupper()) or (p.runs and p.runs[0].bold and len(text) < 50):
-            if any(h in lower_text for h in experience_headers):
-                print(f"  [FOUND] Experience Header at L{i}: '{text}' (Style: {p.style.name})")
-                in_experience = True
-                in_summary = False
-                is_header = True
-            elif any(h in lower_text for h in summary_headers):
-                print(f"  [FOUND] Summary Header at L{i}: '{text}' (Style: {p.style.name})")
-                in_summary = True
-                in_experience = False
-                is_header = True
-            elif (in_experience or in_summary) and any(sh in lower_text for sh in stop_headers):
-                print(f"  [STOP] Section End Header at L{i}: '{text}' (Style: {p.style.name})")
-                in_experience = False
-                in_summary = False
-                is_header = True
-        
-        if in_experience and not is_header:
-            is_list = False
-            try:
-                if p._p.pPr is not None and p._p.pPr.numPr is not None: is_list = True
-            except: pass
-            
-            if 'list' in p.style.name.lower() or is_list or text.startswith(('•', '-', '–', '*', '·', '◦')):
-                bullets_found += 1
-                print(f"    -> [EXP BULLET {bullets_found}] '{text[:100]}...'")
+        if in_experience and p_type == "bullet":
+            bullets_found += 1
+            print(f"    -> [EXP BULLET {bullets_found}] '{text[:100]}...'")
         
         if in_summary and not is_header:
              summary_paras += 1
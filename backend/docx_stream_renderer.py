@@ -0,0 +1,378 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import copy
+import re
+import struct
+import zipfile
+import zlib
+from lxml import etree
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+W_BODY = f"{{{W_NS}}}body"
+W_P = f"{{{W_NS}}}p"
+W_PPR = f"{{{W_NS}}}pPr"
+W_R = f"{{{W_NS}}}r"
+W_T = f"{{{W_NS}}}t"
+W_TAB = f"{{{W_NS}}}tab"
+W_BR = f"{{{W_NS}}}br"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+DOCUMENT_PART = "word/document.xml"
+XML_DECLARATION = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\r\n'
+COPY_CHUNK_BYTES = 1024 * 1024
+# Body fragments per independently compressed segment of a rendition's document part
+SEGMENT_FRAGMENTS = 256
+# An empty final deflate block, closing a stream of full-flushed segments
+DEFLATE_END = b"\x03\x00"
+# Characters python-docx turns into run content other than text
+RUN_BREAKS = re.compile(r"([\t\r\n])")
+
+
+class StaleIndexError(ValueError):
+    """ The document's paragraph count doesn't match the structure index the edits came from. """
+
+
+def set_paragraph_text(p, text: str):
+    """
+    Replaces a w:p element's content the way python-docx's `paragraph.text = text` does:
+    every child except w:pPr is removed and a single unformatted run is added, with tabs
+    as w:tab, line breaks as w:br, and xml:space="preserve" on text with outer whitespace.
+    """
+    for child in list(p):
+        if isinstance(child.tag, str) and child.tag != W_PPR:
+            p.remove(child)
+    r = etree.SubElement(p, W_R)
+    for piece in RUN_BREAKS.split(text):
+        if piece == "\t":
+            etree.SubElement(r, W_TAB)
+        elif piece in ("\r", "\n"):
+            etree.SubElement(r, W_BR)
+        elif piece:
+            t = etree.SubElement(r, W_T)
+            t.text = piece
+            if len(piece.strip()) < len(piece):
+                t.set(XML_SPACE, "preserve")
+
+
+def _start_tag(element) -> bytes:
+    """ Serializes just the start tag of an element, with its attributes and namespace declarations. """
+    shell = etree.Element(element.tag, attrib=dict(element.attrib), nsmap=element.nsmap)
+    data = etree.tostring(shell)
+    return data[:-2] + b">"  # "<x .../>" -> "<x ...>"
+
+
+def _end_tag(element) -> bytes:
+    local_name = etree.QName(element).localname
+    return f"</{element.prefix}:{local_name}>".encode("utf-8") if element.prefix else f"</{local_name}>".encode("utf-8")
+
+
+class _FragmentWriter:
+    """
+    Serializes finished child elements without repeating the namespace declarations that the
+    already-written ancestors carry: each child is serialized inside a wrapper that declares
+    the root's namespaces, and the wrapper's own tags are sliced off.
+    """
+
+    def __init__(self, root):
+        self.wrapper = etree.Element(root.tag, nsmap=root.nsmap)
+
+    def serialize(self, element) -> bytes:
+        self.wrapper.append(element)
+        data = etree.tostring(self.wrapper, encoding="UTF-8", xml_declaration=False)
+        self.wrapper.remove(element)
+        return data[data.index(b">") + 1:data.rindex(b"</")]
+
+
+def _walk_document(source):
+    """
+    Iterates word/document.xml as a stream of pieces, yielding (data, element, writer):
+    either bytes to be written as they are (declaration, document/body tags, elements
+    outside the body) with element None, or a finished body-level element with data None,
+    which the caller serializes with `writer` or drops. Each element is released once the
+    caller resumes, so memory stays flat regardless of document size.
+    """
+    depth = 0
+    root = body = writer = None
+
+    for event, element in etree.iterparse(source, events=("start", "end"), resolve_entities=False, huge_tree=True):
+        if event == "start":
+            if depth == 0:
+                root = element
+                writer = _FragmentWriter(root)
+                yield XML_DECLARATION + _start_tag(root), None, writer
+            elif depth == 1 and element.tag == W_BODY:
+                body = element
+                yield _start_tag(body), None, writer
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 2 and element.getparent() is body:
+            yield None, element, writer
+            element.clear()
+        elif depth == 1:
+            if element is body:
+                yield _end_tag(body), None, writer
+            else:
+                # Other children of w:document (e.g. w:background)
+                yield writer.serialize(element), None, writer
+            element.clear()
+        elif depth == 0:
+            yield _end_tag(root), None, writer
+
+
+def rewrite_document_xml(source, sink, edits: dict) -> int:
+    """
+    Streams word/document.xml from `source` to `sink`, applying edits to body-level paragraphs
+    by ordinal ({ordinal: text} rewrites, {ordinal: None} removes). Returns the number of
+    body-level paragraphs seen.
+    """
+    ordinal = 0
+    for data, element, writer in _walk_document(source):
+        if element is None:
+            sink.write(data)
+            continue
+        if element.tag == W_P:
+            if ordinal in edits:
+                if edits[ordinal] is None:
+                    ordinal += 1
+                    continue
+                set_paragraph_text(element, edits[ordinal])
+            ordinal += 1
+        sink.write(writer.serialize(element))
+    return ordinal
+
+
+def _write_member_raw(zout: zipfile.ZipFile, info: zipfile.ZipInfo, chunks):
+    """
+    Writes a zip member from its already-compressed bytes, without inflating and re-deflating.
+    zipfile has no public API for this, so the local header is emitted from the ZipInfo and
+    the output archive's bookkeeping is updated by hand.
+    """
+    out_info = copy.copy(info)
+    out_info.header_offset = zout.fp.tell()
+    out_info.flag_bits &= ~0x08  # sizes go in the local header, no trailing data descriptor
+    zout.fp.write(out_info.FileHeader())
+    for chunk in chunks:
+        zout.fp.write(chunk)
+
+    zout.filelist.append(out_info)
+    zout.NameToInfo[out_info.filename] = out_info
+    zout.start_dir = zout.fp.tell()
+    zout._didModify = True
+
+
+def _iter_member_raw(zin: zipfile.ZipFile, info: zipfile.ZipInfo):
+    """ Yields a zip member's compressed bytes in chunks. """
+    zin.fp.seek(info.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, zin.fp.read(zipfile.sizeFileHeader))
+    zin.fp.seek(info.header_offset + zipfile.sizeFileHeader
+                + header[zipfile._FH_FILENAME_LENGTH] + header[zipfile._FH_EXTRA_FIELD_LENGTH])
+    remaining = info.compress_size
+    while remaining:
+        chunk = zin.fp.read(min(COPY_CHUNK_BYTES, remaining))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+        yield chunk
+        remaining -= len(chunk)
+
+
+def _deflate_segment(data: bytes) -> bytes:
+    """
+    Raw-deflates data ending on a full flush: no back-references cross the segment
+    boundary and it ends byte-aligned, so segments concatenate into one valid stream
+    (closed with DEFLATE_END) and any one of them can be recompressed on its own.
+    """
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FULL_FLUSH)
+
+
+def _document_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    """ Header for the rewritten document part, keeping the original's timestamp and attributes. """
+    out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+    out_info.compress_type = zipfile.ZIP_DEFLATED
+    out_info.external_attr = info.external_attr
+    return out_info
+
+
+def render_docx(original, edits: dict, output, expected_paragraphs: int = None) -> int:
+    """
+    Writes a copy of the .docx `original` (path or binary file) to `output` (path or binary
+    file) with paragraph edits applied to word/document.xml. Every other part (images,
+    fonts, styles, ...) is copied through as raw compressed bytes, in the original order.
+    Raises StaleIndexError if expected_paragraphs is given and the document has a different
+    number of body-level paragraphs. Returns the paragraph count.
+    """
+    with zipfile.ZipFile(original) as zin, zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zout:
+        paragraph_count = None
+        for info in zin.infolist():
+            if info.filename != DOCUMENT_PART:
+                _write_member_raw(zout, info, _iter_member_raw(zin, info))
+                continue
+            with zin.open(info) as source, zout.open(_document_info(info), "w") as sink:
+                paragraph_count = rewrite_document_xml(source, sink, edits)
+
+    if paragraph_count is None:
+        raise ValueError(f"{DOCUMENT_PART} not found; not a Word document")
+    if expected_paragraphs is not None and paragraph_count != expected_paragraphs:
+        raise StaleIndexError(f"Document has {paragraph_count} paragraphs, index expects {expected_paragraphs}")
+    return paragraph_count
+
+
+# Rough libxml2 cost of one parsed node, for estimating a template's memory footprint
+LIBXML_NODE_BYTES = 128
+
+
+class DocxTemplate:
+    """
+    A .docx parsed once and kept for rendering many variants. Parts other than
+    word/document.xml are held as raw compressed bytes; the document body is held as
+    serialized fragments, plus a detached lxml element per paragraph. A render writes the
+    untouched fragments as they are and deep-copies only the paragraphs it edits, so the
+    template itself is never modified and can be shared between threads.
+    """
+
+    def __init__(self, source):
+        self.members = []     # (ZipInfo, raw compressed bytes) in archive order; None for the document part
+        self.head = b""       # declaration, document/body start tags and anything before the first body child
+        self.tail = b""       # body end tag and anything after it
+        self.fragments = []   # (serialized bytes, ordinal, element) per body child; ordinal/element only for paragraphs
+        self.paragraph_positions = [] # fragment index of each paragraph ordinal
+        self.paragraph_count = 0
+        self.nbytes = 0
+
+        with zipfile.ZipFile(source) as zin:
+            for info in zin.infolist():
+                if info.filename == DOCUMENT_PART:
+                    with zin.open(info) as document:
+                        self._load_document(document)
+                    self.members.append((info, None))
+                else:
+                    raw = b"".join(_iter_member_raw(zin, info))
+                    self.members.append((info, raw))
+                    self.nbytes += len(raw)
+        if self.root is None:
+            raise ValueError(f"{DOCUMENT_PART} not found; not a Word document")
+
+    def _load_document(self, source):
+        head, tail = [], []
+        self.root = None
+        for data, element, writer in _walk_document(source):
+            if self.root is None:
+                # A bare copy of the root, so each render can build its own writer
+                self.root = etree.Element(writer.wrapper.tag, nsmap=writer.wrapper.nsmap)
+            if element is None:
+                (tail if self.fragments else head).append(data)
+                continue
+            data = writer.serialize(element)
+            if element.tag == W_P:
+                paragraph = copy.deepcopy(element)
+                self.paragraph_positions.append(len(self.fragments))
+                self.fragments.append((data, self.paragraph_count, paragraph))
+                self.paragraph_count += 1
+                self.nbytes += sum(LIBXML_NODE_BYTES for _ in paragraph.iter())
+            else:
+                self.fragments.append((data, None, None))
+            self.nbytes += len(data)
+        self.head, self.tail = b"".join(head), b"".join(tail)
+        self.head_deflated, self.tail_deflated = _deflate_segment(self.head), _deflate_segment(self.tail)
+        self.nbytes += len(self.head) + len(self.tail)
+
+    def rendition(self, edits: dict) -> "Rendition":
+        """ The template with edits applied, ready to write and to patch with later edits. """
+        return Rendition(self, {}, [data for data, _, _ in self.fragments], None).patch(edits)
+
+    def render(self, edits: dict, output, expected_paragraphs: int = None) -> int:
+        """
+        Same contract as render_docx, from the parsed template: writes the package with
+        paragraph edits applied to `output` (path or binary file) and returns the paragraph count.
+        """
+        self.check_paragraphs(expected_paragraphs)
+        self.rendition(edits).write(output)
+        return self.paragraph_count
+
+    def check_paragraphs(self, expected_paragraphs: int = None):
+        """ Raises StaleIndexError if an index expecting this many paragraphs doesn't describe the template. """
+        if expected_paragraphs is not None and self.paragraph_count != expected_paragraphs:
+            raise StaleIndexError(f"Document has {self.paragraph_count} paragraphs, index expects {expected_paragraphs}")
+
+
+# Marks a paragraph that keeps its original content in a set of edits
+_ORIGINAL = object()
+
+
+class Rendition:
+    """
+    A DocxTemplate with one set of paragraph edits applied. The body is kept as one
+    serialized fragment per original body child (None where a paragraph was deleted), and
+    the document part as independently deflated segments of SEGMENT_FRAGMENTS fragments.
+    Applying a new set of edits re-renders only the paragraphs whose target text changed
+    and recompresses only the segments holding them; the rest, deletions included, is
+    reused as is.
+    """
+
+    def __init__(self, template: DocxTemplate, edits: dict, body: list, segments: list = None):
+        self.template = template
+        self.edits = edits
+        self.body = body
+        self.segments = segments # compressed segments; None until the first patch compresses them all
+        self.changed = 0 # paragraphs re-rendered when this rendition was produced
+        self.nbytes = 0  # memory held beyond the template: segments and re-rendered paragraphs
+
+    def patch(self, edits: dict) -> "Rendition":
+        """ Returns a new rendition for `edits`, re-rendering only what differs from this one. """
+        template = self.template
+        body = list(self.body)
+        writer = _FragmentWriter(template.root)
+        changed = [ordinal for ordinal in self.edits.keys() | edits.keys()
+                   if self.edits.get(ordinal, _ORIGINAL) != edits.get(ordinal, _ORIGINAL)
+                   and ordinal < template.paragraph_count]
+        for ordinal in changed:
+            position = template.paragraph_positions[ordinal]
+            data, _, paragraph = template.fragments[position]
+            new_text = edits.get(ordinal, _ORIGINAL)
+            if new_text is _ORIGINAL:
+                body[position] = data
+            elif new_text is None:
+                body[position] = None
+            else:
+                clone = copy.deepcopy(paragraph)
+                set_paragraph_text(clone, new_text)
+                body[position] = writer.serialize(clone)
+
+        if self.segments is None:
+            dirty = range(-(-len(body) // SEGMENT_FRAGMENTS))
+            segments = [None] * len(dirty)
+        else:
+            dirty = {template.paragraph_positions[ordinal] // SEGMENT_FRAGMENTS for ordinal in changed}
+            segments = list(self.segments)
+        for segment in dirty:
+            start = segment * SEGMENT_FRAGMENTS
+            segments[segment] = _deflate_segment(b"".join(data for data in body[start:start + SEGMENT_FRAGMENTS] if data is not None))
+
+        rendition = Rendition(template, dict(edits), body, segments)
+        rendition.changed = len(changed)
+        rendition.nbytes = sum(len(segment) for segment in segments) + \
+            sum(len(data) for data, (original, _, _) in zip(body, template.fragments) if data is not None and data is not original)
+        return rendition
+
+    def write(self, output):
+        """ Writes the package to `output` (path or binary file). """
+        template = self.template
+        with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as zout:
+            for info, raw in template.members:
+                if raw is not None:
+                    _write_member_raw(zout, info, (raw,))
+                    continue
+                crc = zlib.crc32(template.head)
+                size = len(template.head) + len(template.tail)
+                for data in self.body:
+                    if data is not None:
+                        crc = zlib.crc32(data, crc)
+                        size += len(data)
+                chunks = [template.head_deflated, *self.segments, template.tail_deflated, DEFLATE_END]
+                out_info = _document_info(info)
+                out_info.CRC = zlib.crc32(template.tail, crc)
+                out_info.file_size = size
+                out_info.compress_size = sum(len(chunk) for chunk in chunks)
+                _write_member_raw(zout, out_info, chunks)
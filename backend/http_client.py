@@ -0,0 +1,168 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+import httpx
+
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 15.0
+DEFAULT_TOTAL_TIMEOUT_SECONDS = 30.0
+DEFAULT_MAX_MB = 5
+DEFAULT_MAX_CONNECTIONS = 20
+# Recent latencies kept per host for the percentiles in stats()
+LATENCY_SAMPLES = 256
+
+# A browser-like identity avoids the most basic bot detection on job boards.
+# Accept-Encoding is left to httpx: gzip and deflate, plus br when brotli is installed.
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+}
+
+
+class ResponseTooLargeError(ValueError):
+    """ The response body exceeded the client's max_bytes. """
+
+
+class FetchTimeoutError(TimeoutError):
+    """ The whole fetch, body included, took longer than the client's total timeout. """
+
+
+class _HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.bytes = 0
+        self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def snapshot(self) -> dict:
+        latencies = sorted(self.latencies)
+
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1) if latencies else 0.0
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+        }
+
+
+class ScrapingClient:
+    """
+    Shared, thread-safe HTTP client for fetching job postings. Connections are kept alive
+    in per-origin pools, so repeat scrapes of a host skip the TCP and TLS handshakes.
+    Every fetch is bounded: connect and read timeouts per network operation, a total
+    deadline for the whole body, and a cap on the decompressed body size (checked while
+    streaming, so an oversized page is never fully downloaded).
+    Latency, bytes and errors are recorded per host (see stats()).
+    """
+
+    def __init__(self, connect_timeout: float, read_timeout: float, total_timeout: float, max_bytes: int, max_connections: int):
+        self.total_timeout = total_timeout
+        self.max_bytes = max_bytes
+        self.http = httpx.Client(
+            headers=BROWSER_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, url: str, headers: dict = None) -> dict:
+        """
+        GETs url and returns {"url", "status_code", "headers", "content"} with the final URL
+        after redirects and the decompressed body. Raises httpx.HTTPStatusError for 4xx/5xx,
+        httpx.TransportError (timeouts included) on network failures, ResponseTooLargeError
+        and FetchTimeoutError.
+        """
+        host = urlparse(url).hostname or ""
+        start = time.monotonic()
+        received = 0
+        try:
+            with self.http.stream("GET", url, headers=headers) as response:
+                if response.status_code >= 400:
+                    response.raise_for_status()
+                declared = response.headers.get("Content-Length")
+                # A compressed body's length says nothing reliable about its decoded size
+                if declared and declared.isdigit() and not response.headers.get("Content-Encoding") and int(declared) > self.max_bytes:
+                    raise ResponseTooLargeError(f"{url} is {declared} bytes (limit {self.max_bytes})")
+                chunks = []
+                for chunk in response.iter_bytes():
+                    received += len(chunk)
+                    if received > self.max_bytes:
+                        raise ResponseTooLargeError(f"{url} exceeded {self.max_bytes} bytes")
+                    if time.monotonic() - start > self.total_timeout:
+                        raise FetchTimeoutError(f"{url} took longer than {self.total_timeout}s")
+                    chunks.append(chunk)
+                result = {
+                    "url": str(response.url),
+                    "status_code": response.status_code,
+                    "headers": response.headers,
+                    "content": b"".join(chunks),
+                }
+        except Exception:
+            self._record(host, start, received, error=True)
+            raise
+        self._record(host, start, received, error=False)
+        return result
+
+    def _record(self, host: str, start: float, received: int, error: bool):
+        with self._lock:
+            stats = self._hosts.get(host)
+            if stats is None:
+                stats = self._hosts[host] = _HostStats()
+            stats.requests += 1
+            stats.errors += error
+            stats.bytes += received
+            stats.latencies.append(time.monotonic() - start)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {host: stats.snapshot() for host, stats in sorted(self._hosts.items())}
+
+    def close(self):
+        self.http.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> ScrapingClient:
+    """
+    Returns the process-wide scraping client. Configured through environment variables:
+      SCRAPER_CONNECT_TIMEOUT  seconds to establish a connection (default 5)
+      SCRAPER_READ_TIMEOUT     seconds to wait for each read (default 15)
+      SCRAPER_TOTAL_TIMEOUT    seconds for a whole fetch, body included (default 30)
+      SCRAPER_MAX_MB           largest decompressed body accepted (default 5)
+      SCRAPER_MAX_CONNECTIONS  pooled connections across all hosts (default 20)
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = ScrapingClient(
+                float(os.getenv("SCRAPER_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT_SECONDS)),
+                float(os.getenv("SCRAPER_READ_TIMEOUT", DEFAULT_READ_TIMEOUT_SECONDS)),
+                float(os.getenv("SCRAPER_TOTAL_TIMEOUT", DEFAULT_TOTAL_TIMEOUT_SECONDS)),
+                int(float(os.getenv("SCRAPER_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+                int(os.getenv("SCRAPER_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            )
+        return _client
+
+
+def close_http_client():
+    """ Closes the pooled connections (on shutdown); the next get_http_client() starts afresh. """
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = None
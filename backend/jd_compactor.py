@@ -0,0 +1,190 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import os
+import re
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .llm_shared import estimate_tokens
+except ImportError:
+    from llm_shared import estimate_tokens
+
+# Default prompt budget for the job description, in tokens
+DEFAULT_JD_TOKEN_BUDGET = int(os.getenv("JD_TOKEN_BUDGET", 1500))
+
+# Section headings whose whole section is boilerplate for resume tailoring
+BOILERPLATE_SECTION_PATTERN = re.compile(
+    r"\b(benefits|perks|what we offer|why (you'?ll )?(love|join)|equal (employment )?opportunity|eeo|"
+    r"diversity|accommodations?|privacy|cookies?|similar jobs|people also viewed|"
+    r"more jobs|jobs you may|explore (more|collaborative)|about linkedin|about monster)\b",
+    re.IGNORECASE,
+)
+
+# Individual lines that are boilerplate wherever they appear
+BOILERPLATE_LINE_PATTERN = re.compile(
+    r"(equal opportunity employer|without regard to|race, colou?r|sexual orientation|gender identity|"
+    r"protected veteran|affirmative action|reasonable accommodation|e-?verify|"
+    r"\bcookies?\b|privacy policy|user agreement|terms of (service|use)|accept all|"
+    r"^(sign in|join now|log in|apply( now)?|save( job)?|share|report this job|show (more|less)|see more|"
+    r"set alert|get notified.*|easy apply|\d+ applicants?|be an early applicant|"
+    r"referrals increase your chances.*|see who .* has hired.*)$)",
+    re.IGNORECASE,
+)
+
+# Sections worth keeping first when the budget is tight
+HIGH_PRIORITY_SECTION_PATTERN = re.compile(
+    r"(responsibilit|requirement|qualification|skills|what you('ll)? (do|bring)|experience|"
+    r"must have|nice to have|preferred|duties|role|about the (job|role|position))",
+    re.IGNORECASE,
+)
+LOW_PRIORITY_SECTION_PATTERN = re.compile(r"\b(about (us|the company)|who we are|our (mission|culture|values))\b", re.IGNORECASE)
+
+
+def _is_heading(line: str) -> bool:
+    """ Short lines ending in ':' or without sentence punctuation are treated as section headings. """
+    if len(line) > 60 or len(line.split()) > 8:
+        return False
+    if line.endswith(":"):
+        return True
+    return not line.endswith((".", ",", ";")) and (line.istitle() or line.isupper())
+
+
+def segment_sections(text: str) -> list[dict]:
+    """
+    Splits job description text into sections of {"heading", "lines"}.
+    Text before the second heading forms the intro section.
+    """
+    sections = [{"heading": "", "lines": []}]
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        if _is_heading(line) and sections[-1]["lines"]:
+            sections.append({"heading": line, "lines": []})
+        elif _is_heading(line) and not sections[-1]["heading"]:
+            sections[-1]["heading"] = line
+        else:
+            sections[-1]["lines"].append(line)
+    return [s for s in sections if s["heading"] or s["lines"]]
+
+
+def _section_priority(section: dict, index: int) -> int:
+    heading = section["heading"]
+    if index == 0:
+        return 3  # the intro usually carries the job title and company
+    if HIGH_PRIORITY_SECTION_PATTERN.search(heading):
+        return 3
+    if LOW_PRIORITY_SECTION_PATTERN.search(heading):
+        return 1
+    return 2
+
+
+def _render(sections: list[dict]) -> str:
+    parts = []
+    for section in sections:
+        if section["heading"]:
+            parts.append(section["heading"])
+        parts.extend(section["lines"])
+    return "\n".join(parts)
+
+
+def _take_lines(section: dict, budget: int) -> tuple[dict, int]:
+    """ Keeps the heading and as many leading lines as fit; returns (section or None, tokens used). """
+    used = estimate_tokens(section["heading"]) if section["heading"] else 0
+    lines = []
+    for line in section["lines"]:
+        line_cost = estimate_tokens(line)
+        if used + line_cost > budget:
+            break
+        lines.append(line)
+        used += line_cost
+    if not lines:
+        return None, 0
+    return {"heading": section["heading"], "lines": lines}, used
+
+
+def _fit_to_budget(sections: list[dict], budget: int) -> list[dict]:
+    """
+    Keeps sections in priority order (then document order) until the estimated budget is used,
+    truncating sections line by line when they don't fit whole. The intro (first section) may
+    use at most a quarter of the budget. Output keeps document order.
+    """
+    order = sorted(range(len(sections)), key=lambda i: (-_section_priority(sections[i], i), i))
+    kept = {}
+    remaining = budget
+    for i in order:
+        section = sections[i]
+        limit = min(remaining, budget // 4) if i == 0 else remaining
+        taken, used = _take_lines(section, limit)
+        if taken:
+            kept[i] = taken
+            remaining -= used
+        if remaining <= 0:
+            break
+    return [kept[i] for i in sorted(kept)]
+
+
+def compact_job_description(text: str, token_budget: int = None, count_tokens=None) -> dict:
+    """
+    Compacts a scraped job description before prompting:
+      1. segments the text into sections,
+      2. drops boilerplate sections/lines (EEO, benefits, cookie banners, "similar jobs", page chrome),
+      3. removes repeated lines,
+      4. fits the rest to token_budget, keeping requirements/responsibilities first.
+    count_tokens is the model's token counter (str -> int); the local estimate is used if omitted
+    or if it fails. Returns {"text", "original_tokens", "compacted_tokens", "dropped_sections"}.
+    """
+    token_budget = token_budget or DEFAULT_JD_TOKEN_BUDGET
+    counter = count_tokens or estimate_tokens
+
+    def count(value: str) -> int:
+        try:
+            return counter(value)
+        except Exception as e:
+            print(f"DEBUG: Token counter failed, using estimate - {e}")
+            return estimate_tokens(value)
+
+    text = text or ""
+    original_tokens = count(text)
+
+    sections = []
+    dropped = []
+    seen = set()
+    for section in segment_sections(text):
+        if section["heading"] and BOILERPLATE_SECTION_PATTERN.search(section["heading"]):
+            dropped.append(section["heading"])
+            continue
+        # Page chrome such as "Apply" or "Save" can look like a heading
+        heading = section["heading"]
+        if heading and BOILERPLATE_LINE_PATTERN.search(heading):
+            heading = ""
+        lines = []
+        for line in section["lines"]:
+            key = re.sub(r"\W+", " ", line.lower()).strip()
+            if not key or key in seen or BOILERPLATE_LINE_PATTERN.search(line):
+                continue
+            seen.add(key)
+            lines.append(line)
+        if lines:
+            sections.append({"heading": heading, "lines": lines})
+
+    compacted = _render(sections)
+    compacted_tokens = count(compacted) if compacted != text else original_tokens
+
+    # Fit to budget. The estimate drives section selection; the real counter verifies it,
+    # and the estimated budget is scaled down if the two disagree.
+    estimated_budget = token_budget
+    for _ in range(3):
+        if compacted_tokens <= token_budget:
+            break
+        fitted = _render(_fit_to_budget(sections, estimated_budget))
+        fitted_tokens = count(fitted)
+        compacted, compacted_tokens = fitted, fitted_tokens
+        estimated_budget = int(estimated_budget * token_budget / max(fitted_tokens, 1) * 0.95)
+
+    return {
+        "text": compacted,
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "dropped_sections": dropped,
+    }
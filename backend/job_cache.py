@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .scraper import scrape_job_posting
+except ImportError:
+    from scraper import scrape_job_posting
+
+DEFAULT_JOB_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# Stored job post fields the freshness policy reads and writes
+JOB_CACHE_FIELDS = ("description", "company_name", "fetched_at", "etag", "last_modified", "content_hash")
+
+_outcomes = Counter()
+_outcomes_lock = threading.Lock()
+
+
+def job_cache_ttl() -> float:
+    """
+    Seconds a scraped job description is served without asking the site again.
+    Configured through the JOB_CACHE_TTL_SECONDS environment variable (default 6 hours;
+    0 revalidates on every request).
+    """
+    return float(os.getenv("JOB_CACHE_TTL_SECONDS", DEFAULT_JOB_CACHE_TTL_SECONDS))
+
+
+def description_hash(description: str) -> str:
+    """ SHA-256 of a job description, to tell a re-scrape that changed nothing from one that did. """
+    return hashlib.sha256((description or "").encode("utf-8")).hexdigest()
+
+
+def _as_utc(value):
+    """ Stored timestamps come back naive from SQLite and as ISO strings from DynamoDB; both are UTC. """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def is_fresh(fetched_at, now: datetime = None) -> bool:
+    fetched_at = _as_utc(fetched_at)
+    if fetched_at is None:
+        return False
+    now = now or datetime.now(timezone.utc)
+    return (now - fetched_at).total_seconds() < job_cache_ttl()
+
+
+def refresh_job_posting(url: str, stored: dict = None, now: datetime = None) -> dict:
+    """
+    Applies the freshness policy to a job URL. stored holds the existing record's
+    JOB_CACHE_FIELDS (None for a URL not seen before). Returns {"status", "fields"}, where
+    fields are the values to write back (timestamps as aware UTC datetimes) and status is:
+      fresh         fetched within the TTL; no request was made
+      not_modified  the site answered 304 to If-None-Match / If-Modified-Since
+      unchanged     re-scraped; same description text, so plans built from it stay valid
+      changed       re-scraped; the description changed and plans built from it are stale
+      new           first scrape of the URL
+      failed        the scrape returned nothing; a stored description is kept as it was.
+                    The outcome also carries the scrape's "error", "retryable" and "retry_after"
+    """
+    now = now or datetime.now(timezone.utc)
+    cached = bool(stored and stored.get("description"))
+    if cached and is_fresh(stored.get("fetched_at"), now):
+        return _outcome("fresh", {})
+
+    if cached:
+        scraped = scrape_job_posting(url, stored.get("etag"), stored.get("last_modified"))
+    else:
+        scraped = scrape_job_posting(url)
+    validators = {"etag": scraped["etag"], "last_modified": scraped["last_modified"]}
+
+    if scraped["not_modified"] and cached:
+        # A 304 may omit validators; keep the ones the conditional request was made with
+        return _outcome("not_modified", {"fetched_at": now, **{k: v for k, v in validators.items() if v}})
+
+    description = scraped["description"]
+    if not description:
+        # Keep what we have rather than replace it with nothing; retried on the next request
+        failure = {key: scraped.get(key) for key in ("error", "retryable", "retry_after")}
+        return _outcome("failed", {} if stored else {"description": "", "company_name": scraped["company_name"]}, **failure)
+
+    fields = {"description": description, "content_hash": description_hash(description), "fetched_at": now, **validators}
+    if scraped["company_name"]:
+        fields["company_name"] = scraped["company_name"]
+    if not stored:
+        return _outcome("new", fields)
+    stored_hash = stored.get("content_hash") or description_hash(stored.get("description"))
+    return _outcome("unchanged" if stored_hash == fields["content_hash"] else "changed", fields)
+
+
+def _outcome(status: str, fields: dict, **details) -> dict:
+    with _outcomes_lock:
+        _outcomes[status] += 1
+    return {"status": status, "fields": fields, **details}
+
+
+def job_cache_stats() -> dict:
+    """ Freshness outcomes so far, and the share of lookups served without a page download. """
+    with _outcomes_lock:
+        counts = dict(_outcomes)
+    lookups = sum(counts.values())
+    served = counts.get("fresh", 0) + counts.get("not_modified", 0)
+    return {"ttl_seconds": job_cache_ttl(), **counts, "served_without_download": round(served / lookups, 4) if lookups else 0.0}
@@ -0,0 +1,118 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import base64
+import hashlib
+import os
+import random
+import re
+import zlib
+from array import array
+from .models import JobPost, JobSignatureBucket
+
+# Word k-shingles: reposts and agency copies keep most 3-word runs of the original text
+SHINGLE_WORDS = 3
+# Descriptions with fewer shingles (login walls, error pages) are never linked
+MIN_SHINGLES = 50
+# 128 hash functions split into 16 bands of 8 rows: pairs from about 0.7 Jaccard up share a bucket
+NUM_PERM = 128
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+DEFAULT_JOB_DEDUP_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+# Fixed seed: signatures are stored, so the permutations must never change between runs
+_rng = random.Random(20250101)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+
+def job_dedup_threshold() -> float:
+    """
+    Estimated Jaccard similarity at which a new posting is linked to an earlier one.
+    Configured through the JOB_DEDUP_THRESHOLD environment variable (default 0.8; a value
+    above 1 disables linking).
+    """
+    return float(os.getenv("JOB_DEDUP_THRESHOLD", DEFAULT_JOB_DEDUP_THRESHOLD))
+
+
+def shingles(text: str) -> set:
+    """ 32-bit hashes of the text's lowercase word k-shingles. """
+    words = re.findall(r"\w+", (text or "").lower())
+    return {zlib.crc32(" ".join(words[i:i + SHINGLE_WORDS]).encode("utf-8"))
+            for i in range(len(words) - SHINGLE_WORDS + 1)}
+
+
+def minhash_signature(text: str) -> list | None:
+    """ MinHash signature of a description, or None when it has too few shingles to compare. """
+    hashes = shingles(text)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) & _MAX_HASH for a, b in _PERMUTATIONS]
+
+
+def similarity(signature: list, other: list) -> float:
+    """ Estimated Jaccard similarity of the two descriptions' shingle sets. """
+    return sum(x == y for x, y in zip(signature, other)) / NUM_PERM
+
+
+def encode_signature(signature: list) -> str:
+    return base64.b64encode(array("I", signature).tobytes()).decode("ascii")
+
+
+def decode_signature(encoded: str) -> list | None:
+    if not encoded:
+        return None
+    signature = array("I")
+    signature.frombytes(base64.b64decode(encoded))
+    return signature.tolist() if len(signature) == NUM_PERM else None
+
+
+def lsh_buckets(signature: list) -> list:
+    """ One bucket key per band; descriptions sharing any bucket are candidates. """
+    return [f"{band}:{hashlib.blake2b(array('I', signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]).tobytes(), digest_size=8).hexdigest()}"
+            for band in range(LSH_BANDS)]
+
+
+def _find_canonical(db, job_id: int, signature: list):
+    """
+    The most similar canonical job above the threshold, or None. Earlier postings sharing
+    a bucket nominate their canonical job, and the description is compared with that
+    job's own signature, so A ~ B and B ~ C never links C to A unless C ~ A as well.
+    Links only ever point to older postings, so they can't form cycles.
+    """
+    candidate_ids = [row.job_id for row in db.query(JobSignatureBucket.job_id).filter(
+        JobSignatureBucket.bucket.in_(lsh_buckets(signature)), JobSignatureBucket.job_id < job_id).distinct()]
+    canonical_ids = {candidate.canonical_job_id or candidate.id
+                     for candidate in db.query(JobPost).filter(JobPost.id.in_(candidate_ids))}
+    best_score, best = job_dedup_threshold(), None
+    for canonical in db.query(JobPost).filter(JobPost.id.in_(canonical_ids)).order_by(JobPost.id):
+        other = decode_signature(canonical.minhash)
+        score = similarity(signature, other) if other else 0.0
+        if score >= best_score and (best is None or score > best_score):
+            best_score, best = score, canonical
+    return best.id if best else None
+
+
+def _index(db, job_post: JobPost, signature: list | None):
+    db.query(JobSignatureBucket).filter(JobSignatureBucket.job_id == job_post.id).delete()
+    job_post.minhash = encode_signature(signature) if signature else ""
+    job_post.canonical_job_id = _find_canonical(db, job_post.id, signature) if signature else None
+    if signature:
+        db.add_all(JobSignatureBucket(job_id=job_post.id, bucket=bucket) for bucket in lsh_buckets(signature))
+    db.flush()
+
+
+def index_job_post(db, job_post: JobPost):
+    """
+    Signs a stored job post's description, links it to the canonical job of its closest
+    near-duplicate (if any) and records it in the LSH index. Postings linked to this one
+    were matched against its previous text, so they are re-linked too. The caller commits.
+    """
+    db.flush() # job_post needs its id
+    _index(db, job_post, minhash_signature(job_post.description))
+    dependents = db.query(JobPost).filter(JobPost.canonical_job_id == job_post.id).order_by(JobPost.id).all()
+    for dependent in dependents:
+        dependent.canonical_job_id = None
+    db.flush()
+    for dependent in dependents:
+        _index(db, dependent, decode_signature(dependent.minhash))
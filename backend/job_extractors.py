@@ -0,0 +1,247 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import html
+import json
+import re
+from urllib.parse import urlparse, unquote
+from lxml import etree
+from lxml import html as lxml_html
+
+# schema.org JSON-LD blocks, found with a regex over the raw bytes so pages that carry a
+# JobPosting never need an HTML parse
+LD_JSON_PATTERN = re.compile(rb"""<script[^>]*?type\s*=\s*["']?application/ld\+json["']?[^>]*>(.*?)</script\s*>""", re.I | re.S)
+# Elements whose text is never part of a posting
+NON_CONTENT_TAGS = ("script", "style", "noscript", "template")
+PAGE_CHROME_TAGS = ("header", "footer", "nav")
+
+# LinkedIn: "Acme Corp hiring Java Developer in Austin, TX | LinkedIn"
+LINKEDIN_TITLE = re.compile(r"^(.+?) hiring ")
+# Monster: "Java Developer Job in Austin, TX at Acme Corp | Monster.com"
+MONSTER_TITLE = re.compile(r" at ([^|]+?)\s*(\||$)")
+
+
+class SiteAdapter:
+    """
+    How to read postings from one job site: the hosts it serves, the elements that hold
+    the description (by class, then by tag) and the company (by class or attribute), and
+    page-title patterns whose first group names the company. Only consulted when the page
+    has no usable JSON-LD JobPosting.
+    """
+
+    def __init__(self, name: str, hosts=(), description_classes=(), description_tags=("article",),
+                 company_classes=(), company_attributes=(), title_patterns=()):
+        self.name = name
+        self.hosts = hosts
+        self.description_classes = description_classes
+        self.description_tags = description_tags
+        self.company_classes = company_classes
+        self.company_attributes = company_attributes
+        self.title_patterns = title_patterns
+
+    def matches(self, host: str) -> bool:
+        return any(host == h or host.endswith("." + h) for h in self.hosts)
+
+
+LINKEDIN = SiteAdapter(
+    "linkedin",
+    hosts=("linkedin.com",),
+    description_classes=("description__text", "show-more-less-html__markup", "jobs-description__content"),
+    company_classes=("topcard__org-name-link", "top-card-layout__company-name"),
+    title_patterns=(LINKEDIN_TITLE,),
+)
+MONSTER = SiteAdapter(
+    "monster",
+    hosts=("monster.com",),
+    company_attributes=(("data-testid", "company-name"),),
+    title_patterns=(MONSTER_TITLE,),
+)
+# Any other site: every known container and pattern, in the order the sites above use them
+GENERIC = SiteAdapter(
+    "generic",
+    description_classes=LINKEDIN.description_classes,
+    company_classes=LINKEDIN.company_classes,
+    company_attributes=MONSTER.company_attributes,
+    title_patterns=(LINKEDIN_TITLE, MONSTER_TITLE),
+)
+
+_adapters = [LINKEDIN, MONSTER]
+
+
+def register_adapter(adapter: SiteAdapter):
+    """ Adds a site adapter; it takes precedence over those registered before it. """
+    _adapters.insert(0, adapter)
+
+
+def adapter_for(url: str) -> SiteAdapter:
+    host = (urlparse(url).hostname or "").lower()
+    return next((adapter for adapter in _adapters if adapter.matches(host)), GENERIC)
+
+
+def clean_company_name(name) -> str | None:
+    """ Normalizes whitespace and rejects empty or placeholder company names. """
+    if not isinstance(name, str):
+        return None
+    name = re.sub(r"\s+", " ", name).strip(" |-,")
+    if not name or name.lower() in ("company", "confidential", "linkedin", "monster"):
+        return None
+    return name[:100]
+
+
+def company_from_slug(url: str) -> str | None:
+    """
+    Recovers the company from URL slugs, e.g.
+    linkedin.com/jobs/view/java-developer-at-acme-corp-4344831856 -> "Acme Corp"
+    linkedin.com/company/acme-corp/jobs -> "Acme Corp"
+    """
+    path = unquote(urlparse(url).path).lower()
+    match = re.search(r"/jobs/view/[a-z0-9-]*?-at-([a-z0-9-]+?)-\d+/?$", path) or \
+            re.search(r"/company/([a-z0-9-]+)", path)
+    if not match:
+        return None
+    return clean_company_name(match.group(1).replace("-", " ").title())
+
+
+def _find_job_posting(data):
+    """ Walks a JSON-LD payload (object, list or @graph) for a JobPosting, or any object naming a hiringOrganization. """
+    if isinstance(data, list):
+        for item in data:
+            posting = _find_job_posting(item)
+            if posting:
+                return posting
+    elif isinstance(data, dict):
+        if "@graph" in data:
+            return _find_job_posting(data["@graph"])
+        kinds = data.get("@type")
+        if "JobPosting" in (kinds if isinstance(kinds, list) else [kinds]) or "hiringOrganization" in data:
+            return data
+    return None
+
+
+def _hiring_organization(posting: dict) -> str | None:
+    org = posting.get("hiringOrganization")
+    if isinstance(org, list) and org:
+        org = org[0]
+    if isinstance(org, dict):
+        return clean_company_name(org.get("name"))
+    return clean_company_name(org)
+
+
+def read_json_ld(content: bytes) -> dict | None:
+    """ The first JobPosting in the page's JSON-LD blocks, without parsing the HTML; None if there is none. """
+    if b"ld+json" not in content:
+        return None
+    for match in LD_JSON_PATTERN.finditer(content):
+        try:
+            posting = _find_job_posting(json.loads(match.group(1)))
+        except ValueError:
+            continue
+        if posting:
+            return posting
+    return None
+
+
+def element_text(element) -> str:
+    """ Text of an element as one stripped line per text node (like BeautifulSoup's get_text("\\n", strip=True)). """
+    return "\n".join(text.strip() for text in element.itertext() if text.strip())
+
+
+def html_fragment_text(fragment: str) -> str:
+    """ Text of an HTML fragment, such as a JSON-LD description (which sites often entity-escape). """
+    if "<" not in fragment and "&lt;" in fragment:
+        fragment = html.unescape(fragment)
+    if not fragment.strip():
+        return ""
+    root = lxml_html.fragment_fromstring(fragment, create_parent="div")
+    etree.strip_elements(root, *NON_CONTENT_TAGS, with_tail=False)
+    return element_text(root)
+
+
+def _parse_page(content: bytes):
+    """ Parses a page with lxml's C parser, as UTF-8 unless the bytes aren't (then lxml sniffs the charset). """
+    try:
+        content.decode("utf-8")
+        parser = lxml_html.HTMLParser(encoding="utf-8", remove_comments=True)
+    except UnicodeDecodeError:
+        parser = lxml_html.HTMLParser(remove_comments=True)
+    root = lxml_html.document_fromstring(content, parser=parser)
+    etree.strip_elements(root, *NON_CONTENT_TAGS, with_tail=False)
+    return root
+
+
+def _with_class(root, name: str):
+    return root.xpath(f'//*[contains(concat(" ", normalize-space(@class), " "), " {name} ")]')
+
+
+def _page_description(root, adapter: SiteAdapter) -> tuple[str, str]:
+    for name in adapter.description_classes:
+        found = _with_class(root, name)
+        if found:
+            return element_text(found[0]), "container"
+    for tag in adapter.description_tags:
+        found = root.xpath(f"//{tag}")
+        if found:
+            return element_text(found[0]), "container"
+    # No known container: the page's text without scripts and site chrome
+    etree.strip_elements(root, *PAGE_CHROME_TAGS, with_tail=False)
+    return element_text(root), "page"
+
+
+def _page_title(root) -> str:
+    og_title = root.xpath('//meta[@property="og:title"]/@content')
+    if og_title and og_title[0]:
+        return og_title[0]
+    title = root.find(".//title")
+    return title.text_content() if title is not None else ""
+
+
+def _page_company(root, adapter: SiteAdapter) -> str | None:
+    for name in adapter.company_classes:
+        for element in _with_class(root, name)[:1]:
+            company = clean_company_name("".join(text.strip() for text in element.itertext()))
+            if company:
+                return company
+    for attribute, value in adapter.company_attributes:
+        for element in root.xpath(f'//*[@{attribute}="{value}"]')[:1]:
+            company = clean_company_name("".join(text.strip() for text in element.itertext()))
+            if company:
+                return company
+    title = _page_title(root)
+    for pattern in adapter.title_patterns:
+        match = pattern.search(title)
+        company = clean_company_name(match.group(1)) if match else None
+        if company:
+            return company
+    return None
+
+
+def extract_job_posting(content: bytes, url: str) -> dict:
+    """
+    Extracts {"title", "company_name", "description", "source", "adapter"} from a job page.
+    The JSON-LD JobPosting, found by regex, answers when it carries a description; only
+    otherwise is the page parsed (lxml) and read through the site's adapter. The company
+    falls back from JSON-LD to page metadata to the URL slug, and is None if not found.
+    source is "json-ld", "container" (an adapter's description element) or "page".
+    """
+    adapter = adapter_for(url)
+    posting = read_json_ld(content) or {}
+    title = posting.get("title") if isinstance(posting.get("title"), str) else None
+    company_name = _hiring_organization(posting) if posting else None
+    description = posting.get("description")
+    description = html_fragment_text(description) if isinstance(description, str) else ""
+    source = "json-ld"
+
+    if not description or not company_name:
+        root = _parse_page(content)
+        title = title or _page_title(root) or None
+        # Metadata first: the description fallback may strip page chrome holding the company
+        company_name = company_name or _page_company(root, adapter)
+        if not description:
+            description, source = _page_description(root, adapter)
+
+    return {
+        "title": title.strip() if title else None,
+        "company_name": company_name or company_from_slug(url),
+        "description": description,
+        "source": source,
+        "adapter": adapter.name,
+    }
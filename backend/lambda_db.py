@@ -15,7 +15,8 @@ def get_job_table():
 def get_resume_table():
     return dynamodb.Table(RESUMES_TABLE)
 
-def create_job_post(url, description):
+def create_job_post(url, description, company_name=None, **fields):
+    """ Stores a new job post; extra fields (e.g. fetched_at, etag) are stored as attributes. """
     table = get_job_table()
     job_id = str(uuid.uuid4())
     timestamp = datetime.now().isoformat()
@@ -26,6 +27,9 @@ def create_job_post(url, description):
         'description': description,
         'created_at': timestamp
     }
+    if company_name:
+        item['company_name'] = company_name
+    item.update({k: v for k, v in fields.items() if v is not None})
     
     try:
         table.put_item(Item=item)
@@ -64,6 +68,35 @@ def update_job_post(job_id, description):
         print(f"Error updating job post: {e}")
         return None
 
+def update_job_fields(job_id, fields):
+    """ Sets the given attributes on a job post and returns the updated item. """
+    table = get_job_table()
+    names = {f"#f{i}": name for i, name in enumerate(fields)}
+    values = {f":v{i}": value for i, value in enumerate(fields.values())}
+    try:
+        response = table.update_item(
+            Key={'id': job_id},
+            UpdateExpression="set " + ", ".join(f"#f{i}=:v{i}" for i in range(len(fields))),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_NEW"
+        )
+        return response.get('Attributes')
+    except ClientError as e:
+        print(f"Error updating job post: {e}")
+        return None
+
+def set_job_company_name(job_id, company_name):
+    table = get_job_table()
+    try:
+        table.update_item(
+            Key={'id': job_id},
+            UpdateExpression="set company_name=:c",
+            ExpressionAttributeValues={':c': company_name}
+        )
+    except ClientError as e:
+        print(f"Error updating job company name: {e}")
+
 def get_job_post_by_id(job_id):
     table = get_job_table()
     try:
@@ -73,7 +106,7 @@ def get_job_post_by_id(job_id):
         print(f"Error getting job post by ID: {e}")
         return None
 
-def create_resume_record(filename, content, s3_key):
+def create_resume_record(filename, content, s3_key, structure_index=None, content_hash=None):
     table = get_resume_table()
     resume_id = str(uuid.uuid4())
     timestamp = datetime.now().isoformat()
@@ -85,6 +118,10 @@ def create_resume_record(filename, content, s3_key):
         'original_path': s3_key, # Using S3 key instead of local path
         'created_at': timestamp
     }
+    if structure_index:
+        item['structure_index'] = structure_index # JSON string (see resume_index)
+    if content_hash:
+        item['content_hash'] = content_hash # SHA-256 of the upload (see upload_store)
     
     try:
         table.put_item(Item=item)
@@ -101,3 +138,20 @@ def get_resume_by_id(resume_id):
     except ClientError as e:
         print(f"Error getting resume: {e}")
         return None
+
+def get_resume_by_hash(content_hash):
+    table = get_resume_table()
+    try:
+        # Scan like get_job_post_by_url; a GSI on content_hash would make this a query.
+        # A scan page covers at most 1 MB of the table, so follow LastEvaluatedKey until a match.
+        scan_kwargs = {'FilterExpression': boto3.dynamodb.conditions.Attr('content_hash').eq(content_hash)}
+        while True:
+            response = table.scan(**scan_kwargs)
+            if response['Items']:
+                return response['Items'][0]
+            if 'LastEvaluatedKey' not in response:
+                return None
+            scan_kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    except ClientError as e:
+        print(f"Error getting resume by hash: {e}")
+        return None
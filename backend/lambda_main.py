@@ -1,5 +1,8 @@
+import io
 import os
-import shutil
+import json
+import uuid
+from datetime import datetime
 from fastapi import FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
@@ -9,19 +12,23 @@ from mangum import Mangum
 try:
     from . import lambda_db as db
     from . import aws_utils
-    from .scraper import validate_url, scrape_job_description
-    from .resume_parser import parse_resume
+    from .scraper import normalize_job_url, validate_url
+    from .job_cache import refresh_job_posting
+    from .upload_store import UploadTooLargeError, analyze_upload, store_upload
     from .resume_generator import generate_tailored_resume
 except ImportError:
     # Fallback for when running as top-level script (in Lambda root)
     import lambda_db as db
     import aws_utils
-    from scraper import validate_url, scrape_job_description
-    from resume_parser import parse_resume
+    from scraper import normalize_job_url, validate_url
+    from job_cache import refresh_job_posting
+    from upload_store import UploadTooLargeError, analyze_upload, store_upload
     from resume_generator import generate_tailored_resume
 
 app = FastAPI(title="Resume Generator API (Serverless)")
 
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -47,14 +54,18 @@ def validate_and_scrape(request: UrlRequest):
     if not validate_url(request.url):
         return {"valid": False, "message": "Please enter valid URL"}
     
-    # Check DB
-    existing_job = db.get_job_post_by_url(request.url)
+    # Keyed without tracking parameters, so shared links of one posting find the same job
+    url = normalize_job_url(request.url)
+    # Served from DynamoDB while fresh, revalidated with a conditional request once stale (see job_cache)
+    existing_job = db.get_job_post_by_url(url) or (db.get_job_post_by_url(request.url) if url != request.url else None)
+    outcome = refresh_job_posting(url, existing_job)
+    fields = {k: v.isoformat() if isinstance(v, datetime) else v for k, v in outcome["fields"].items()}
     if existing_job:
-        job_post = existing_job
-        description = job_post.get('description', '')
+        job_post = db.update_job_fields(existing_job['id'], fields) if fields else existing_job
     else:
-        description = scrape_job_description(request.url)
-        job_post = db.create_job_post(request.url, description)
+        description = fields.pop("description", "")
+        job_post = db.create_job_post(url, description, fields.pop("company_name", None), **fields)
+    description = job_post.get('description', '') if job_post else ''
     
     if not job_post:
          raise HTTPException(status_code=500, detail="Database Error")
@@ -64,31 +75,41 @@ def validate_and_scrape(request: UrlRequest):
         "message": "Valid URL, analyzing the Job Post",
         "data": {
             "job_id": job_post['id'],
-            "description_preview": description[:100] + "..." if description else "No description found"
+            "description_preview": description[:100] + "..." if description else "No description found",
+            "fetch_status": outcome["status"]
         }
     }
 
 @app.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...)):
-    # Use /tmp for lambda storage
-    upload_dir = "/tmp" 
-    file_path = os.path.join(upload_dir, file.filename)
-    
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    parsed_content = parse_resume(file_path)
-    
-    # Upload to S3
-    s3_key = f"uploads/{file.filename}"
-    if not aws_utils.upload_file_to_s3(file_path, s3_key):
+def upload_resume(file: UploadFile = File(...)):
+    # Use /tmp for lambda storage; the file is hashed and size-capped while it is written
+    try:
+        stored = store_upload(file.file, file.filename, "/tmp")
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    # Identical re-uploads return the existing record without re-parsing
+    existing = db.get_resume_by_hash(stored["content_hash"])
+    if existing:
+        os.remove(stored["path"])
+        return {
+            "message": "It is uploaded successfully",
+            "data": {"resume_id": existing['id'], "filename": existing['filename'], "duplicate": True}
+        }
+
+    # Parse the text and index the document structure once so rendering doesn't re-classify it
+    parsed_content, structure_index = analyze_upload(stored["path"], stored["content_hash"])
+
+    # Upload to S3 under the content hash, so same-named uploads never collide
+    s3_key = f"uploads/{os.path.basename(stored['path'])}"
+    if not aws_utils.upload_file_to_s3(stored["path"], s3_key):
          raise HTTPException(status_code=500, detail="S3 Upload Failed")
          
     # Clean up tmp
-    os.remove(file_path)
+    os.remove(stored["path"])
 
     # Save to DynamoDB
-    resume = db.create_resume_record(file.filename, parsed_content, s3_key)
+    resume = db.create_resume_record(file.filename, parsed_content, s3_key, structure_index, stored["content_hash"])
     if not resume:
         raise HTTPException(status_code=500, detail="Database Save Failed")
     
@@ -96,7 +117,8 @@ async def upload_resume(file: UploadFile = File(...)):
         "message": "It is uploaded successfully",
         "data": {
             "resume_id": resume['id'],
-            "filename": resume['filename']
+            "filename": resume['filename'],
+            "duplicate": False
         }
     }
 
@@ -113,31 +135,42 @@ def generate_resume(request: GenerateRequest):
     if request.api_key:
         api_key = request.api_key
         
-    output_dir = "/tmp"
-    filename = f"tailored_resume_{request.job_id}_{request.resume_id}.docx"
-    output_path = os.path.join(output_dir, filename)
+    # The source resume is read from S3 into memory and the result rendered into memory;
+    # nothing touches /tmp
+    original = aws_utils.read_s3_object(resume['original_path'])
+    if original is None:
+        raise HTTPException(status_code=500, detail="Resume file could not be read")
+    output = io.BytesIO()
     
     # Generate
     _, status_message, company_name = generate_tailored_resume(
-        resume['content'], 
+        original, 
         job_post['description'], 
-        output_path, 
-        api_key
+        output, 
+        api_key,
+        known_company_name=job_post.get('company_name'),
+        structure_index=json.loads(resume['structure_index']) if resume.get('structure_index') else None,
+        resume_id=resume['id'],
+        content_hash=resume.get('content_hash'),
+        rendition_key=(request.job_id, request.resume_id)
     )
+    if not output.getbuffer().nbytes:
+        raise HTTPException(status_code=500, detail=status_message)
+
+    # Memoize the company per job so the LLM fallback runs at most once
+    if not job_post.get('company_name') and company_name and company_name.lower() != "company":
+        db.set_job_company_name(job_post['id'], company_name)
     
-    # Rename if company name found
-    final_filename = filename
+    # Name after the company when found
+    final_filename = f"tailored_resume_{request.job_id}_{request.resume_id}.docx"
     if company_name and company_name.lower() != "company":
         original_basename = os.path.splitext(resume['filename'])[0]
-        final_filename = f"{original_basename}_{company_name}.docx"
-        new_output_path = os.path.join(output_dir, final_filename)
-        if os.path.exists(output_path):
-            os.rename(output_path, new_output_path)
-            output_path = new_output_path
-
-    # Upload Generated file to S3
-    s3_key = f"generated/{final_filename}"
-    if not aws_utils.upload_file_to_s3(output_path, s3_key):
+        final_filename = f"{original_basename}_{company_name}.docx".replace("/", "_")
+
+    # Upload the buffer to S3 under a per-generation prefix, so concurrent requests never clobber each other
+    s3_key = f"generated/{uuid.uuid4().hex}/{final_filename}"
+    output.seek(0)
+    if not aws_utils.upload_fileobj_to_s3(output, s3_key, DOCX_MEDIA_TYPE):
          raise HTTPException(status_code=500, detail="S3 Upload Failed")
          
     # Get Presigned URL
@@ -149,6 +182,13 @@ def generate_resume(request: GenerateRequest):
         "filename": final_filename
     }
 
+@app.get("/download-resume/{token}/{filename}")
+def download_generated_resume(token: str, filename: str):
+    url = aws_utils.get_presigned_url(f"generated/{token}/{filename}")
+    if not url:
+        raise HTTPException(status_code=404, detail="File not found")
+    return {"url": url}
+
 @app.get("/download-resume/{filename}")
 def download_resume(filename: str):
     # This endpoint might not be needed if generate-resume returns the direct S3 URL.
@@ -0,0 +1,284 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+# Defaults can be overridden through environment variables (see get_response_cache).
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def _normalize_text(text: str) -> str:
+    """ Collapses whitespace so cosmetic differences don't defeat the cache. """
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def make_cache_key(summary_text: str, experience_entries: list[dict], job_description: str,
+                   prompt_version: str, model_name: str) -> str:
+    """
+    Builds a content-addressed key for an optimization request.
+    The key is a SHA-256 over the normalized resume payload, the job description,
+    the prompt template version and the model name.
+    """
+    payload = {
+        "summary": _normalize_text(summary_text),
+        "entries": [
+            {
+                "header": _normalize_text(e.get("header", "")),
+                "bullets": [_normalize_text(b) for b in e.get("bullets", [])]
+            }
+            for e in experience_entries
+        ],
+        "job_description": _normalize_text(job_description),
+        "prompt_version": prompt_version,
+        "model": model_name,
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    Local cache backend stored in a SQLite file.
+    Evicts least-recently-used rows once the entry count or total size exceeds its bounds.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, key: str):
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return None
+            value, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn, now: float):
+        """ Drops expired rows, then the least recently used ones until within bounds. """
+        if self.ttl_seconds:
+            conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC").fetchall()
+        victims = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", victims)
+
+    def describe(self) -> dict:
+        with self._lock, self._connect() as conn:
+            count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        return {"backend": "sqlite", "entries": count, "bytes": total,
+                "max_entries": self.max_entries, "max_bytes": self.max_bytes}
+
+
+class DynamoDBCacheBackend:
+    """
+    Cache backend for the Lambda deployment, stored in a DynamoDB table keyed on 'key'.
+    Expiry relies on the table's native TTL attribute ('expires_at'); DynamoDB has no
+    LRU so size is bounded by the TTL instead.
+    """
+
+    def __init__(self, table_name: str, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        import boto3
+        self.table = boto3.resource("dynamodb").Table(table_name)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str):
+        item = self.table.get_item(Key={"key": key}).get("Item")
+        if not item:
+            return None
+        # TTL deletion is lazy in DynamoDB, so double-check expiry here
+        if int(item.get("expires_at", 0)) < time.time():
+            return None
+        return item.get("value")
+
+    def set(self, key: str, value: str):
+        self.table.put_item(Item={
+            "key": key,
+            "value": value,
+            "expires_at": int(time.time() + self.ttl_seconds),
+        })
+
+    def describe(self) -> dict:
+        return {"backend": "dynamodb", "table": self.table.name}
+
+
+class S3CacheBackend:
+    """
+    Cache backend storing each response as an S3 object under a prefix.
+    Expiry is checked against the object's LastModified; a bucket lifecycle rule
+    on the prefix should be used to reclaim space.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "llm-cache/", ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        import boto3
+        self.s3 = boto3.client("s3")
+        self.bucket = bucket
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str):
+        try:
+            obj = self.s3.get_object(Bucket=self.bucket, Key=self.prefix + key)
+        except self.s3.exceptions.NoSuchKey:
+            return None
+        if time.time() - obj["LastModified"].timestamp() > self.ttl_seconds:
+            return None
+        return obj["Body"].read().decode("utf-8")
+
+    def set(self, key: str, value: str):
+        self.s3.put_object(Bucket=self.bucket, Key=self.prefix + key,
+                           Body=value.encode("utf-8"), ContentType="application/json")
+
+    def describe(self) -> dict:
+        return {"backend": "s3", "bucket": self.bucket, "prefix": self.prefix}
+
+
+class ResponseCache:
+    """
+    Front-end for a cache backend that (de)serializes JSON values and keeps hit/miss counters.
+    Backend failures are logged and treated as misses so the cache can never break generation.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str):
+        try:
+            raw = self.backend.get(key)
+        except Exception as e:
+            print(f"DEBUG: LLM cache read failed - {e}")
+            raw = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(raw)
+
+    def set(self, key: str, value: dict):
+        try:
+            self.backend.set(key, json.dumps(value, ensure_ascii=False))
+        except Exception as e:
+            print(f"DEBUG: LLM cache write failed - {e}")
+            with self._lock:
+                self.errors += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+        try:
+            stats.update(self.backend.describe())
+        except Exception as e:
+            stats["backend_error"] = str(e)
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """
+    Returns the process-wide response cache, or None when caching is disabled.
+    Configured through environment variables:
+      LLM_CACHE_BACKEND      sqlite (default), dynamodb, s3 or none
+      LLM_CACHE_PATH         SQLite file (default ./llm_cache.db, /tmp/llm_cache.db on Lambda)
+      LLM_CACHE_TABLE        DynamoDB table name (selects dynamodb when no backend is given)
+      LLM_CACHE_BUCKET       S3 bucket for the s3 backend (defaults to RESUME_BUCKET)
+      LLM_CACHE_TTL_SECONDS  entry lifetime
+      LLM_CACHE_MAX_ENTRIES  / LLM_CACHE_MAX_BYTES  LRU bounds for the sqlite backend
+    """
+    global _cache
+    if _cache is not None:
+        return _cache or None
+
+    with _cache_lock:
+        if _cache is not None:
+            return _cache or None
+
+        ttl = int(os.getenv("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        table = os.getenv("LLM_CACHE_TABLE")
+        backend_name = os.getenv("LLM_CACHE_BACKEND", "dynamodb" if table else "sqlite").lower()
+
+        try:
+            if backend_name == "none":
+                backend = None
+            elif backend_name == "dynamodb":
+                backend = DynamoDBCacheBackend(table, ttl_seconds=ttl)
+            elif backend_name == "s3":
+                bucket = os.getenv("LLM_CACHE_BUCKET") or os.getenv("RESUME_BUCKET")
+                backend = S3CacheBackend(bucket, ttl_seconds=ttl)
+            else:
+                default_path = "/tmp/llm_cache.db" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "./llm_cache.db"
+                backend = SQLiteCacheBackend(
+                    os.getenv("LLM_CACHE_PATH", default_path),
+                    ttl_seconds=ttl,
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+                )
+        except Exception as e:
+            print(f"DEBUG: LLM cache disabled - {e}")
+            backend = None
+
+        # False marks "initialised but disabled" so we don't retry on every call
+        _cache = ResponseCache(backend) if backend else False
+        return _cache or None
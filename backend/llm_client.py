@@ -0,0 +1,192 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import json
+import os
+import threading
+import httpx
+
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com/v1beta"
+
+# Tunables (per worker process)
+MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", 256))
+MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", 100))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", 120))
+
+
+class _SharedTransport:
+    """
+    One pooled HTTP/1.1 keep-alive client and one concurrency semaphore per event loop.
+    Both are bound to the loop that created them, so they are rebuilt if a different
+    loop (e.g. a fresh asyncio.run in a script) starts using the module.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.get_running_loop()
+        self.http = httpx.AsyncClient(
+            base_url=GEMINI_API_BASE,
+            limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=10.0),
+        )
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+
+_transport = None
+
+
+def _get_transport() -> _SharedTransport:
+    global _transport
+    loop = asyncio.get_running_loop()
+    if _transport is None or _transport.loop is not loop or _transport.http.is_closed:
+        _transport = _SharedTransport()
+    return _transport
+
+
+class AsyncGeminiClient:
+    """
+    asyncio-native Gemini client that talks to the REST API over the shared pooled transport.
+    In-flight requests are bounded by a process-wide semaphore (GEMINI_MAX_CONCURRENCY)
+    instead of by the size of Starlette's threadpool.
+    """
+
+    def __init__(self, api_key: str, model_name: str):
+        self.api_key = api_key
+        self.model_name = model_name
+
+    async def generate_content(self, prompt: str) -> str:
+        """
+        Sends a single-turn prompt and returns the text of the first candidate.
+        Raises httpx.HTTPStatusError on non-2xx responses.
+        """
+        transport = _get_transport()
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        async with transport.semaphore:
+            response = await transport.http.post(
+                f"/models/{self.model_name}:generateContent",
+                headers={"x-goog-api-key": self.api_key},
+                json=payload,
+            )
+        response.raise_for_status()
+        return extract_response_text(response.json())
+
+    async def stream_generate_content(self, prompt: str):
+        """
+        Streams a single-turn prompt over server-sent events and yields text chunks
+        as the model produces them. The concurrency slot is held until the stream ends.
+        """
+        transport = _get_transport()
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        async with transport.semaphore:
+            async with transport.http.stream(
+                "POST",
+                f"/models/{self.model_name}:streamGenerateContent",
+                params={"alt": "sse"},
+                headers={"x-goog-api-key": self.api_key},
+                json=payload,
+            ) as response:
+                if response.is_error:
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    chunk = json.loads(line[len("data:"):].strip())
+                    if chunk.get("candidates"):
+                        text = extract_response_text(chunk)
+                        if text:
+                            yield text
+
+
+class GeminiClient:
+    """
+    Blocking counterpart of AsyncGeminiClient, over one pooled keep-alive client shared by
+    all keys. The API key travels with each request rather than through the SDK's
+    process-global genai.configure, so concurrent requests with different keys can't
+    end up calling with each other's.
+    """
+
+    def __init__(self, api_key: str, model_name: str):
+        self.api_key = api_key
+        self.model_name = model_name
+
+    def _post(self, method: str, payload: dict) -> dict:
+        response = _get_sync_http().post(
+            f"/models/{self.model_name}:{method}",
+            headers={"x-goog-api-key": self.api_key},
+            json=payload,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def generate_content(self, prompt: str) -> str:
+        """
+        Sends a single-turn prompt and returns the text of the first candidate.
+        Raises httpx.HTTPStatusError on non-2xx responses.
+        """
+        return extract_response_text(self._post("generateContent", {"contents": [{"parts": [{"text": prompt}]}]}))
+
+    def count_tokens(self, text: str) -> int:
+        return self._post("countTokens", {"contents": [{"parts": [{"text": text}]}]})["totalTokens"]
+
+
+_sync_http = None
+_sync_http_lock = threading.Lock()
+
+
+def _get_sync_http() -> httpx.Client:
+    """ The pooled client behind GeminiClient; httpx.Client is thread-safe, so one serves every thread. """
+    global _sync_http
+    with _sync_http_lock:
+        if _sync_http is None or _sync_http.is_closed:
+            _sync_http = httpx.Client(
+                base_url=GEMINI_API_BASE,
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+                timeout=httpx.Timeout(REQUEST_TIMEOUT_SECONDS, connect=10.0),
+            )
+        return _sync_http
+
+
+def extract_response_text(result: dict) -> str:
+    """ Returns the concatenated text parts of the first candidate in a Gemini response. """
+    candidates = result.get("candidates") or []
+    if not candidates:
+        raise ValueError(f"Gemini returned no candidates: {result.get('promptFeedback', result)}")
+    parts = candidates[0].get("content", {}).get("parts", [])
+    return "".join(part.get("text", "") for part in parts)
+
+
+_clients: dict[tuple[str, str], AsyncGeminiClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_async_client(api_key: str, model_name: str) -> AsyncGeminiClient:
+    """
+    Returns the process-wide client for an API key (and model), creating it on first use.
+    """
+    key = (api_key, model_name)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.setdefault(key, AsyncGeminiClient(api_key, model_name))
+    return client
+
+
+def get_concurrency_stats() -> dict:
+    """ Reports the configured limits and the number of LLM calls currently in flight. """
+    stats = {"max_concurrency": MAX_CONCURRENCY, "max_connections": MAX_CONNECTIONS,
+             "clients": len(_clients), "in_flight": 0}
+    if _transport is not None:
+        stats["in_flight"] = MAX_CONCURRENCY - _transport.semaphore._value
+    return stats
+
+
+async def aclose_clients():
+    """ Closes the pooled transports; call on application shutdown. """
+    global _transport, _sync_http
+    if _transport is not None and not _transport.http.is_closed:
+        await _transport.http.aclose()
+    _transport = None
+    with _sync_http_lock:
+        if _sync_http is not None:
+            _sync_http.close()
+        _sync_http = None
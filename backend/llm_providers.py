@@ -0,0 +1,61 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import os
+import threading
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .llm_client import GeminiClient, get_async_client
+    # The interface, the fake and record/replay are shared with lambda/ (see llm_shared);
+    # they are importable from here too, as callers always have
+    from .llm_shared import (FakeProvider, FakeProviderError, LLMProvider, RecordReplayProvider, ReplayMissError,
+                             fake_provider_from_env, parse_latency_spec, select_provider)
+except ImportError:
+    from llm_client import GeminiClient, get_async_client
+    from llm_shared import (FakeProvider, FakeProviderError, LLMProvider, RecordReplayProvider, ReplayMissError,
+                            fake_provider_from_env, parse_latency_spec, select_provider)
+
+
+class GeminiProvider(LLMProvider):
+    """ Google Gemini over the pooled REST clients, with the provider's API key on every request. """
+
+    name = "gemini"
+
+    def __init__(self, api_key: str, model_name: str):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.client = GeminiClient(api_key, model_name)
+
+    def generate(self, prompt: str) -> str:
+        return self.client.generate_content(prompt)
+
+    async def generate_async(self, prompt: str) -> str:
+        return await get_async_client(self.api_key, self.model_name).generate_content(prompt)
+
+    async def stream_async(self, prompt: str):
+        async for chunk in get_async_client(self.api_key, self.model_name).stream_generate_content(prompt):
+            yield chunk
+
+    def count_tokens(self, text: str) -> int:
+        return self.client.count_tokens(text)
+
+
+_fake_provider = None
+_providers_lock = threading.Lock()
+
+
+def _get_fake_provider() -> FakeProvider:
+    """ One fake per process, so its seeded latency/error sequence spans all requests. """
+    global _fake_provider
+    with _providers_lock:
+        if _fake_provider is None:
+            _fake_provider = fake_provider_from_env()
+        return _fake_provider
+
+
+def get_provider(api_key: str, model_name: str) -> LLMProvider | None:
+    """
+    Returns the model backend selected by LLM_PROVIDER (see llm_shared.select_provider):
+    gemini (default), fake, record or replay. None for Gemini without an API key.
+    """
+    return select_provider(lambda: GeminiProvider(api_key, model_name) if api_key else None, model_name, _get_fake_provider)
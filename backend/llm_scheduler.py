@@ -0,0 +1,319 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+# Standard library only: the standalone Lambda in lambda/ runs an exact copy of this file
+# (test_llm_shared checks the two stay identical); edit this one and copy it over.
+
+import asyncio
+import heapq
+import itertools
+import os
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Lower numbers are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# Status codes worth retrying: quota exhaustion and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# How often queued callers that are not at the head of the queue re-check their turn
+_POLL_SECONDS = 0.05
+
+
+def parse_retry_after(value) -> float | None:
+    """ Parses a Retry-After header given either as delta-seconds or as an HTTP date. """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(exc: Exception) -> tuple[bool, float | None]:
+    """
+    Decides whether a failed model call should be retried.
+    Returns (retryable, retry_after_seconds). Understands httpx errors from the async client
+    and google.api_core errors from the google-generativeai SDK.
+    """
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES, parse_retry_after(response.headers.get("Retry-After"))
+
+    # google.api_core exceptions carry an HTTP-equivalent code
+    code = getattr(exc, "code", None)
+    if isinstance(code, int):
+        return code in RETRYABLE_STATUS_CODES, None
+
+    # Connection resets and timeouts (httpx.TransportError, requests.ConnectionError, ...)
+    name = type(exc).__name__
+    return any(marker in name for marker in ("Timeout", "Connect", "Transport", "Network", "RemoteProtocol")), None
+
+
+def backoff_delay(attempt: int, retry_after: float = None, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Full-jitter exponential backoff. A server-provided Retry-After is honored as the minimum,
+    with a little jitter added so workers don't all retry at the same instant.
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after + random.uniform(0, base))
+    return delay
+
+
+class MemoryBucketStore:
+    """ In-process token bucket state; enough when a single worker process talks to the model. """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = {}
+
+    def try_consume(self, requests: list[tuple[str, float, float, float]]) -> float:
+        """
+        Atomically takes `amount` from every bucket in `requests` ((name, capacity, refill_per_second, amount)),
+        or from none of them. Returns 0 on success, otherwise the seconds until it would succeed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return _consume(self._state.get, self._state.__setitem__, requests, now)
+
+
+class SQLiteBucketStore:
+    """
+    Token bucket state shared by every worker process on the host through a SQLite file.
+    BEGIN IMMEDIATE serializes the read-modify-write across processes.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quota_buckets ("
+                " name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def try_consume(self, requests: list[tuple[str, float, float, float]]) -> float:
+        now = time.time()
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = {
+                name: (tokens, updated_at)
+                for name, tokens, updated_at in conn.execute("SELECT name, tokens, updated_at FROM quota_buckets")
+            }
+            updates = {}
+            wait = _consume(rows.get, updates.__setitem__, requests, now)
+            conn.executemany(
+                "INSERT OR REPLACE INTO quota_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                [(name, tokens, updated_at) for name, (tokens, updated_at) in updates.items()]
+            )
+            conn.execute("COMMIT")
+            return wait
+        except Exception:
+            # BEGIN IMMEDIATE itself can fail ("database is locked"); a ROLLBACK without a
+            # transaction would raise in its place and hide that error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+
+def _consume(get_state, set_state, requests, now: float) -> float:
+    """ Shared token bucket arithmetic for the stores above. """
+    levels = []
+    wait = 0.0
+    for name, capacity, rate, amount in requests:
+        state = get_state(name)
+        tokens = capacity if state is None else min(capacity, state[0] + (now - state[1]) * rate)
+        # A request larger than the bucket can still pass once the bucket is full
+        amount = min(amount, capacity)
+        if tokens < amount:
+            wait = max(wait, (amount - tokens) / rate)
+        levels.append((name, tokens, amount))
+    for name, tokens, amount in levels:
+        set_state(name, (tokens - amount if wait == 0 else tokens, now))
+    return wait
+
+
+class QuotaScheduler:
+    """
+    Smooths model calls to the configured requests-per-minute and tokens-per-minute quota.
+    Callers wait in a priority queue; only the head of the queue draws from the token buckets,
+    so interactive requests overtake batch work. Failed calls are retried with jittered
+    backoff that honors Retry-After, instead of spending quota on requests certain to fail.
+    """
+
+    def __init__(self, rpm: int, tpm: int, store, max_retries: int = 4):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.store = store
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._stats = {"granted": 0, "throttled": 0, "retries": 0, "failures": 0,
+                       "wait_seconds": 0.0, "max_queue_depth": 0}
+
+    def _buckets(self, tokens: int):
+        return [
+            ("rpm", self.rpm, self.rpm / 60.0, 1),
+            ("tpm", self.tpm, self.tpm / 60.0, tokens),
+        ]
+
+    def _enqueue(self, priority: int):
+        ticket = (priority, next(self._sequence))
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+        return ticket
+
+    def _dequeue(self, ticket):
+        with self._lock:
+            self._queue.remove(ticket)
+            heapq.heapify(self._queue)
+
+    def _is_head(self, ticket) -> bool:
+        with self._lock:
+            return self._queue[0] == ticket
+
+    def _try_take(self, tokens: int) -> float:
+        """ Draws from the buckets; returns 0 on success, otherwise how long to sleep. """
+        wait = self.store.try_consume(self._buckets(tokens))
+        if wait > 0:
+            with self._lock:
+                self._stats["throttled"] += 1
+        return min(wait, 1.0)
+
+    def _granted(self, started: float):
+        with self._lock:
+            self._stats["granted"] += 1
+            self._stats["wait_seconds"] += time.monotonic() - started
+
+    def acquire(self, tokens: int, priority: int = PRIORITY_INTERACTIVE):
+        """ Blocks the calling thread until the request fits in the quota. """
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                wait = self._try_take(tokens) if self._is_head(ticket) else _POLL_SECONDS
+                if wait <= 0:
+                    break
+                time.sleep(wait)
+        finally:
+            self._dequeue(ticket)
+        self._granted(started)
+
+    async def acquire_async(self, tokens: int, priority: int = PRIORITY_INTERACTIVE):
+        """ Waits on the event loop until the request fits in the quota. """
+        started = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                if not self._is_head(ticket):
+                    wait = _POLL_SECONDS
+                elif self.store.name == "sqlite":
+                    # The SQLite transaction may block on other workers; keep it off the loop
+                    wait = await asyncio.to_thread(self._try_take, tokens)
+                else:
+                    wait = self._try_take(tokens)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            self._dequeue(ticket)
+        self._granted(started)
+
+    def retry_delay(self, exc: Exception, attempt: int):
+        """ Returns how long to wait before retrying a failed call, or None if it shouldn't be retried. """
+        retryable, retry_after = classify_error(exc)
+        if not retryable or attempt >= self.max_retries:
+            with self._lock:
+                self._stats["failures"] += 1
+            return None
+        with self._lock:
+            self._stats["retries"] += 1
+        delay = backoff_delay(attempt, retry_after)
+        print(f"DEBUG: LLM call failed ({exc}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def run(self, fn, tokens: int, priority: int = PRIORITY_INTERACTIVE):
+        """ Calls fn() under the quota, retrying retryable failures. """
+        attempt = 0
+        while True:
+            self.acquire(tokens, priority)
+            try:
+                return fn()
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+
+    async def run_async(self, coro_fn, tokens: int, priority: int = PRIORITY_INTERACTIVE):
+        """ Awaits coro_fn() under the quota, retrying retryable failures. """
+        attempt = 0
+        while True:
+            await self.acquire_async(tokens, priority)
+            try:
+                return await coro_fn()
+            except Exception as e:
+                delay = self.retry_delay(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats, queue_depth=len(self._queue))
+        stats.update({"rpm": self.rpm, "tpm": self.tpm, "store": self.store.name})
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        return stats
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> QuotaScheduler:
+    """
+    Returns the process-wide scheduler. Configured through environment variables:
+      GEMINI_RPM / GEMINI_TPM     quota (requests and tokens per minute)
+      LLM_SCHEDULER_STORE         sqlite (default; shared by all workers on the host) or memory
+      LLM_SCHEDULER_PATH          SQLite file (default ./llm_scheduler.db, /tmp/... on Lambda)
+      LLM_MAX_RETRIES             retries per call for 429/5xx/connection errors
+    """
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                if os.getenv("LLM_SCHEDULER_STORE", "sqlite").lower() == "memory":
+                    store = MemoryBucketStore()
+                else:
+                    default_path = "/tmp/llm_scheduler.db" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "./llm_scheduler.db"
+                    store = SQLiteBucketStore(os.getenv("LLM_SCHEDULER_PATH", default_path))
+                _scheduler = QuotaScheduler(
+                    rpm=int(os.getenv("GEMINI_RPM", 60)),
+                    tpm=int(os.getenv("GEMINI_TPM", 1_000_000)),
+                    store=store,
+                    max_retries=int(os.getenv("LLM_MAX_RETRIES", 4)),
+                )
+    return _scheduler
@@ -0,0 +1,326 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+# Model-provider pieces shared by the backend and the standalone Lambda in lambda/:
+# the LLMProvider interface, the deterministic fake and record/replay. Standard library
+# only, so lambda/llm_shared.py can be an exact copy of this file (test_llm_shared checks
+# the two stay identical); edit this one and copy it over.
+
+import abc
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+
+def estimate_tokens(text: str) -> int:
+    """ Cheap local token estimate (~4 characters per token for English text). """
+    return len(text) // 4 + 1
+
+
+class LLMProvider(abc.ABC):
+    """
+    Interface every model backend implements. Prompts go in, raw response text comes out;
+    prompt building, parsing, caching and quota scheduling stay in the copilot.
+    """
+
+    name = "base"
+    model_name = None
+
+    @abc.abstractmethod
+    def generate(self, prompt: str) -> str:
+        ...
+
+    async def generate_async(self, prompt: str) -> str:
+        return await asyncio.to_thread(self.generate, prompt)
+
+    async def stream_async(self, prompt: str):
+        """ Yields the response in text chunks. Providers without streaming yield it whole. """
+        yield await self.generate_async(prompt)
+
+    def count_tokens(self, text: str) -> int:
+        return estimate_tokens(text)
+
+
+class FakeProviderError(Exception):
+    """ Injected failure. `code` mimics an HTTP status so the scheduler treats it like a real one. """
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} injected fake provider error")
+        self.code = code
+
+
+def parse_latency_spec(spec: str):
+    """
+    Parses a latency distribution into a sampler (random.Random -> seconds):
+      fixed:S               always S seconds
+      uniform:LO:HI         uniformly between LO and HI
+      lognormal:MEDIAN:SIGMA  log-normal with the given median (the usual shape of LLM latency)
+    """
+    kind, *params = (spec or "fixed:0").split(":")
+    values = [float(p) for p in params]
+    if kind == "fixed":
+        return lambda rng: values[0]
+    if kind == "uniform":
+        return lambda rng: rng.uniform(values[0], values[1])
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: median * rng.lognormvariate(0, sigma) if median > 0 else 0.0
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+_JSON_MARKERS = ("Current Resume Content (JSON):", "Experience Entries (JSON):")
+_SUMMARY_MARKER = "Current Professional Summary:"
+_PROMPT_SECTION_MARKERS = re.compile(r"\n\s*(Current Resume Content|Current Professional Summary|Experience Entries)")
+_COMPANY_PATTERN = re.compile(r"\b(?:at|join|About)[ \t]+([A-Z][\w&.-]*(?:[ \t]+[A-Z][\w&.-]*){0,2})")
+_KEYWORD_PATTERN = re.compile(r"\b[A-Z][A-Za-z+#.]{2,}\b")
+# The Lambda's rewrite prompt: the whole resume as text, answered in Markdown
+_REWRITE_JD_MARKER = "JOB DESCRIPTION:"
+_REWRITE_RESUME_MARKER = "ORIGINAL RESUME:"
+_MARKDOWN_BULLET_PATTERN = re.compile(r"^(\s*[-*•]\s+)(.+?)\.?\s*$")
+
+
+def _section(prompt: str, marker: str, end_marker: str) -> str:
+    start = prompt.find(marker)
+    if start == -1:
+        return ""
+    start += len(marker)
+    end = prompt.find(end_marker, start)
+    return prompt[start:end if end != -1 else None].strip()
+
+
+class FakeProvider(LLMProvider):
+    """
+    In-process stand-in for the model, for load tests and offline benchmarks.
+    Recognises the copilot's prompts and answers with schema-valid JSON built from the
+    resume content in the prompt, so the rest of the pipeline runs unchanged; the Lambda's
+    rewrite prompt gets the Markdown resume it asks for.
+    Responses are deterministic per prompt; latency and injected errors are drawn from a
+    seeded generator, so a run with the same seed and call order is reproducible.
+    """
+
+    name = "fake"
+    model_name = "fake"
+
+    def __init__(self, seed: int = 0, latency: str = "fixed:0", error_rate: float = 0.0,
+                 error_codes: tuple[int, ...] = (429, 503)):
+        self.seed = seed
+        self.sample_latency = parse_latency_spec(latency)
+        self.error_rate = error_rate
+        self.error_codes = error_codes
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _draw(self) -> tuple[float, int | None]:
+        """ Returns (latency seconds, injected error code or None) for one call. """
+        with self._lock:
+            self.calls += 1
+            latency = max(0.0, self.sample_latency(self._rng))
+            error = self._rng.choice(self.error_codes) if self._rng.random() < self.error_rate else None
+        return latency, error
+
+    def respond(self, prompt: str) -> str:
+        """ Builds the response text for a prompt without any latency or errors. """
+        rng = random.Random(f"{self.seed}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()}")
+        if _REWRITE_RESUME_MARKER in prompt:
+            return self._rewrite(prompt, rng)
+        job_description = _PROMPT_SECTION_MARKERS.split(prompt.partition("Job Description:")[2])[0]
+        keywords = sorted(set(_KEYWORD_PATTERN.findall(job_description))) or ["Delivery"]
+        match = _COMPANY_PATTERN.search(job_description)
+        company = match.group(1) if match else "Company"
+
+        if prompt.lstrip().startswith("Extract only the company name"):
+            return company
+
+        if _SUMMARY_MARKER in prompt:
+            summary = _section(prompt, _SUMMARY_MARKER, "Task:")
+            return json.dumps({"company_name": company, "summary": self._summary(summary, keywords, rng)})
+
+        for marker in _JSON_MARKERS:
+            start = prompt.find(marker)
+            if start == -1:
+                continue
+            json_start = re.compile(r"[\[{]").search(prompt, start + len(marker)).start()
+            payload, _ = json.JSONDecoder().raw_decode(prompt, json_start)
+            entries = payload["entries"] if isinstance(payload, dict) else payload
+            result = {"entries": [
+                {"id": entry["id"], "optimized_bullets": self._bullets(entry["bullets"], keywords, rng)}
+                for entry in entries
+            ]}
+            if isinstance(payload, dict):
+                result = {"company_name": company, "summary": self._summary(payload.get("summary", ""), keywords, rng), **result}
+            return "```json\n" + json.dumps(result, indent=2) + "\n```"
+
+        return f"Fake response ({len(prompt)} prompt characters)."
+
+    @staticmethod
+    def _rewrite(prompt: str, rng: random.Random) -> str:
+        """ The resume from the rewrite prompt with its bullets worked around JD keywords, plus a skills list. """
+        job_description = prompt.partition(_REWRITE_JD_MARKER)[2].partition("---")[0]
+        keywords = sorted(set(_KEYWORD_PATTERN.findall(job_description))) or ["Delivery"]
+        resume = prompt.partition(_REWRITE_RESUME_MARKER)[2].partition("---")[0].strip()
+        if not resume:
+            return f"Fake response ({len(prompt)} prompt characters)."
+        lines = []
+        for line in resume.splitlines():
+            match = _MARKDOWN_BULLET_PATTERN.match(line)
+            lines.append(f"{match.group(1)}{match.group(2)}, applying {rng.choice(keywords)}." if match else line)
+        focus = rng.sample(keywords, min(3, len(keywords)))
+        return "\n".join(lines) + "\n\n## Key Skills\n\n" + "\n".join(f"- {k}" for k in focus) + "\n"
+
+    @staticmethod
+    def _summary(summary: str, keywords: list[str], rng: random.Random) -> str:
+        focus = ", ".join(rng.sample(keywords, min(3, len(keywords))))
+        return f"{summary.strip()} Focused on {focus}.".strip()
+
+    @staticmethod
+    def _bullets(bullets: list[str], keywords: list[str], rng: random.Random) -> list[str]:
+        optimized = [f"{b.rstrip('.')}, applying {rng.choice(keywords)}." for b in bullets]
+        for _ in range(2):
+            optimized.append(f"Led {rng.choice(keywords)} initiative that improved delivery speed by {rng.randint(10, 60)}%.")
+        return optimized
+
+    def generate(self, prompt: str) -> str:
+        latency, error = self._draw()
+        time.sleep(latency)
+        if error:
+            raise FakeProviderError(error)
+        return self.respond(prompt)
+
+    async def generate_async(self, prompt: str) -> str:
+        latency, error = self._draw()
+        await asyncio.sleep(latency)
+        if error:
+            raise FakeProviderError(error)
+        return self.respond(prompt)
+
+    async def stream_async(self, prompt: str):
+        """ Streams the response in small chunks, with ~30% of the latency before the first one. """
+        latency, error = self._draw()
+        await asyncio.sleep(latency * 0.3)
+        if error:
+            raise FakeProviderError(error)
+        text = self.respond(prompt)
+        chunks = [text[i:i + 64] for i in range(0, len(text), 64)] or [""]
+        for chunk in chunks:
+            await asyncio.sleep(latency * 0.7 / len(chunks))
+            yield chunk
+
+
+class ReplayMissError(LookupError):
+    """ Raised in replay mode when no recording exists for a prompt. """
+
+
+class RecordReplayProvider(LLMProvider):
+    """
+    Wraps a provider to capture its responses to disk (mode="record") or serves previously
+    captured responses without touching the network (mode="replay").
+    Recordings are one JSON file per prompt, named by the SHA-256 of model name and prompt.
+    Token counts always use the local estimate so the JD compaction, and therefore the
+    prompts, come out identical when recording and when replaying.
+    """
+
+    name = "record_replay"
+
+    def __init__(self, directory: str, mode: str, inner: LLMProvider = None, model_name: str = None):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown record/replay mode: {mode}")
+        if mode == "record" and inner is None:
+            raise ValueError("Recording needs a provider to record from")
+        self.directory = directory
+        self.mode = mode
+        self.inner = inner
+        self.model_name = inner.model_name if inner else model_name
+        self.name = mode
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, prompt: str) -> str:
+        digest = hashlib.sha256(f"{self.model_name}\n{prompt}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self, prompt: str) -> str:
+        path = self._path(prompt)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                recording = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            raise ReplayMissError(f"No recording for prompt ({os.path.basename(path)})")
+        self.hits += 1
+        return recording["response"]
+
+    def _save(self, prompt: str, response: str):
+        path = self._path(prompt)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": self.model_name,
+                "prompt_preview": prompt.strip()[:200],
+                "response": response,
+                "recorded_at": time.time(),
+            }, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def generate(self, prompt: str) -> str:
+        if self.mode == "replay":
+            return self._load(prompt)
+        response = self.inner.generate(prompt)
+        self._save(prompt, response)
+        return response
+
+    async def generate_async(self, prompt: str) -> str:
+        if self.mode == "replay":
+            return self._load(prompt)
+        response = await self.inner.generate_async(prompt)
+        await asyncio.to_thread(self._save, prompt, response)
+        return response
+
+    async def stream_async(self, prompt: str):
+        if self.mode == "replay":
+            text = self._load(prompt)
+            for i in range(0, len(text), 64):
+                yield text[i:i + 64]
+            return
+        chunks = []
+        async for chunk in self.inner.stream_async(prompt):
+            chunks.append(chunk)
+            yield chunk
+        await asyncio.to_thread(self._save, prompt, "".join(chunks))
+
+
+def fake_provider_from_env() -> FakeProvider:
+    """ A FakeProvider configured by LLM_FAKE_SEED, LLM_FAKE_LATENCY, LLM_FAKE_ERROR_RATE and LLM_FAKE_ERROR_CODES. """
+    return FakeProvider(
+        seed=int(os.getenv("LLM_FAKE_SEED", 0)),
+        latency=os.getenv("LLM_FAKE_LATENCY", "lognormal:1.0:0.4"),
+        error_rate=float(os.getenv("LLM_FAKE_ERROR_RATE", 0.0)),
+        error_codes=tuple(int(c) for c in os.getenv("LLM_FAKE_ERROR_CODES", "429,503").split(",")),
+    )
+
+
+def select_provider(make_gemini, model_name: str, get_fake=fake_provider_from_env) -> LLMProvider | None:
+    """
+    Returns the model backend selected by LLM_PROVIDER, or None if it can't be used:
+      gemini   make_gemini(), which returns None when it can't (e.g. without an API key); the default
+      fake     get_fake(): the deterministic in-process fake (see fake_provider_from_env)
+      record   make_gemini(), saving every response to LLM_RECORD_DIR (default ./llm_recordings)
+      replay   serves responses saved by "record"; no API key or network needed
+    """
+    name = os.getenv("LLM_PROVIDER", "gemini").lower()
+    if name == "fake":
+        return get_fake()
+    directory = os.getenv("LLM_RECORD_DIR", "./llm_recordings")
+    if name == "replay":
+        return RecordReplayProvider(directory, "replay", model_name=model_name)
+    gemini = make_gemini()
+    if gemini is None:
+        return None
+    if name == "record":
+        return RecordReplayProvider(directory, "record", inner=gemini)
+    return gemini
@@ -1,24 +1,55 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
+from email.utils import formatdate, parsedate_to_datetime
 from pydantic import BaseModel
-from .database import engine, Base
-from .models import Base, JobPost, Resume
-from .scraper import validate_url, scrape_job_description
-from .resume_parser import parse_resume
-from .resume_generator import generate_tailored_resume, get_optimization_plan
+from .database import engine, Base, migrate_missing_columns
+from .models import Base, JobPost, Resume, Plan
+from .scraper import normalize_job_url, validate_url
+from .job_cache import JOB_CACHE_FIELDS, job_cache_stats, refresh_job_posting
+from .job_dedup import index_job_post
+from .resume_generator import generate_tailored_resume, get_optimization_plan_async, extract_plan_skeleton, apply_batch_result, render_resume_bytes, DOCX_RENDERER
+from .resume_index import build_resume_index, is_current_index
+from .copilot import ResumeCopilot
+from .llm_cache import get_response_cache
+from .llm_client import aclose_clients, get_concurrency_stats
+from .llm_scheduler import get_scheduler, PRIORITY_BATCH, PRIORITY_INTERACTIVE
+from .singleflight import AsyncSingleFlight, get_idempotency_store, request_fingerprint
+from .template_cache import get_rendition_cache, get_template_cache, file_content_hash
+from .artifact_store import artifact_key, get_artifact_store
+from .upload_store import UploadFormError, UploadTooLargeError, analyze_upload_async, store_upload_stream
+from .process_pool import run_in_process_pool_async, shutdown_process_pool
+from .http_client import close_http_client, get_http_client
+from .bulk_ingest import ingest_urls
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import Depends
-from .database import get_db
-import shutil
+from .database import get_db, SessionLocal
+import asyncio
+import io
+import json
 import os
+import re
+import zipfile
+from urllib.parse import quote
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+migrate_missing_columns(engine)
 
-app = FastAPI(title="Resume Generator API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the pooled Gemini and scraper connections and parse workers on shutdown
+    await aclose_clients()
+    close_http_client()
+    shutdown_process_pool()
+
+app = FastAPI(title="Resume Generator API", lifespan=lifespan)
 
 # CORS setup
 origins = [
@@ -47,6 +78,137 @@ class GenerateRequest(BaseModel):
     resume_id: int
     api_key: str = None
     approved_plan: dict = None
+    plan_id: int = None
+    delivery: str = "link" # "link": stored for /download-resume; "stream": the .docx is the response body
+
+class BatchGenerateRequest(BaseModel):
+    resume_id: int
+    job_ids: list[int] = []
+    urls: list[str] = []
+    api_key: str = None
+
+class IngestRequest(BaseModel):
+    urls: list[str]
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+GENERATED_DIR = "backend/generated"
+# Artifact keys (sha256) and, for older generations, uuid4 directory names
+DOWNLOAD_TOKEN_PATTERN = re.compile(r"^([0-9a-f]{64}|[0-9a-f]{32})$")
+# Artifact URLs are content-addressed, so their bytes never change
+ARTIFACT_CACHE_CONTROL = os.getenv("ARTIFACT_CACHE_CONTROL", "public, max-age=31536000, immutable")
+# Jobs accepted by one /batch-generate call, and how many of them are worked on at once
+BATCH_MAX_JOBS = int(os.getenv("BATCH_MAX_JOBS", 50))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 8))
+# URLs accepted by one /ingest-urls call (concurrency and politeness: see bulk_ingest)
+INGEST_MAX_URLS = int(os.getenv("INGEST_MAX_URLS", 1000))
+
+def _store_plan(db: Session, job_id: int, resume_id: int, plan: dict) -> Plan:
+    """
+    Persists an optimization plan so later generations can reuse it without an LLM call.
+    """
+    stored = Plan(job_id=job_id, resume_id=resume_id, content=json.dumps(plan))
+    db.add(stored)
+    db.commit()
+    db.refresh(stored)
+    return stored
+
+def _remember_company(db: Session, job_post: JobPost, company_name: str):
+    """ Memoizes a job's company so the LLM fallback runs at most once per job. """
+    if not job_post.company_name and company_name and company_name.lower() != "company":
+        job_post.company_name = company_name
+        db.commit()
+
+def _find_stored_plan(db: Session, job_id: int, resume_id: int, plan_id: int = None):
+    """
+    Looks up a stored plan by id, or the most recent plan for the (job, resume) pair.
+    """
+    query = db.query(Plan).filter(Plan.job_id == job_id, Plan.resume_id == resume_id)
+    if plan_id is not None:
+        return query.filter(Plan.id == plan_id).first()
+    return query.order_by(Plan.id.desc()).first()
+
+def _effective_job(db: Session, job_post: JobPost) -> JobPost:
+    """
+    Returns the job whose plans and generated artifacts a job post uses: its canonical job
+    when it is a near-duplicate of an earlier posting (see job_dedup), otherwise itself.
+    Job posts stored before signatures existed are indexed here first.
+    """
+    if job_post.minhash is None and job_post.description:
+        index_job_post(db, job_post)
+        db.commit()
+    if job_post.canonical_job_id:
+        canonical = db.query(JobPost).filter(JobPost.id == job_post.canonical_job_id).first()
+        if canonical and canonical.description:
+            return canonical
+    return job_post
+
+def _repost_company(requested: JobPost, job_post: JobPost):
+    """
+    The company a linked repost names in place of its canonical job's: a repost shares the
+    canonical plan but may come from another hiring company (an agency copy). "Company"
+    (resolved at generation) when the posting names none; None for a job that isn't a repost.
+    """
+    if requested is job_post:
+        return None
+    return requested.company_name or "Company"
+
+def _load_request_rows(db: Session, job_id: int, resume_id: int):
+    """
+    Loads a request's job post, the job whose plans it uses (see _effective_job), the resume
+    and its structure index; 404 if either row is missing. Called through run_in_threadpool:
+    the queries, and the commits of lazy indexing, block.
+    """
+    requested = db.query(JobPost).filter(JobPost.id == job_id).first()
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not requested or not resume:
+        raise HTTPException(status_code=404, detail="Job Post or Resume not found")
+    return requested, _effective_job(db, requested), resume, _load_resume_index(db, resume)
+
+def _load_resume_index(db: Session, resume: Resume):
+    """
+    Returns the resume's structure index, building and storing it for resumes uploaded
+    before indexes existed (or with an outdated index). None if the file can't be indexed.
+    """
+    index = json.loads(resume.structure_index) if resume.structure_index else None
+    if is_current_index(index):
+        return index
+    try:
+        index = build_resume_index(resume.original_path)
+    except Exception as e:
+        print(f"DEBUG: Could not index resume {resume.id} - {e}")
+        return None
+    resume.structure_index = json.dumps(index)
+    db.commit()
+    return index
+
+# Identical preview/generate requests that arrive while one is running share its result
+_flights = AsyncSingleFlight()
+
+async def _coalesce(endpoint: str, request: BaseModel, idempotency_key: str, response: Response, compute,
+                    to_replay=None, from_replay=None):
+    """
+    Runs compute() once for concurrent identical requests and shares the result.
+    With an Idempotency-Key, the completed response is also replayed for repeats of the key
+    within the configured window (a key reused with a different body is rejected).
+    to_replay(result) picks what the store keeps and the awaitable from_replay(entry) turns
+    it back into the result, or None if it can't (the request is then computed again).
+    """
+    fingerprint = request_fingerprint(endpoint, request.model_dump())
+    store = get_idempotency_store()
+    scoped_key = f"{endpoint}:{idempotency_key}" if idempotency_key else None
+    if scoped_key:
+        replay = store.get(scoped_key)
+        if replay:
+            if replay[0] != fingerprint:
+                raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+            result = await from_replay(replay[1]) if from_replay else replay[1]
+            if result is not None:
+                response.headers["Idempotent-Replayed"] = "true"
+                return result
+    result = await _flights.do(fingerprint, compute)
+    if scoped_key:
+        store.set(scoped_key, fingerprint, to_replay(result) if to_replay else result)
+    return result
 
 @app.get("/")
 def read_root():
@@ -55,152 +217,621 @@ def read_root():
     """
     return {"message": "Resume Generator API is running"}
 
+@app.get("/metrics")
+def read_metrics():
+    """
+    Returns runtime counters for the LLM response cache, async client, quota scheduler,
+    request coalescing, the parsed-template cache and the generated-artifact store.
+    """
+    cache = get_response_cache()
+    template_cache = get_template_cache()
+    rendition_cache = get_rendition_cache()
+    return {
+        "llm_cache": cache.stats() if cache else {"backend": "disabled"},
+        "llm_client": get_concurrency_stats(),
+        "llm_scheduler": get_scheduler().stats(),
+        "single_flight": _flights.stats(),
+        "idempotency": get_idempotency_store().stats(),
+        "template_cache": template_cache.stats() if template_cache else {"enabled": False},
+        "rendition_cache": rendition_cache.stats() if rendition_cache else {"enabled": False},
+        "artifact_store": get_artifact_store().stats(),
+        "http_client": get_http_client().stats(),
+        "job_cache": job_cache_stats()
+    }
+
 @app.post("/validate-url")
 def validate_and_scrape(request: UrlRequest, db: Session = Depends(get_db)):
     """
     Validates a job URL and scrapes the job description.
     Stores the scraped job post in the database if it doesn't already exist.
+    A recently fetched posting is served from the database, and an older one is
+    revalidated with a conditional request (see job_cache); 'fetch_status' says which.
     Returns the job ID and a preview of the description.
     """
     if not validate_url(request.url):
         return {"valid": False, "message": "Please enter valid URL"}
     
-    # Check if URL already exists in the database
-    existing_job = db.query(JobPost).filter(JobPost.url == request.url).first()
-    
-    # Scrape the job description from the validated URL
-    description = scrape_job_description(request.url)
-    
-    if existing_job:
-        # Update existing job description if found
-        existing_job.description = description
-        db.commit()
-        db.refresh(existing_job)
-        job_post = existing_job
-    else:
-        # Save new job post to DB
-        job_post = JobPost(url=request.url, description=description)
-        db.add(job_post)
-        db.commit()
-        db.refresh(job_post)
+    job_post, fetch_status = _refresh_job(db, request.url)
+    description = job_post.description
     
     return {
         "valid": True, 
         "message": "Valid URL, analyzing the Job Post",
         "data": {
             "job_id": job_post.id,
-            "description_preview": description[:100] + "..." if description else "No description found"
+            "description_preview": description[:100] + "..." if description else "No description found",
+            "fetch_status": fetch_status,
+            "canonical_job_id": job_post.canonical_job_id
         }
     }
 
+@app.post("/ingest-urls")
+async def ingest_job_urls(request: IngestRequest):
+    """
+    Validates, dedupes and scrapes many job URLs concurrently and stores them, like
+    /validate-url for each. Scrapes are limited per host and retried on transient failures,
+    and results are committed in batches (see bulk_ingest).
+    The response is NDJSON progress: a start event, one event per URL (with its job_id and
+    fetch status) as its result is committed, and a done event with totals.
+    """
+    if not request.urls:
+        raise HTTPException(status_code=422, detail="Provide at least one url")
+    if len(request.urls) > INGEST_MAX_URLS:
+        raise HTTPException(status_code=422, detail=f"At most {INGEST_MAX_URLS} urls per import")
+
+    async def lines():
+        async for event in ingest_urls(request.urls):
+            yield json.dumps(event) + "\n"
 
-@app.post("/upload-resume")
-async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db)):
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+def _refresh_job(db: Session, url: str) -> tuple[JobPost, str]:
+    """
+    Returns the stored job post for a URL, scraping (or revalidating) the page only when
+    the freshness policy says so, and the policy's status. Plans built from the old
+    description are dropped only if the re-scraped text actually changed, and new or
+    changed text is linked to its near-duplicates (see job_dedup).
+    Jobs are keyed by normalize_job_url, as in bulk ingest, so a link shared with tracking
+    parameters finds the same posting; rows stored under a raw URL are still found by it.
+    """
+    raw_url, url = url, normalize_job_url(url)
+    existing = db.query(JobPost).filter(JobPost.url == url).first() or \
+               db.query(JobPost).filter(JobPost.url == raw_url).first()
+    stored = {field: getattr(existing, field) for field in JOB_CACHE_FIELDS} if existing else None
+    outcome = refresh_job_posting(url, stored)
+    if not outcome["fields"] and existing:
+        return existing, outcome["status"]
+
+    if outcome["status"] == "changed":
+        db.query(Plan).filter(Plan.job_id == existing.id).delete()
+    job_post = existing or JobPost(url=url)
+    for field, value in outcome["fields"].items():
+        setattr(job_post, field, value)
+    db.add(job_post)
+    try:
+        if outcome["status"] in ("new", "changed"):
+            index_job_post(db, job_post)
+        db.commit()
+    except IntegrityError:
+        # The same new URL was stored by a concurrent request
+        db.rollback()
+        return db.query(JobPost).filter(JobPost.url == url).first(), outcome["status"]
+    db.refresh(job_post)
+    return job_post, outcome["status"]
+
+# The endpoint reads the multipart body itself, so describe the form for the OpenAPI docs
+UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {"file": {"type": "string", "format": "binary"}},
+        }}},
+    }
+}
+
+@app.post("/upload-resume", openapi_extra=UPLOAD_REQUEST_BODY)
+async def upload_resume(request: Request, db: Session = Depends(get_db)):
     """
     Handles resume file upload.
-    Saves the file locally, parses its content, and stores the metadata in the database.
+    Streams the request body straight into content-addressed storage (hashing and enforcing
+    the size cap as it goes, and rejecting an oversized Content-Length before reading
+    anything), parses its content and indexes its structure (DOCX) in the parse pool,
+    and stores the metadata in the database. None of this blocks the event loop.
+    Re-uploading an identical file returns the existing resume without re-parsing it.
     Supported formats: PDF, DOCX.
     """
     upload_dir = "backend/uploads"
-    os.makedirs(upload_dir, exist_ok=True)
-    file_path = os.path.join(upload_dir, file.filename)
-    
-    # Save the uploaded file to disk
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-        
-    # Parse the resume content (extract text)
-    parsed_content = parse_resume(file_path)
-    
-    # Save resume record to DB
-    resume = Resume(filename=file.filename, content=parsed_content, original_path=file_path)
+    content_length = request.headers.get("content-length")
+    try:
+        stored = await store_upload_stream(request.stream(), request.headers.get("content-type"), upload_dir,
+                                           content_length=int(content_length) if content_length else None)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadFormError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    existing = await run_in_threadpool(_find_resume_by_hash, db, stored["content_hash"])
+    if existing:
+        return _upload_response(existing, duplicate=True)
+
+    # Parse the resume content (extract text) and index the document structure once,
+    # so planning and rendering don't re-classify it
+    parsed_content, structure_index = await analyze_upload_async(stored["path"], stored["content_hash"])
+
+    resume = Resume(filename=stored["filename"], content=parsed_content, original_path=stored["path"],
+                    content_hash=stored["content_hash"], structure_index=structure_index)
+    saved = await run_in_threadpool(_save_resume, db, resume)
+    return _upload_response(saved, duplicate=saved is not resume)
+
+def _find_resume_by_hash(db: Session, content_hash: str):
+    return db.query(Resume).filter(Resume.content_hash == content_hash).first()
+
+def _save_resume(db: Session, resume: Resume) -> Resume:
+    """ Saves a new resume; if an identical upload won the race, returns that one instead. """
     db.add(resume)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return _find_resume_by_hash(db, resume.content_hash)
     db.refresh(resume)
-    
+    return resume
+
+def _upload_response(resume: Resume, duplicate: bool) -> dict:
     return {
         "message": "It is uploaded successfully",
         "data": {
             "resume_id": resume.id,
-            "filename": resume.filename
+            "filename": resume.filename,
+            "duplicate": duplicate
         }
     }
 
 @app.post("/preview-optimization")
-def preview_optimization(request: PreviewRequest, db: Session = Depends(get_db)):
+async def preview_optimization(request: PreviewRequest, response: Response, idempotency_key: str = Header(default=None)):
     """
     Returns a plan showing how the resume will be optimized.
+    The plan is stored and its id returned as 'plan_id' for use by /generate-resume.
+    Runs on the event loop so waiting on the model doesn't hold a threadpool thread.
+    Concurrent identical requests share one computation; see _coalesce.
     """
-    job_post = db.query(JobPost).filter(JobPost.id == request.job_id).first()
-    resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
-    
-    if not job_post or not resume:
-        raise HTTPException(status_code=404, detail="Job Post or Resume not found")
-        
-    plan = get_optimization_plan(resume.original_path, job_post.description, request.api_key)
-    return plan
+    return await _coalesce("preview-optimization", request, idempotency_key, response, lambda: _compute_preview(request))
+
+async def _compute_preview(request: PreviewRequest) -> dict:
+    # Own session: the computation may outlive the request that started it. Rows stay loaded
+    # after the threadpool commits, so reading them here never queries on the event loop
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        # Reposts share the plans of their canonical job, but keep their own company
+        requested, job_post, resume, structure_index = await run_in_threadpool(
+            _load_request_rows, db, request.job_id, request.resume_id)
+        plan = await get_optimization_plan_async(resume.original_path, job_post.description, request.api_key, structure_index)
+        if plan.get("company_name", "Company") == "Company" and job_post.company_name:
+            plan["company_name"] = job_post.company_name
+        stored = await run_in_threadpool(_store_plan, db, job_post.id, resume.id, plan)
+        plan["plan_id"] = stored.id
+        plan["company_name"] = _repost_company(requested, job_post) or plan.get("company_name")
+        return plan
+    finally:
+        db.close()
+
+def _sse_event(event: str, data) -> str:
+    """ Formats one server-sent event. """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/preview-optimization/stream")
+async def preview_optimization_stream(request: PreviewRequest):
+    """
+    Streaming variant of /preview-optimization using Server-Sent Events.
+    Events, in order:
+      plan          the plan skeleton with the original summary and entries
+      company_name  the hiring company, as soon as the model has produced it
+      summary       the optimized summary
+      entry         {"id", "optimized_bullets"} for each experience entry as it completes
+      done          the final plan (same shape as /preview-optimization, with plan_id)
+    """
+    # Copy what the stream needs, so the session is closed before streaming starts
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        # Reposts share the plans of their canonical job, but keep their own company
+        requested, job_post, resume, structure_index = await run_in_threadpool(
+            _load_request_rows, db, request.job_id, request.resume_id)
+    finally:
+        db.close()
+    job_id, resume_id = job_post.id, resume.id
+    original_path, description = resume.original_path, job_post.description
+    known_company_name = job_post.company_name
+    repost_company = _repost_company(requested, job_post)
+
+    async def event_stream():
+        plan = await asyncio.to_thread(extract_plan_skeleton, original_path, structure_index)
+        yield _sse_event("plan", plan)
+
+        copilot = ResumeCopilot(request.api_key)
+        batch_result = None
+        async for event, value in copilot.stream_optimize_all_content(plan["summary"]["original"], plan["experience_entries"], description):
+            if event == "result":
+                batch_result = value
+            elif event == "entry":
+                idx = value.get("id")
+                if isinstance(idx, int) and 0 <= idx < len(plan["experience_entries"]):
+                    yield _sse_event("entry", {"id": idx, "optimized_bullets": value.get("optimized_bullets", [])})
+            elif event == "company_name" and repost_company:
+                yield _sse_event(event, repost_company)
+            else:
+                yield _sse_event(event, value)
+
+        plan = apply_batch_result(plan, batch_result)
+        if copilot.last_compaction:
+            plan["jd_compaction"] = copilot.last_compaction
+        if plan.get("company_name", "Company") == "Company" and known_company_name:
+            plan["company_name"] = known_company_name
+
+        session = SessionLocal()
+        try:
+            plan["plan_id"] = (await run_in_threadpool(_store_plan, session, job_id, resume_id, plan)).id
+        finally:
+            session.close()
+        plan["company_name"] = repost_company or plan.get("company_name")
+        yield _sse_event("done", plan)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.post("/generate-resume")
-def generate_resume(request: GenerateRequest, db: Session = Depends(get_db)):
+async def generate_resume(request: GenerateRequest, response: Response, idempotency_key: str = Header(default=None)):
     """
     Generates a tailored resume based on a specific job post and resume.
     Uses AI to rewrite the resume content to match the job description.
-    Returns the download URL for the generated resume.
+    Returns the download URL for the generated resume, or with delivery="stream" the
+    document itself (rendered in memory, never written to disk).
+    Plan resolution order: the client's approved_plan, then a stored plan (by plan_id,
+    or the latest preview for this job/resume), and only then a freshly generated one.
+    Concurrent identical requests share one computation; see _coalesce.
     """
-    job_post = db.query(JobPost).filter(JobPost.id == request.job_id).first()
-    resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
-    
-    if not job_post or not resume:
-        raise HTTPException(status_code=404, detail="Job Post or Resume not found")
-    
-    output_dir = "backend/generated"
-    os.makedirs(output_dir, exist_ok=True)
-    # Temporary filename
-    filename = f"tailored_resume_{request.job_id}_{request.resume_id}.docx"
-    output_path = os.path.join(output_dir, filename)
-    
-    # Call the logic to generate the tailored resume
-    _, status_message, company_name = generate_tailored_resume(
-        resume.original_path, 
-        job_post.description, 
-        output_path, 
-        request.api_key,
-        approved_plan=request.approved_plan
-    )
-    
-    # Construct new filename
-    # Format: OriginalName_Optimized_CompanyName.docx
-    original_basename = os.path.splitext(resume.filename)[0]
-    
-    clean_company_name = "Company"
-    if company_name and company_name.lower() != "company":
-         clean_company_name = company_name
+    if request.delivery not in ("link", "stream"):
+        raise HTTPException(status_code=422, detail="delivery must be 'link' or 'stream'")
+    result = await _coalesce("generate-resume", request, idempotency_key, response, lambda: _compute_generate(request),
+                             _generate_replay_entry, _replay_generate)
+    if request.delivery == "stream":
+        if "content" not in result:
+            raise HTTPException(status_code=500, detail=result["message"])
+        headers = {
+            "Content-Disposition": _content_disposition(result["filename"]),
+            "X-Plan-Id": str(result["plan_id"] or ""),
+            "X-Plan-Source": result["plan_source"],
+        }
+        if "Idempotent-Replayed" in response.headers:
+            headers["Idempotent-Replayed"] = response.headers["Idempotent-Replayed"]
+        return Response(content=result["content"], media_type=DOCX_MEDIA_TYPE, headers=headers)
+    return result
 
-    final_filename = f"{original_basename}_Optimized_{clean_company_name}.docx"
-    new_output_path = os.path.join(output_dir, final_filename)
-    
-    # Rename file to the new custom name
-    if os.path.exists(output_path):
-        # If the target file already exists (duplicate request), overwrite logic or just replace
-        if os.path.exists(new_output_path):
-            os.remove(new_output_path)
-        os.rename(output_path, new_output_path)
-        
-    return {
-        "message": status_message,
-        "download_url": f"/download-resume/{final_filename}"
+def _generate_replay_entry(result: dict) -> dict:
+    """ A streamed document is remembered by its artifact key, not its bytes: replays re-read it from the store. """
+    return {field: value for field, value in result.items() if field != "content"}
+
+async def _replay_generate(entry: dict):
+    """ Rebuilds a remembered /generate-resume result, or None if its artifact has since been evicted. """
+    if "artifact_key" not in entry:
+        return entry
+    artifact = await run_in_threadpool(get_artifact_store().get, entry["artifact_key"])
+    if artifact is None:
+        return None
+    try:
+        return {**entry, "content": await run_in_threadpool(_read_file, artifact["path"])}
+    except FileNotFoundError:
+        # Evicted between the lookup and the read
+        return None
+
+def _content_disposition(filename: str) -> str:
+    """ Attachment header for a download name, RFC 5987-encoded when it isn't plain ASCII. """
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+def _artifact_url(key: str, filename: str) -> str:
+    return f"/download-resume/{key}/{quote(filename)}"
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+async def _compute_generate(request: GenerateRequest, priority: int = PRIORITY_INTERACTIVE, render_in_pool: bool = False) -> dict:
+    """
+    Resolves the plan and renders (or reuses) the document for one (job, resume).
+    priority orders its model calls in the LLM scheduler; render_in_pool renders in the
+    process pool instead of the threadpool, for batches that would otherwise hold the GIL.
+    With delivery="stream" the result carries the document ("content") and its artifact_key.
+    """
+    # Own session: the computation may outlive the request that started it. Rows stay loaded
+    # after the threadpool commits, so reading them here never queries on the event loop
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        # Reposts share the plans and documents of their canonical job, but keep their own company
+        requested, job_post, resume, structure_index = await run_in_threadpool(
+            _load_request_rows, db, request.job_id, request.resume_id)
+
+        if request.approved_plan:
+            plan, plan_source = request.approved_plan, "approved"
+        else:
+            stored = await run_in_threadpool(_find_stored_plan, db, job_post.id, resume.id, request.plan_id)
+            if stored:
+                plan, plan_source = json.loads(stored.content), "stored"
+                plan["plan_id"] = stored.id
+            elif request.plan_id is not None:
+                raise HTTPException(status_code=404, detail="Plan not found")
+            else:
+                plan = await get_optimization_plan_async(resume.original_path, job_post.description, request.api_key, structure_index, priority)
+                plan["plan_id"] = (await run_in_threadpool(_store_plan, db, job_post.id, resume.id, plan)).id
+                plan_source = "generated"
+
+        # The company names the document, so it is settled before the artifact lookup. A repost
+        # names its own (it may be an agency copy from another hiring company), and a missing
+        # one is resolved with an awaited model call rather than a blocking one in the renderer
+        company_name = plan.get("company_name")
+        if requested is not job_post and plan_source != "approved":
+            company_name = requested.company_name
+        if company_name in (None, "", "Company"):
+            company_name = requested.company_name or await ResumeCopilot(request.api_key, priority).extract_company_name_async(requested.description)
+            await run_in_threadpool(_remember_company, db, requested, company_name)
+        plan = {**plan, "company_name": company_name or "Company"}
+
+        # Identical resume, job description and plan render an identical document: reuse it
+        store = get_artifact_store()
+        resume_hash = resume.content_hash or await run_in_threadpool(file_content_hash, resume.original_path)
+        key = artifact_key(resume_hash, job_post.description, plan, DOCX_RENDERER)
+        artifact = await run_in_threadpool(store.get, key)
+        if artifact:
+            result = {
+                "message": "Resume generated successfully",
+                "filename": artifact["filename"],
+                "plan_id": plan.get("plan_id"),
+                "plan_source": plan_source,
+                "artifact_source": "cached"
+            }
+            if request.delivery == "stream":
+                result["content"] = await run_in_threadpool(_read_file, artifact["path"])
+                result["artifact_key"] = key
+            else:
+                result["download_url"] = _artifact_url(key, artifact["filename"])
+            return result
+
+        known_company_name = requested.company_name
+        if render_in_pool:
+            content, status_message, company_name = await run_in_process_pool_async(
+                render_resume_bytes, resume.original_path, job_post.description, plan,
+                known_company_name, structure_index, resume.id, resume.content_hash)
+            output = io.BytesIO(content)
+        else:
+            # Rendered into memory; nothing is written until the final name is known
+            output = io.BytesIO()
+            # Call the logic to generate the tailored resume (docx work runs in the threadpool)
+            _, status_message, company_name = await run_in_threadpool(
+                generate_tailored_resume,
+                resume.original_path, 
+                job_post.description, 
+                output, 
+                request.api_key,
+                approved_plan=plan,
+                known_company_name=known_company_name,
+                lookup_company=False,
+                structure_index=structure_index,
+                resume_id=resume.id,
+                content_hash=resume.content_hash,
+                # Regenerating for the same (job, resume) after a plan edit re-renders only what changed
+                rendition_key=(job_post.id, resume.id)
+            )
+
+        # Construct new filename
+        # Format: OriginalName_Optimized_CompanyName.docx
+        original_basename = os.path.splitext(resume.filename)[0]
+
+        clean_company_name = "Company"
+        if company_name and company_name.lower() != "company":
+             clean_company_name = company_name
+
+        final_filename = f"{original_basename}_Optimized_{clean_company_name}.docx".replace("/", "_")
+        result = {
+            "message": status_message,
+            "filename": final_filename,
+            "plan_id": plan.get("plan_id"),
+            "plan_source": plan_source,
+            "artifact_source": "rendered"
+        }
+        if not output.getbuffer().nbytes:
+            # Generation failed; the message says why
+            return result
+        await run_in_threadpool(store.put, key, output.getbuffer(), final_filename)
+        if request.delivery == "stream":
+            result["content"] = output.getvalue()
+            result["artifact_key"] = key
+        else:
+            result["download_url"] = _artifact_url(key, final_filename)
+        return result
+    finally:
+        db.close()
+
+@app.post("/batch-generate")
+async def batch_generate(request: BatchGenerateRequest, db: Session = Depends(get_db)):
+    """
+    Generates tailored resumes of one resume for many jobs (existing job_ids and/or job
+    URLs to scrape) in a single call. URLs are scraped concurrently, the resume's structure
+    index is loaded once, model calls queue in the LLM scheduler at batch priority (behind
+    interactive requests) and documents render in the process pool.
+    The response is a zip streamed as documents complete, ending with manifest.json: one
+    entry per job, in request order, with its status and either the document's name in the
+    archive or the error. A failed job doesn't stop the others.
+    """
+    jobs = [{"job_id": job_id} for job_id in dict.fromkeys(request.job_ids)]
+    jobs += [{"url": url} for url in dict.fromkeys(normalize_job_url(url) for url in request.urls)]
+    if not jobs:
+        raise HTTPException(status_code=422, detail="Provide at least one job_id or url")
+    if len(jobs) > BATCH_MAX_JOBS:
+        raise HTTPException(status_code=422, detail=f"At most {BATCH_MAX_JOBS} jobs per batch")
+
+    resume_filename = await run_in_threadpool(_index_batch_resume, db, request.resume_id)
+    if resume_filename is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    archive_name = f"{os.path.splitext(resume_filename)[0]}_Optimized_batch.zip".replace("/", "_")
+    return StreamingResponse(_batch_archive(request, jobs), media_type="application/zip",
+                             headers={"Content-Disposition": _content_disposition(archive_name)})
+
+def _index_batch_resume(db: Session, resume_id: int):
+    """
+    Indexes the batch's resume once up front rather than in every job of the batch.
+    Returns its file name, or None if there is no such resume.
+    """
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    if not resume:
+        return None
+    _load_resume_index(db, resume)
+    return resume.filename
+
+class _ChunkSink(io.RawIOBase):
+    """ Unseekable file that collects what zipfile writes, so an archive can be streamed as it is built. """
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+async def _batch_archive(request: BatchGenerateRequest, jobs: list):
+    """ Yields the batch zip: each document as soon as it is ready, then the manifest. """
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    tasks = [asyncio.ensure_future(_batch_job(request, job, semaphore)) for job in jobs]
+    sink = _ChunkSink()
+    try:
+        # Documents are already deflated; storing them avoids compressing twice
+        with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+            for next_done in asyncio.as_completed(tasks):
+                entry, content = await next_done
+                if content is not None:
+                    archive.writestr(entry["filename"], content)
+                    yield sink.drain()
+            manifest = {"resume_id": request.resume_id, "jobs": jobs}
+            archive.writestr("manifest.json", json.dumps(manifest, indent=2))
+        yield sink.drain()
+    finally:
+        # The client went away mid-stream: don't keep generating for it
+        for task in tasks:
+            task.cancel()
+
+async def _batch_job(request: BatchGenerateRequest, entry: dict, semaphore: asyncio.Semaphore):
+    """
+    Runs one job of a batch, recording the outcome in its manifest entry.
+    Returns the entry and the document bytes (None if the job failed).
+    """
+    async with semaphore:
+        try:
+            if "url" in entry:
+                entry["job_id"] = await _scrape_batch_url(entry["url"])
+            # Fields are already validated (api_key may be None, which validation would reject)
+            generate = GenerateRequest.model_construct(job_id=entry["job_id"], resume_id=request.resume_id, api_key=request.api_key, delivery="stream")
+            result = await _compute_generate(generate, priority=PRIORITY_BATCH, render_in_pool=True)
+        except HTTPException as e:
+            entry.update(status="error", error=e.detail)
+            return entry, None
+        except Exception as e:
+            print(f"DEBUG: Batch job {entry} failed - {e}")
+            entry.update(status="error", error=str(e))
+            return entry, None
+
+    if "content" not in result:
+        entry.update(status="error", error=result["message"])
+        return entry, None
+    entry.update(status="ok", filename=f"{entry['job_id']}_{result['filename']}", plan_id=result["plan_id"],
+                 plan_source=result["plan_source"], artifact_source=result["artifact_source"])
+    return entry, result["content"]
+
+async def _scrape_batch_url(url: str) -> int:
+    """ Scrapes (subject to the freshness policy) and stores a job URL for a batch, returning the job id. """
+    if not validate_url(url):
+        raise HTTPException(status_code=422, detail="Please enter valid URL")
+    session = SessionLocal()
+    try:
+        job_post, _ = await run_in_threadpool(_refresh_job, session, url)
+        if not job_post.description:
+            raise HTTPException(status_code=422, detail="No job description found")
+        return job_post.id
+    finally:
+        session.close()
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """ Evaluates If-None-Match (which takes precedence) or If-Modified-Since against a file's validators. """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 prescribes for If-None-Match
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag.removeprefix("W/") in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(last_modified) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+def _conditional_file_response(request: Request, path: str, filename: str, etag: str, last_modified: float, cache_control: str):
+    """
+    Serves a file with validators: 304 when the client's copy is current, otherwise the
+    file with ETag, Last-Modified and Cache-Control. Range and If-Range requests are
+    answered with 206 partial content by FileResponse.
+    """
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
     }
+    if request.method in ("GET", "HEAD") and _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=DOCX_MEDIA_TYPE, filename=filename, headers=headers)
 
-@app.get("/download-resume/{filename}")
-def download_resume(filename: str):
+@app.api_route("/download-resume/{token}/{filename}", methods=["GET", "HEAD"])
+def download_generated_resume(token: str, filename: str, request: Request):
     """
-    Serves the generated resume file for download.
-    Checks if the file exists in the generated directory.
+    Serves a generated resume by artifact key (or older per-generation directory), with
+    ETag/If-None-Match, Last-Modified/If-Modified-Since, Range and Cache-Control support.
     """
-    file_path = os.path.join("backend/generated", filename)
-    if not os.path.exists(file_path):
+    if not DOWNLOAD_TOKEN_PATTERN.match(token) or os.path.basename(filename) != filename:
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path, media_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document', filename=filename)
-
+    artifact = get_artifact_store().read_meta(token)
+    if artifact and artifact["filename"] == filename:
+        return _conditional_file_response(request, artifact["path"], filename, artifact["etag"],
+                                          artifact["created_at"], ARTIFACT_CACHE_CONTROL)
+    file_path = os.path.join(GENERATED_DIR, token, filename)
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return _legacy_file_response(request, file_path, filename)
 
+def _legacy_file_response(request: Request, file_path: str, filename: str):
+    """ Files without artifact metadata: validators derived from size and mtime, always revalidated. """
+    stat = os.stat(file_path)
+    etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+    return _conditional_file_response(request, file_path, filename, etag, stat.st_mtime, "no-cache")
 
+@app.api_route("/download-resume/{filename}", methods=["GET", "HEAD"])
+def download_resume(filename: str, request: Request):
+    """
+    Serves the generated resume file for download.
+    Checks if the file exists in the generated directory (files generated before
+    per-generation directories were introduced).
+    """
+    file_path = os.path.join(GENERATED_DIR, filename)
+    if not os.path.isfile(file_path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return _legacy_file_response(request, file_path, filename)
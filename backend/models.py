@@ -1,25 +1,47 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
 from sqlalchemy.sql import func
 from .database import Base
 
 class JobPost(Base):
     """
     Database model for storing job postings.
-    Stores the URL, raw description text, and timestamp.
+    Stores the URL, raw description text, hiring company, and timestamp, plus what the
+    freshness policy needs to avoid re-downloading the page (see job_cache) and the
+    near-duplicate link that lets reposts share plans and artifacts (see job_dedup).
     """
     __tablename__ = "job_posts"
 
     id = Column(Integer, primary_key=True, index=True)
     url = Column(String, unique=True, index=True)
     description = Column(Text)
+    company_name = Column(String, nullable=True) # Extracted at scrape time, or memoized LLM answer
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    fetched_at = Column(DateTime(timezone=True), nullable=True) # Last time the page was fetched or revalidated
+    etag = Column(String, nullable=True) # Validators from the last fetch, for conditional re-fetches
+    last_modified = Column(String, nullable=True)
+    content_hash = Column(String, nullable=True) # SHA-256 of the description text
+    minhash = Column(Text, nullable=True) # MinHash signature of the description; "" if too short to sign
+    canonical_job_id = Column(Integer, ForeignKey("job_posts.id"), nullable=True, index=True) # Earlier near-duplicate whose plans are reused
+
+class JobSignatureBucket(Base):
+    """
+    LSH index over job description signatures: one row per (job, band), so postings
+    sharing any band bucket are near-duplicate candidates (see job_dedup).
+    """
+    __tablename__ = "job_lsh_buckets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("job_posts.id"), index=True)
+    bucket = Column(String, index=True) # "<band>:<hash of the band's rows>"
 
 class Resume(Base):
     """
     Database model for storing uploaded resumes.
-    Stores the original filename, extracted text content, and file path.
+    Stores the original filename, extracted text content, file path, the content hash
+    uploads are deduplicated by, and the structure index used to plan and render
+    without re-parsing the document.
     """
     __tablename__ = "resumes"
 
@@ -27,4 +49,19 @@ class Resume(Base):
     filename = Column(String)
     content = Column(Text) # Storing extracted text for now
     original_path = Column(String)
+    content_hash = Column(String, unique=True, index=True, nullable=True) # SHA-256 of the uploaded file (see upload_store)
+    structure_index = Column(Text, nullable=True) # JSON paragraph/section index built at upload (see resume_index)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class Plan(Base):
+    """
+    Database model for storing optimization plans produced by /preview-optimization.
+    The plan is kept as JSON so /generate-resume can apply it without another model call.
+    """
+    __tablename__ = "plans"
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("job_posts.id"), index=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), index=True)
+    content = Column(Text) # JSON-encoded plan
     created_at = Column(DateTime(timezone=True), server_default=func.now())
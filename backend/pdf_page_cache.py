@@ -0,0 +1,101 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_MAX_DOCUMENTS = 1000
+
+
+class PageTextCache:
+    """
+    Extracted PDF text per (file hash, page), stored in a SQLite file so it is shared by the
+    server and its parse worker processes. A document's page count is recorded with its
+    pages, so a fully cached PDF is answered without opening it. Least recently used
+    documents are evicted beyond max_documents.
+    """
+
+    def __init__(self, path: str, max_documents: int = DEFAULT_MAX_DOCUMENTS):
+        self.path = path
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_documents ("
+                " hash TEXT PRIMARY KEY,"
+                " page_count INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS pdf_pages ("
+                " hash TEXT NOT NULL,"
+                " page INTEGER NOT NULL,"
+                " text TEXT NOT NULL,"
+                " PRIMARY KEY (hash, page))"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get(self, content_hash: str):
+        """ Returns (page_count, {page: text}) for a known document, or (None, {}). """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT page_count FROM pdf_documents WHERE hash = ?", (content_hash,)).fetchone()
+            if not row:
+                return None, {}
+            conn.execute("UPDATE pdf_documents SET last_access = ? WHERE hash = ?", (time.time(), content_hash))
+            pages = dict(conn.execute("SELECT page, text FROM pdf_pages WHERE hash = ?", (content_hash,)).fetchall())
+            return row[0], pages
+
+    def set(self, content_hash: str, page_count: int, pages: dict):
+        """ Records the page count and any newly extracted {page: text}. """
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO pdf_documents (hash, page_count, last_access) VALUES (?, ?, ?)",
+                         (content_hash, page_count, time.time()))
+            conn.executemany("INSERT OR REPLACE INTO pdf_pages (hash, page, text) VALUES (?, ?, ?)",
+                             [(content_hash, page, text) for page, text in pages.items()])
+            self._evict(conn)
+
+    def _evict(self, conn):
+        victims = conn.execute(
+            "SELECT hash FROM pdf_documents ORDER BY last_access DESC LIMIT -1 OFFSET ?", (self.max_documents,)
+        ).fetchall()
+        if victims:
+            conn.executemany("DELETE FROM pdf_pages WHERE hash = ?", victims)
+            conn.executemany("DELETE FROM pdf_documents WHERE hash = ?", victims)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """
+    Returns the process-wide PDF page-text cache, or None when disabled.
+    Configured through environment variables:
+      PDF_PAGE_CACHE                sqlite (default) or none
+      PDF_PAGE_CACHE_PATH           SQLite file (default ./pdf_page_cache.db, /tmp/pdf_page_cache.db on Lambda)
+      PDF_PAGE_CACHE_MAX_DOCUMENTS  how many PDFs are kept
+    """
+    global _cache
+    if _cache is not None:
+        return _cache or None
+
+    with _cache_lock:
+        if _cache is not None:
+            return _cache or None
+        if os.getenv("PDF_PAGE_CACHE", "sqlite").lower() == "none":
+            _cache = False
+            return None
+        default_path = "/tmp/pdf_page_cache.db" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "./pdf_page_cache.db"
+        try:
+            _cache = PageTextCache(
+                os.getenv("PDF_PAGE_CACHE_PATH", default_path),
+                max_documents=int(os.getenv("PDF_PAGE_CACHE_MAX_DOCUMENTS", DEFAULT_MAX_DOCUMENTS)),
+            )
+        except Exception as e:
+            print(f"DEBUG: PDF page cache disabled - {e}")
+            # False marks "initialised but disabled" so we don't retry on every call
+            _cache = False
+        return _cache or None
@@ -0,0 +1,98 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+_pool = None
+_pool_lock = threading.Lock()
+# Set by the pool's initializer, so only real workers see it (a server started as a spawn
+# child, e.g. by uvicorn --reload or --workers, still has a parent process)
+_is_worker = False
+
+
+def _mark_worker():
+    global _is_worker
+    _is_worker = True
+
+
+def in_worker_process() -> bool:
+    """ True inside a pool worker, where work should run inline rather than fan out again. """
+    return _is_worker
+
+
+def get_process_pool():
+    """
+    Returns the process pool shared by CPU-bound parsing (uploads, PDF pages), or None to
+    work in the calling thread. pypdf and python-docx hold the GIL, so running them in worker
+    processes keeps large files from slowing every other request.
+    Configured through environment variables:
+      PARSE_WORKERS  worker processes (default min(4, CPUs); 0 disables the pool)
+    """
+    global _pool
+    if in_worker_process():
+        return None
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.getenv("PARSE_WORKERS", min(4, os.cpu_count() or 1)))
+            if workers <= 0:
+                _pool = False
+            else:
+                try:
+                    # spawn: forking a threaded server can copy held locks into the child
+                    _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                                initializer=_mark_worker)
+                except (OSError, NotImplementedError) as e:
+                    # e.g. no /dev/shm for semaphores on AWS Lambda
+                    print(f"DEBUG: Process pool unavailable - {e}")
+                    _pool = False
+        return _pool or None
+
+
+def pool_size() -> int:
+    pool = get_process_pool()
+    return pool._max_workers if pool else 1
+
+
+def shutdown_process_pool():
+    global _pool
+    with _pool_lock:
+        if _pool:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _discard_broken_pool(pool):
+    """ Drops a pool whose worker died, so the next caller starts a fresh one. """
+    global _pool
+    print("DEBUG: Process pool broke; replacing it")
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def map_in_process_pool(fn, arg_lists: list) -> list:
+    """ Runs fn(*args) for each args in arg_lists across the pool; results keep their order. """
+    pool = get_process_pool()
+    if pool is not None and len(arg_lists) > 1:
+        try:
+            futures = [pool.submit(fn, *args) for args in arg_lists]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            _discard_broken_pool(pool)
+    return [fn(*args) for args in arg_lists]
+
+
+async def run_in_process_pool_async(fn, *args):
+    """ Runs fn(*args) in the pool without blocking the event loop (in a thread when there is no pool). """
+    pool = get_process_pool()
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            _discard_broken_pool(pool)
+    return await asyncio.to_thread(fn, *args)
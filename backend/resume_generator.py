@@ -1,105 +1,45 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
 from docx import Document
+import asyncio
+import io
 import os
-import re
 
 # Support both Lambda (relative) and local dev (absolute) imports
 try:
     from .copilot import ResumeCopilot
+    from .resume_index import build_resume_index, compute_edits, is_current_index, plan_skeleton_from_index
+    from .docx_stream_renderer import render_docx, StaleIndexError
+    from .template_cache import get_rendition_cache, get_template
+    from .llm_scheduler import PRIORITY_INTERACTIVE
 except ImportError:
     from copilot import ResumeCopilot
-
-def _get_paragraph_info(paragraph, experience_headers, summary_headers, stop_headers):
-    """ Helper to categorize a paragraph. """
-    text = paragraph.text.strip()
-    if not text:
-        return "empty", ""
-    
-    lower_text = text.lower()
-    is_bold = paragraph.runs and paragraph.runs[0].bold
-    is_heading_style = paragraph.style.name.startswith('Heading')
-    is_caps = len(text) < 50 and text.isupper()
-    
-    # 1. Section Headers
-    if is_heading_style or is_caps or (is_bold and len(text) < 50):
-        if any(h in lower_text for h in experience_headers):
-            return "experience_section_header", text
-        if any(h in lower_text for h in summary_headers):
-            return "summary_section_header", text
-        if any(sh in lower_text for sh in stop_headers):
-            return "stop_section_header", text
-            
-    # 2. Bullets
-    is_bullet = False
-    try:
-        # Check XML numbering, style names, or common bullet characters
-        if (paragraph._p.pPr is not None and paragraph._p.pPr.numPr is not None) or \
-           'list' in paragraph.style.name.lower() or text.startswith(('•', '-', '–', '*', '·', '◦')):
-            is_bullet = True
-    except: pass
-    
-    if is_bullet:
-        return "bullet", text
-        
-    # 3. Entry Headers (everything else inside Experience that isn't a bullet/section header)
-    return "text", text
-
-def get_optimization_plan(original_path: str, job_description: str, api_key: str = None) -> dict:
+    from resume_index import build_resume_index, compute_edits, is_current_index, plan_skeleton_from_index
+    from docx_stream_renderer import render_docx, StaleIndexError
+    from template_cache import get_rendition_cache, get_template
+    from llm_scheduler import PRIORITY_INTERACTIVE
+
+# "template" renders from a cached parse of the resume (see template_cache);
+# "stream" rewrites word/document.xml from the file on every render (see docx_stream_renderer);
+# "python-docx" loads and re-saves the whole package through python-docx.
+DOCX_RENDERER = os.getenv("DOCX_RENDERER", "template")
+
+def get_resume_index(original_path: str, structure_index: dict = None) -> dict:
+    """ Returns the stored structure index if it is current, otherwise builds it from the file. """
+    if is_current_index(structure_index):
+        return structure_index
+    return build_resume_index(original_path)
+
+def extract_plan_skeleton(original_path: str, structure_index: dict = None) -> dict:
     """
-    Analyzes the resume and returns a plan of suggested changes (Summary + Grouped Experience).
-    Used for the 'Preview' feature.
+    Returns the plan structure (summary + grouped experience) with original text only.
+    Uses the structure index built at upload time; the docx is only walked if there is none.
+    Pure local work: no model calls.
     """
-    print(f"DEBUG: Generating optimization plan for {original_path}")
-    doc = Document(original_path)
-    copilot = ResumeCopilot(api_key)
-    
-    experience_headers = ["experience", "professional experience", "work history", "employment history", "work experience", "career history"]
-    summary_headers = ["summary", "professional summary", "objective", "profile", "professional profile"]
-    stop_headers = ["education", "skills", "projects", "technical skills", "certifications", "awards", "languages", "volunteering", "top skills"]
-    
-    plan = {
-        "company_name": "Company",
-        "summary": {"original": "", "optimized": ""},
-        "experience_entries": []
-    }
-    
-    current_section = None # None, "summary", "experience"
-    current_entry = None
-    
-    for para in doc.paragraphs:
-        p_type, text = _get_paragraph_info(para, experience_headers, summary_headers, stop_headers)
-        
-        if p_type == "empty": continue
-        
-        if p_type == "summary_section_header":
-            current_section = "summary"
-        elif p_type == "experience_section_header":
-            current_section = "experience"
-        elif p_type == "stop_section_header":
-            current_section = "stop"
-        elif current_section == "summary" and p_type == "text":
-            plan["summary"]["original"] += text + " "
-        elif current_section == "experience":
-            if p_type == "bullet":
-                if not current_entry:
-                    # Rare: bullets without a header? Create a placeholder entry
-                    current_entry = {"header": "Experience", "bullets": []}
-                    plan["experience_entries"].append(current_entry)
-                current_entry["bullets"].append(text)
-            elif p_type == "text":
-                # Entry Header
-                # If we were already in an entry and it has bullets, start a new one.
-                # If it doesn't have bullets, append to current header (multi-line header).
-                if not current_entry or current_entry["bullets"]:
-                    current_entry = {"header": text, "bullets": []}
-                    plan["experience_entries"].append(current_entry)
-                else:
-                    current_entry["header"] += " | " + text
+    return plan_skeleton_from_index(get_resume_index(original_path, structure_index))
 
-    # 2. Call AI in bulk to avoid rate limits
-    batch_result = copilot.optimize_all_content(plan["summary"]["original"], plan["experience_entries"], job_description)
-    
+def apply_batch_result(plan: dict, batch_result: dict) -> dict:
+    """ Maps the batched AI response back onto the plan, falling back to the originals. """
     if batch_result:
         # Map batch result back to plan
         if "company_name" in batch_result:
@@ -113,6 +53,10 @@ def get_optimization_plan(original_path: str, job_description: str, api_key: str
                 idx = entry_res.get("id")
                 if idx is not None and idx < len(plan["experience_entries"]):
                     plan["experience_entries"][idx]["optimized_bullets"] = entry_res.get("optimized_bullets", [])
+
+        # Entries the model skipped keep their original bullets
+        for entry in plan["experience_entries"]:
+            entry.setdefault("optimized_bullets", entry["bullets"])
     else:
         # Fallback if batch fails
         print("DEBUG: Batch optimization failed, fallback to originals.")
@@ -122,131 +66,69 @@ def get_optimization_plan(original_path: str, job_description: str, api_key: str
 
     return plan
 
-def generate_tailored_resume(original_path: str, job_description: str, output_path: str, api_key: str = None, approved_plan: dict = None) -> tuple[str, str, str]:
+def get_optimization_plan(original_path: str, job_description: str, api_key: str = None, structure_index: dict = None) -> dict:
     """
-    Generates the final file. If approved_plan is provided, uses that.
-    Otherwise, generates a plan on the fly.
+    Analyzes the resume and returns a plan of suggested changes (Summary + Grouped Experience).
+    Used for the 'Preview' feature.
     """
-    try:
-        doc = Document(original_path)
-        copilot = ResumeCopilot(api_key)
-        
-        plan = approved_plan or get_optimization_plan(original_path, job_description, api_key)
-        
-        # Priority: approved_plan company name, then from analysis
-        company_name = plan.get("company_name", "Company")
-        
-        # Mapping logic back to doc is complex because we want to REPLACE summary and APPEND/REPLACE bullets
-        # Since this is a specialized task, I'll implement a clean-replacement strategy:
-        # 1. Find the summary and experience sections again.
-        # 2. Update their paragraphs.
-        
-        experience_headers = ["experience", "professional experience", "work history", "employment history", "work experience", "career history"]
-        summary_headers = ["summary", "professional summary", "objective", "profile", "professional profile"]
-        stop_headers = ["education", "skills", "projects", "technical skills", "certifications", "awards", "languages", "volunteering", "top skills"]
-
-        current_section = None
-        exp_entry_idx = -1
-        bullet_idx = 0
-        last_bullet_para = None
-        paragraphs_to_delete = []
-        
-        summary_paras = []
-        
-        for para in doc.paragraphs:
-            p_type, text = _get_paragraph_info(para, experience_headers, summary_headers, stop_headers)
-            
-            if p_type == "empty": continue
-            
-            if p_type == "summary_section_header":
-                current_section = "summary"
-                continue
-            elif p_type == "experience_section_header":
-                current_section = "experience"
-                exp_entry_idx = -1
-                continue
-            elif p_type == "stop_section_header":
-                # Finalize last entry before leaving
-                if current_section == "experience" and exp_entry_idx >= 0 and last_bullet_para:
-                    _append_extra_bullets(plan["experience_entries"][exp_entry_idx], bullet_idx, last_bullet_para)
-                current_section = "stop"
-                continue
+    print(f"DEBUG: Generating optimization plan for {original_path}")
+    plan = extract_plan_skeleton(original_path, structure_index)
+    copilot = ResumeCopilot(api_key)
 
-            if current_section == "summary" and p_type == "text":
-                summary_paras.append(para)
-                
-            elif current_section == "experience":
-                if p_type == "text":
-                    # Transition to next entry if the current one had bullets
-                    # THIS MUST MATCH THE LOGIC IN get_optimization_plan
-                    # Entries are created when we hit 'text' if (first entry OR previous entry has bullets)
-                    was_in_entry = exp_entry_idx >= 0
-                    has_bullets_in_prev = was_in_entry and bullet_idx > 0
-                    
-                    if not was_in_entry or has_bullets_in_prev:
-                        # Append extras to previous before starting new
-                        if was_in_entry and last_bullet_para:
-                            _append_extra_bullets(plan["experience_entries"][exp_entry_idx], bullet_idx, last_bullet_para)
-                        
-                        exp_entry_idx += 1
-                        bullet_idx = 0
-                        last_bullet_para = None
-                    
-                elif p_type == "bullet":
-                    if exp_entry_idx == -1: exp_entry_idx = 0
-                    
-                    if exp_entry_idx < len(plan["experience_entries"]):
-                        entry = plan["experience_entries"][exp_entry_idx]
-                        if bullet_idx < len(entry["optimized_bullets"]):
-                            # Detect bullet style
-                            is_word_bullet = False
-                            try:
-                                if (para._p.pPr is not None and para._p.pPr.numPr is not None) or 'list' in para.style.name.lower():
-                                    is_word_bullet = True
-                            except: pass
+    # 2. Call AI in bulk to avoid rate limits
+    batch_result = copilot.optimize_all_content(plan["summary"]["original"], plan["experience_entries"], job_description)
+    plan = apply_batch_result(plan, batch_result)
+    if copilot.last_compaction:
+        plan["jd_compaction"] = copilot.last_compaction
+    return plan
 
-                            # Find existing literal bullet character
-                            match = re.match(r'^(\s*[•\-\–*·◦]\s*)', para.text)
-                            
-                            new_text = entry["optimized_bullets"][bullet_idx]
-                            clean_new_text = re.sub(r'^(\s*[•\-\–*·◦]\s*)', '', new_text.strip())
+async def get_optimization_plan_async(original_path: str, job_description: str, api_key: str = None, structure_index: dict = None, priority: int = PRIORITY_INTERACTIVE) -> dict:
+    """
+    Async variant of get_optimization_plan for async request handlers.
+    Any docx walk runs in a worker thread; the model call is awaited on the event loop,
+    queued in the LLM scheduler at the given priority.
+    """
+    print(f"DEBUG: Generating optimization plan (async) for {original_path}")
+    if is_current_index(structure_index):
+        plan = plan_skeleton_from_index(structure_index)
+    else:
+        plan = await asyncio.to_thread(extract_plan_skeleton, original_path)
+    copilot = ResumeCopilot(api_key, priority)
 
-                            if match:
-                                # Preserve the literal bullet the user had
-                                para.text = match.group(1) + clean_new_text
-                            elif is_word_bullet:
-                                # Word is handling the bullet, don't add characters
-                                para.text = clean_new_text
-                            else:
-                                # Fallback: add a standard bullet
-                                para.text = "• " + clean_new_text
-                            
-                            bullet_idx += 1
-                            last_bullet_para = para
-                        else:
-                            # Mark for deletion if AI shortened the list
-                            paragraphs_to_delete.append(para)
+    batch_result = await copilot.optimize_all_content_async(plan["summary"]["original"], plan["experience_entries"], job_description)
+    plan = apply_batch_result(plan, batch_result)
+    if copilot.last_compaction:
+        plan["jd_compaction"] = copilot.last_compaction
+    return plan
 
-        # Final cleanup for the very last entry
-        if current_section == "experience" and exp_entry_idx >= 0 and exp_entry_idx < len(plan["experience_entries"]) and last_bullet_para:
-            _append_extra_bullets(plan["experience_entries"][exp_entry_idx], bullet_idx, last_bullet_para)
+def generate_tailored_resume(original_path: str, job_description: str, output_path: str, api_key: str = None, approved_plan: dict = None, known_company_name: str = None, lookup_company: bool = True, structure_index: dict = None, resume_id: int = None, content_hash: str = None, rendition_key=None) -> tuple[str, str, str]:
+    """
+    Generates the final file. If approved_plan is provided, uses that.
+    Otherwise, generates a plan on the fly.
+    known_company_name (extracted at scrape time or memoized per job) is used when the
+    plan has no company, so the LLM is only asked as a last resort (and never when
+    lookup_company is False, e.g. because the caller already asked asynchronously).
+    The plan is mapped onto paragraphs through the structure index (see compute_edits),
+    so the document is not re-classified here. resume_id and content_hash key the
+    parsed-template cache. rendition_key (e.g. (job_id, resume_id)) enables incremental
+    re-renders: the plan is diffed against the last one rendered under the same key and
+    only the changed paragraphs are rendered again. original_path and output_path may
+    also be binary file objects, so a document can be rendered entirely in memory.
+    """
+    try:
+        index = get_resume_index(original_path, structure_index)
 
-        # Apply summary changes
-        if summary_paras and plan["summary"]["optimized"]:
-            summary_paras[0].text = plan["summary"]["optimized"]
-            for p in summary_paras[1:]:
-                paragraphs_to_delete.append(p)
+        plan = approved_plan or get_optimization_plan(original_path, job_description, api_key, index)
+        
+        # Priority: approved_plan company name, then from analysis, then scrape-time extraction
+        company_name = plan.get("company_name", "Company")
+        if (not company_name or company_name == "Company") and known_company_name:
+            company_name = known_company_name
 
-        # Cleanup: Remove paragraphs marked for deletion
-        for p in paragraphs_to_delete:
-            try:
-                element = p._element
-                element.getparent().remove(element)
-            except: pass
+        render_resume(original_path, index, plan, output_path, resume_id, content_hash, rendition_key)
 
-        doc.save(output_path)
-        if not company_name or company_name == "Company":
-            company_name = copilot.extract_company_name(job_description)
+        if lookup_company and (not company_name or company_name == "Company"):
+            company_name = ResumeCopilot(api_key).extract_company_name(job_description)
         
         return output_path, "Resume generated successfully", company_name
 
@@ -256,26 +138,73 @@ def generate_tailored_resume(original_path: str, job_description: str, output_pa
         traceback.print_exc()
         return "", f"Error: {e}", ""
 
-def _append_extra_bullets(entry, current_idx, anchor_para):
-    """ Helper to append extra optimized bullets if AI generated more than were original. """
-    if "optimized_bullets" in entry and current_idx < len(entry["optimized_bullets"]):
-        for j in range(current_idx, len(entry["optimized_bullets"])):
-            new_bullet = entry["optimized_bullets"][j]
-            # Strip existing bullet char from new_bullet to avoid double bullets
-            clean_bullet = re.sub(r'^(\s*[•\-\–*·◦]\s*)', '', new_bullet.strip())
-            
-            # Check if anchor preferred a literal bullet or has a list style
-            match = re.match(r'^(\s*[•\-\–*·◦]\s*)', anchor_para.text)
-            is_word_bullet = False
-            try:
-                if (anchor_para._p.pPr is not None and anchor_para._p.pPr.numPr is not None) or 'list' in anchor_para.style.name.lower():
-                    is_word_bullet = True
-            except: pass
+def render_resume_bytes(original_path: str, job_description: str, approved_plan: dict, known_company_name: str = None, structure_index: dict = None, resume_id: int = None, content_hash: str = None) -> tuple[bytes, str, str]:
+    """
+    generate_tailored_resume for an approved plan, rendered in memory. Returns the document
+    bytes (empty on failure), the status message and the company name. Arguments and result
+    are picklable, so it can run in the process pool; each worker keeps its own template cache.
+    """
+    output = io.BytesIO()
+    _, status_message, company_name = generate_tailored_resume(
+        original_path, job_description, output, approved_plan=approved_plan, known_company_name=known_company_name,
+        lookup_company=False, structure_index=structure_index, resume_id=resume_id, content_hash=content_hash)
+    return output.getvalue(), status_message, company_name
+
+def render_resume(original_path, index: dict, plan: dict, output_path, resume_id: int = None, content_hash: str = None, rendition_key=None):
+    """
+    Writes the tailored document: the plan is turned into paragraph edits through the index
+    and applied by the configured renderer (DOCX_RENDERER). If the index doesn't describe
+    this file, it is rebuilt rather than misplacing edits.
+    Both paths may be binary file objects (e.g. io.BytesIO) instead of file names.
+    """
+    if DOCX_RENDERER == "python-docx":
+        doc = Document(original_path)
+        if index["paragraph_count"] != len(doc.paragraphs):
+            index = build_resume_index(original_path)
+        apply_edits(doc, compute_edits(index, plan))
+        doc.save(output_path)
+        return
+
+    if DOCX_RENDERER == "stream":
+        render = lambda edits, expected=None: render_docx(original_path, edits, output_path, expected_paragraphs=expected)
+    else:
+        template = get_template(original_path, resume_id, content_hash)
+        render = lambda edits, expected=None: render_template(template, edits, output_path, expected, rendition_key)
 
-            prefix = "\n• "
-            if match:
-                prefix = "\n" + match.group(1)
-            elif is_word_bullet:
-                prefix = "\n"
-            
-            anchor_para.text += prefix + clean_bullet
+    try:
+        render(compute_edits(index, plan), index["paragraph_count"])
+    except StaleIndexError as e:
+        print(f"DEBUG: {e}; rebuilding the structure index")
+        index = build_resume_index(original_path)
+        if hasattr(output_path, "seek"):
+            # Discard the partial document already written to the buffer
+            output_path.seek(0)
+            output_path.truncate()
+        render(compute_edits(index, plan))
+
+def render_template(template, edits: dict, output_path, expected_paragraphs: int = None, rendition_key=None):
+    """
+    Renders edits from a parsed template. With a rendition_key, the last rendition under
+    that key is patched instead: only paragraphs whose edit differs from the previous
+    render are rebuilt, so edit-and-regenerate cycles don't pay for the whole document.
+    """
+    template.check_paragraphs(expected_paragraphs)
+    renditions = get_rendition_cache() if rendition_key is not None else None
+    previous = renditions.get(rendition_key, template) if renditions else None
+    rendition = previous.patch(edits) if previous else template.rendition(edits)
+    rendition.write(output_path)
+    if renditions:
+        renditions.put(rendition_key, rendition, patched=previous is not None)
+    if previous:
+        print(f"DEBUG: Incremental render of {rendition_key}: {rendition.changed} paragraph(s) changed")
+
+def apply_edits(doc, edits: dict):
+    """ Rewrites ({ordinal: text}) or removes ({ordinal: None}) body paragraphs of a python-docx Document. """
+    paragraphs = doc.paragraphs
+    for ordinal, new_text in edits.items():
+        para = paragraphs[ordinal]
+        if new_text is None:
+            element = para._element
+            element.getparent().remove(element)
+        else:
+            para.text = new_text
@@ -0,0 +1,159 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+from docx import Document
+import re
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .section_classifier import get_classifier
+except ImportError:
+    from section_classifier import get_classifier
+
+# Bump when the index layout or classification rules change; older indexes are rebuilt
+INDEX_VERSION = 1
+
+BULLET_PREFIX_PATTERN = re.compile(r'^(\s*[•\-\–*·◦]\s*)')
+
+def _bullet_style(paragraph, style_cache: dict) -> dict:
+    """ Records how a bullet is drawn: Word list numbering/style, or a literal prefix character. """
+    pPr = paragraph._p.pPr
+    is_word_bullet = False
+    try:
+        if (pPr is not None and pPr.numPr is not None) or style_cache[pPr.style if pPr is not None else None][1]:
+            is_word_bullet = True
+    except: pass
+    match = BULLET_PREFIX_PATTERN.match(paragraph.text)
+    return {"word_list": is_word_bullet, "literal_prefix": match.group(1) if match else None}
+
+def build_resume_index(original_path: str, classifier=None) -> dict:
+    """
+    Walks the resume once and records its structure, so planning and rendering never
+    have to re-classify paragraphs:
+      paragraphs   [ordinal, type, section] for each non-empty body paragraph
+      sections     kind and ordinal range of each recognised section
+      summary      ordinals and text of the summary paragraphs
+      entries      experience entries: header text/ordinals and bullets with ordinal, text and style
+    Ordinals are positions in the document's body-level paragraph list.
+    Paragraphs are classified by the process-wide section classifier unless one is given.
+    """
+    doc = Document(original_path)
+    classifier = classifier or get_classifier()
+    style_cache = {}
+
+    index = {
+        "version": INDEX_VERSION,
+        "classifier": classifier.signature,
+        "paragraph_count": 0,
+        "paragraphs": [],
+        "sections": [],
+        "summary": {"ordinals": [], "texts": []},
+        "entries": [],
+    }
+
+    current_section = None # None, "summary", "experience", "stop"
+    current_entry = None
+
+    for ordinal, para in enumerate(doc.paragraphs):
+        index["paragraph_count"] = ordinal + 1
+        p_type, text = classifier.classify(para, style_cache)
+
+        if p_type == "empty": continue
+
+        if p_type.endswith("_section_header"):
+            current_section = p_type[:-len("_section_header")]
+            current_entry = None
+            if index["sections"]:
+                index["sections"][-1]["end"] = ordinal
+            index["sections"].append({"kind": current_section, "header_ordinal": ordinal, "title": text, "end": None})
+        index["paragraphs"].append([ordinal, p_type, current_section])
+
+        if current_section == "summary" and p_type == "text":
+            index["summary"]["ordinals"].append(ordinal)
+            index["summary"]["texts"].append(text)
+        elif current_section == "experience":
+            if p_type == "bullet":
+                if not current_entry:
+                    # Rare: bullets without a header? Create a placeholder entry
+                    current_entry = {"header": "Experience", "header_ordinals": [], "bullets": []}
+                    index["entries"].append(current_entry)
+                current_entry["bullets"].append({"ordinal": ordinal, "text": text, "style": _bullet_style(para, style_cache)})
+            elif p_type == "text":
+                # A header line after bullets starts a new entry; consecutive header lines
+                # (before any bullet) form a multi-line header.
+                if not current_entry or current_entry["bullets"]:
+                    current_entry = {"header": text, "header_ordinals": [ordinal], "bullets": []}
+                    index["entries"].append(current_entry)
+                else:
+                    current_entry["header"] += " | " + text
+                    current_entry["header_ordinals"].append(ordinal)
+
+    if index["sections"]:
+        index["sections"][-1]["end"] = index["paragraph_count"]
+    return index
+
+def is_current_index(index) -> bool:
+    """ True if a stored index was built with the current layout, rules and header vocabulary. """
+    return isinstance(index, dict) and index.get("version") == INDEX_VERSION \
+        and index.get("classifier") == get_classifier().signature
+
+def plan_skeleton_from_index(index: dict) -> dict:
+    """ Builds the plan structure (summary + grouped experience) with original text only. """
+    return {
+        "company_name": "Company",
+        "summary": {"original": "".join(text + " " for text in index["summary"]["texts"]), "optimized": ""},
+        "experience_entries": [
+            {"header": entry["header"], "bullets": [b["text"] for b in entry["bullets"]]}
+            for entry in index["entries"]
+        ]
+    }
+
+def _render_bullet(style: dict, new_text: str) -> str:
+    """ Formats a replacement bullet the way the original was drawn. """
+    clean_text = BULLET_PREFIX_PATTERN.sub('', new_text.strip())
+    if style["literal_prefix"]:
+        # Preserve the literal bullet the user had
+        return style["literal_prefix"] + clean_text
+    if style["word_list"]:
+        # Word is handling the bullet, don't add characters
+        return clean_text
+    # Fallback: add a standard bullet
+    return "• " + clean_text
+
+def compute_edits(index: dict, plan: dict) -> dict:
+    """
+    Maps a plan onto the indexed paragraphs. Returns {ordinal: new_text} for paragraphs to
+    rewrite and {ordinal: None} for paragraphs to delete:
+      - the summary goes into the first summary paragraph; the rest are removed,
+      - each original bullet is replaced by the optimized bullet at the same position,
+      - surplus optimized bullets are appended to the entry's last rewritten bullet as
+        extra lines, and surplus original bullets are removed.
+    Plan entries are matched to indexed entries by position.
+    """
+    edits = {}
+
+    optimized_summary = plan.get("summary", {}).get("optimized")
+    summary_ordinals = index["summary"]["ordinals"]
+    if summary_ordinals and optimized_summary:
+        edits[summary_ordinals[0]] = optimized_summary
+        for ordinal in summary_ordinals[1:]:
+            edits[ordinal] = None
+
+    for entry, planned in zip(index["entries"], plan.get("experience_entries", [])):
+        optimized = planned.get("optimized_bullets", [])
+        bullets = entry["bullets"]
+        for bullet, new_text in zip(bullets, optimized):
+            edits[bullet["ordinal"]] = _render_bullet(bullet["style"], new_text)
+        for bullet in bullets[len(optimized):]:
+            edits[bullet["ordinal"]] = None
+
+        kept = min(len(bullets), len(optimized))
+        if kept and len(optimized) > kept:
+            anchor = bullets[kept - 1]
+            first_line = edits[anchor["ordinal"]]
+            # Extra bullets follow the anchor's (possibly newly added) prefix
+            match = BULLET_PREFIX_PATTERN.match(first_line)
+            prefix = match.group(1) if match else ("" if anchor["style"]["word_list"] else "• ")
+            extras = [prefix + BULLET_PREFIX_PATTERN.sub('', text.strip()) for text in optimized[kept:]]
+            edits[anchor["ordinal"]] = "\n".join([first_line] + extras)
+
+    return edits
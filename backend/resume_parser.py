@@ -1,20 +1,82 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
+import hashlib
+import io
+import mmap
 import os
+from contextlib import contextmanager
 from pypdf import PdfReader
 from docx import Document
 
-def extract_text_from_pdf(file_path: str) -> str:
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .pdf_page_cache import get_page_cache
+    from .process_pool import map_in_process_pool, pool_size
+except ImportError:
+    from pdf_page_cache import get_page_cache
+    from process_pool import map_in_process_pool, pool_size
+
+# Files at least this large are memory-mapped instead of read into memory
+PDF_MMAP_MIN_BYTES = int(os.getenv("PDF_MMAP_MIN_BYTES", 1024 * 1024))
+# Fewer pages than this to extract are not worth shipping to worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", 8))
+
+@contextmanager
+def _pdf_stream(file_path: str):
+    """ Opens a PDF as a seekable stream: memory-mapped when large, read whole when small. """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= PDF_MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+        else:
+            yield io.BytesIO(f.read())
+
+def _buffer(stream):
+    return stream if isinstance(stream, mmap.mmap) else stream.getbuffer()
+
+def _extract_pages(file_path: str, pages: list[int]) -> dict:
+    """ Extracts the text of the given pages (runs in a worker process for parallel extraction). """
+    with _pdf_stream(file_path) as stream:
+        reader = PdfReader(stream)
+        return {page: reader.pages[page].extract_text() for page in pages}
+
+def _extract_missing_pages(file_path: str, reader: PdfReader, pages: list[int]) -> dict:
+    """ Extracts pages inline, or in contiguous runs across the process pool when there are enough. """
+    workers = pool_size() if len(pages) >= PDF_PARALLEL_MIN_PAGES else 1
+    if workers <= 1:
+        return {page: reader.pages[page].extract_text() for page in pages}
+    run = -(-len(pages) // workers)
+    texts = {}
+    for chunk in map_in_process_pool(_extract_pages, [(file_path, pages[i:i + run]) for i in range(0, len(pages), run)]):
+        texts.update(chunk)
+    return texts
+
+def extract_text_from_pdf(file_path: str, content_hash: str = None) -> str:
     """
     Extracts text content from a PDF file.
-    Iterates through all pages and concatenates the text.
+    Page texts are cached per (file hash, page), so re-processing a known file doesn't
+    parse it again; uncached pages of long documents are extracted in parallel across
+    the process pool. Page texts are concatenated in order.
     """
     try:
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        cache = get_page_cache()
+        with _pdf_stream(file_path) as stream:
+            page_count, texts = None, {}
+            if cache:
+                content_hash = content_hash or hashlib.sha256(_buffer(stream)).hexdigest()
+                page_count, texts = cache.get(content_hash)
+
+            if page_count is None or len(texts) < page_count:
+                reader = PdfReader(stream)
+                page_count = len(reader.pages)
+                missing = [page for page in range(page_count) if page not in texts]
+                extracted = _extract_missing_pages(file_path, reader, missing)
+                texts.update(extracted)
+                if cache:
+                    cache.set(content_hash, page_count, extracted)
+
+        return "".join(texts[page] for page in range(page_count))
     except Exception as e:
         print(f"Error reading PDF: {e}")
         return ""
@@ -32,18 +94,18 @@ def extract_text_from_docx(file_path: str) -> str:
         print(f"Error reading DOCX: {e}")
         return ""
 
-def parse_resume(file_path: str) -> str:
+def parse_resume(file_path: str, content_hash: str = None) -> str:
     """
     Main parser function that determines file type and calls the appropriate extractor.
-    Supports .pdf and .docx extensions.
+    Supports .pdf and .docx extensions. content_hash (the file's SHA-256, if already
+    known) keys the PDF page cache.
     """
     _, ext = os.path.splitext(file_path)
     ext = ext.lower()
-    
+
     if ext == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(file_path, content_hash)
     elif ext == '.docx':
         return extract_text_from_docx(file_path)
     else:
         return "Unsupported file format"
-
@@ -1,8 +1,19 @@
 # Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
 
-import requests
-from bs4 import BeautifulSoup
 import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import httpx
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .http_client import FetchTimeoutError, get_http_client
+    from .job_extractors import company_from_slug, extract_job_posting
+except ImportError:
+    from http_client import FetchTimeoutError, get_http_client
+    from job_extractors import company_from_slug, extract_job_posting
+
+# Query parameters that track how a link was shared, not which job it is
+TRACKING_PARAMS = ("trk", "trackingid", "refid", "originalsubdomain", "mstr_dist")
 
 def validate_url(url: str) -> bool:
     """
@@ -16,47 +27,75 @@ def validate_url(url: str) -> bool:
         return True
     return False
 
-def scrape_job_description(url: str) -> str:
+def normalize_job_url(url: str) -> str:
     """
-    Scrapes the text content of the job description from the given URL.
-    Uses a browser-like User-Agent to avoid basic bot detection.
-    Extracts all text from the page body and truncates it to 5000 chars.
+    Canonical form of a job URL for deduplication: trimmed, lowercase scheme and host, no
+    fragment and no tracking parameters (utm_*, LinkedIn's trk/refId/trackingId, ...).
+    """
+    parts = urlsplit(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS]
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, urlencode(query), ""))
+
+def _is_transient(error: Exception) -> bool:
+    """ Failures worth retrying: network errors, timeouts, rate limiting and server errors. """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, FetchTimeoutError))
+
+def _retry_after(error: Exception) -> float | None:
+    """ Seconds a 429/503 response asked us to wait (Retry-After in its delta-seconds form), if any. """
+    if isinstance(error, httpx.HTTPStatusError):
+        value = error.response.headers.get("Retry-After", "")
+        if value.strip().isdigit():
+            return float(value)
+    return None
+
+def scrape_job_posting(url: str, etag: str = None, last_modified: str = None) -> dict:
+    """
+    Scrapes a job posting and returns its description text, title and hiring company.
+    Both are extracted locally (see extract_job_posting); the company is None if not found.
+    The response's ETag and Last-Modified are returned for revalidation; passing them back
+    makes the request conditional, and a 304 comes back as not_modified with no description.
+    A failed fetch comes back with an empty description, the error, and whether it is
+    worth retrying (with the server's Retry-After, if it sent one).
     """
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5"
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Basic extraction logic - this might need refinement based on actual page structure
-        # For now, we'll extract all text from the body, or specific containers if known
+        # Pooled, timeout- and size-bounded fetch with browser-like headers (see http_client)
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        response = get_http_client().fetch(url, headers=headers)
+        validators = {"etag": response["headers"].get("ETag"), "last_modified": response["headers"].get("Last-Modified")}
+        if response["status_code"] == 304:
+            print("DEBUG: Job posting not modified since the last fetch")
+            return {"description": "", "company_name": None, "title": None, "not_modified": True, **validators}
         
-        # Try to find specific job description containers for better quality
-        # LinkedIn specific classes
-        job_container = soup.find(class_="description__text") or \
-                        soup.find(class_="show-more-less-html__markup") or \
-                        soup.find(class_="jobs-description__content") or \
-                        soup.find("article")
-
-        if job_container:
-            text = job_container.get_text(separator='\n', strip=True)
-            print(f"DEBUG: Scraper found targeted container. Length: {len(text)}")
-        else:
-            # Fallback: get all text but try to skip head/scripts
-            for script in soup(["script", "style", "header", "footer", "nav"]):
-                script.decompose()
-            text = soup.get_text(separator='\n', strip=True)
-            print(f"DEBUG: Scraper used fallback. Length: {len(text)}")
+        # JSON-LD fast path, then the site adapter's containers (see job_extractors)
+        posting = extract_job_posting(response["content"], url)
+        text = posting["description"]
+        print(f"DEBUG: Scraper used {posting['adapter']} adapter, {posting['source']} source. Length: {len(text)}")
         
-        # Limit text length to avoid processing too much irrelevant info
-        return text[:10000] # Increased limit to ensure we capture full JDs
+        # Safety cap only: prompts get a compacted, token-budgeted version (see jd_compactor)
+        return {
+            "description": text[:50000],
+            "company_name": posting["company_name"],
+            "title": posting["title"],
+            "not_modified": False,
+            **validators
+        }
         
     except Exception as e:
         print(f"Error scraping URL: {e}")
-        return ""
+        return {"description": "", "company_name": company_from_slug(url), "title": None, "not_modified": False, "etag": None, "last_modified": None,
+                "error": (str(e) or type(e).__name__).splitlines()[0], "retryable": _is_transient(e), "retry_after": _retry_after(e)}
 
+def scrape_job_description(url: str) -> str:
+    """
+    Scrapes the text content of the job description from the given URL.
+    Uses a browser-like User-Agent to avoid basic bot detection.
+    Extracts the job container (or all page text) and caps it at 50000 chars.
+    """
+    return scrape_job_posting(url)["description"]
@@ -0,0 +1,154 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import json
+import os
+import re
+import threading
+from docx.text.run import Run
+
+# Section kinds in priority order: when a header mentions several, the first kind wins
+SECTION_KINDS = ("experience", "summary", "stop")
+
+BULLET_CHARACTERS = ('•', '-', '–', '*', '·', '◦')
+
+# Built-in header vocabularies. "en" is always loaded; others are opt-in via RESUME_HEADER_LOCALES.
+LOCALE_VOCABULARIES = {
+    "en": {
+        "experience": ["experience", "professional experience", "work history", "employment history", "work experience", "career history"],
+        "summary": ["summary", "professional summary", "objective", "profile", "professional profile"],
+        "stop": ["education", "skills", "projects", "technical skills", "certifications", "awards", "languages", "volunteering", "top skills"],
+    },
+    "de": {
+        "experience": ["berufserfahrung", "erfahrung", "beruflicher werdegang", "werdegang"],
+        "summary": ["zusammenfassung", "profil", "kurzprofil", "über mich"],
+        "stop": ["ausbildung", "kenntnisse", "fähigkeiten", "projekte", "zertifikate", "zertifizierungen", "sprachen", "auszeichnungen"],
+    },
+    "fr": {
+        "experience": ["expérience", "expériences professionnelles", "parcours professionnel"],
+        "summary": ["résumé", "profil", "objectif", "à propos"],
+        "stop": ["formation", "compétences", "projets", "certifications", "langues", "distinctions", "bénévolat"],
+    },
+    "es": {
+        "experience": ["experiencia", "experiencia profesional", "experiencia laboral", "trayectoria profesional"],
+        "summary": ["resumen", "perfil", "objetivo", "perfil profesional"],
+        "stop": ["educación", "formación", "habilidades", "proyectos", "certificaciones", "idiomas", "premios", "voluntariado"],
+    },
+}
+
+
+class SectionClassifier:
+    """
+    Classifies resume paragraphs as section headers, bullets or text.
+    All header vocabularies are compiled into one regular expression with a named group per
+    section kind. The pattern is a lookahead, so every position of the text is tried and a
+    header containing several terms resolves to the highest-priority kind, exactly as
+    separate substring scans in SECTION_KINDS order would.
+    """
+
+    def __init__(self, vocabulary: dict[str, list[str]]):
+        self.vocabulary = {kind: sorted(set(t.lower() for t in vocabulary.get(kind, []) if t.strip()), key=lambda t: (-len(t), t))
+                           for kind in SECTION_KINDS}
+        groups = [f"(?P<{kind}>{'|'.join(re.escape(t) for t in terms)})"
+                  for kind, terms in self.vocabulary.items() if terms]
+        self.pattern = re.compile("(?=" + "|".join(groups) + ")") if groups else None
+        # Identifies the vocabulary in stored indexes, so a vocabulary change triggers a rebuild
+        self.signature = hashlib.sha256(json.dumps(self.vocabulary, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    def header_kind(self, lower_text: str):
+        """ Returns the section kind named in a (lower-cased) header, or None. """
+        if self.pattern is None:
+            return None
+        best = None
+        for match in self.pattern.finditer(lower_text):
+            kind = match.lastgroup
+            if kind == SECTION_KINDS[0]:
+                return kind
+            if best is None or SECTION_KINDS.index(kind) < SECTION_KINDS.index(best):
+                best = kind
+        return best
+
+    def classify(self, paragraph, style_cache: dict = None) -> tuple[str, str]:
+        """
+        Categorizes a paragraph as "<kind>_section_header", "bullet", "text" or "empty".
+        style_cache maps style ids to (is_heading, is_list) for one document, so each style
+        is resolved once instead of once or twice per paragraph; see classify_document.
+        """
+        text = paragraph.text.strip()
+        if not text:
+            return "empty", ""
+
+        p = paragraph._p
+        pPr = p.pPr
+        style_id = pPr.style if pPr is not None else None
+        if style_cache is None:
+            style_cache = {}
+        style_flags = style_cache.get(style_id)
+        if style_flags is None:
+            try:
+                name = paragraph.style.name or ""
+            except Exception:
+                name = ""
+            style_flags = style_cache[style_id] = (name.startswith('Heading'), 'list' in name.lower())
+        is_heading_style, is_list_style = style_flags
+
+        # 1. Section Headers (bold is read from the first run only, and only when it matters)
+        short = len(text) < 50
+        if is_heading_style or (short and text.isupper()) or (short and p.r_lst and Run(p.r_lst[0], paragraph).bold):
+            kind = self.header_kind(text.lower())
+            if kind:
+                return f"{kind}_section_header", text
+
+        # 2. Bullets: XML numbering, list styles, or common bullet characters
+        try:
+            has_numbering = pPr is not None and pPr.numPr is not None
+        except Exception:
+            has_numbering = False
+        if has_numbering or is_list_style or text.startswith(BULLET_CHARACTERS):
+            return "bullet", text
+
+        # 3. Entry Headers (everything else inside Experience that isn't a bullet/section header)
+        return "text", text
+
+    def classify_document(self, doc) -> list[tuple[str, str]]:
+        """ Classifies every body paragraph of a python-docx Document with a shared style cache. """
+        style_cache = {}
+        return [self.classify(paragraph, style_cache) for paragraph in doc.paragraphs]
+
+
+def load_vocabulary(locales=None, path: str = None) -> dict[str, list[str]]:
+    """
+    Merges header vocabularies: English, then each requested locale, then a user-supplied
+    JSON file of the form {"experience": [...], "summary": [...], "stop": [...]}.
+    """
+    vocabulary = {kind: list(LOCALE_VOCABULARIES["en"][kind]) for kind in SECTION_KINDS}
+    for locale in locales or []:
+        if locale not in LOCALE_VOCABULARIES:
+            print(f"DEBUG: Unknown header locale '{locale}', skipped")
+            continue
+        for kind in SECTION_KINDS:
+            vocabulary[kind].extend(LOCALE_VOCABULARIES[locale][kind])
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            custom = json.load(f)
+        for kind in SECTION_KINDS:
+            vocabulary[kind].extend(custom.get(kind, []))
+    return vocabulary
+
+
+_classifier = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> SectionClassifier:
+    """
+    Returns the process-wide classifier. Configured through environment variables:
+      RESUME_HEADER_LOCALES     extra built-in vocabularies, e.g. "de,fr" (English is always on)
+      RESUME_HEADER_VOCAB_PATH  JSON file with additional header terms per section kind
+    """
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            locales = [l.strip() for l in os.getenv("RESUME_HEADER_LOCALES", "").split(",") if l.strip()]
+            _classifier = SectionClassifier(load_vocabulary(locales, os.getenv("RESUME_HEADER_VOCAB_PATH")))
+        return _classifier
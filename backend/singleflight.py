@@ -0,0 +1,115 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# How long a completed response stays replayable for its Idempotency-Key
+DEFAULT_IDEMPOTENCY_WINDOW_SECONDS = 600
+DEFAULT_IDEMPOTENCY_MAX_ENTRIES = 1000
+
+
+def request_fingerprint(endpoint: str, payload: dict) -> str:
+    """ Hashes an endpoint and its request body; identical requests get identical fingerprints. """
+    raw = json.dumps({"endpoint": endpoint, "payload": payload}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight computation.
+    The first caller starts the work as a task; callers arriving while it runs await the
+    same task and receive its result (or exception). The task is shielded, so a caller that
+    disconnects doesn't cancel the work the others are waiting on.
+    """
+
+    def __init__(self):
+        self._in_flight: dict[str, asyncio.Task] = {}
+        self.started = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, coro_fn):
+        """ Runs coro_fn() for key unless an identical call is already running, then shares its result. """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda finished: self._forget(key, finished))
+            self.started += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception as retrieved if every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._in_flight), "started": self.started, "coalesced": self.coalesced}
+
+
+class IdempotencyStore:
+    """
+    Remembers completed responses by Idempotency-Key for a time window so client retries
+    are answered with the original response instead of repeating the work.
+    Entries are bounded in number and evicted oldest first.
+    """
+
+    def __init__(self, window_seconds: int = DEFAULT_IDEMPOTENCY_WINDOW_SECONDS,
+                 max_entries: int = DEFAULT_IDEMPOTENCY_MAX_ENTRIES):
+        self.window_seconds = window_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def get(self, key: str):
+        """ Returns (fingerprint, response) for a live key, or None. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, fingerprint, response = entry
+            if time.time() - stored_at > self.window_seconds:
+                del self._entries[key]
+                return None
+            self.hits += 1
+            return fingerprint, response
+
+    def set(self, key: str, fingerprint: str, response):
+        with self._lock:
+            self._entries[key] = (time.time(), fingerprint, response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "window_seconds": self.window_seconds}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """
+    Returns the process-wide idempotency store. Configured through environment variables:
+      IDEMPOTENCY_WINDOW_SECONDS  how long completed responses are replayed
+      IDEMPOTENCY_MAX_ENTRIES     how many keys are remembered
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = IdempotencyStore(
+                window_seconds=int(os.getenv("IDEMPOTENCY_WINDOW_SECONDS", DEFAULT_IDEMPOTENCY_WINDOW_SECONDS)),
+                max_entries=int(os.getenv("IDEMPOTENCY_MAX_ENTRIES", DEFAULT_IDEMPOTENCY_MAX_ENTRIES)),
+            )
+        return _store
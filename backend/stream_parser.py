@@ -0,0 +1,141 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+
+
+class IncrementalPlanParser:
+    """
+    Incrementally scans a streamed JSON object and reports values as soon as they are complete.
+
+    Emits:
+      ("member", key, value)        when a top-level member's value is complete
+      ("item", key, index, value)   when an element of a top-level array in array_keys is complete
+
+    Anything before the first '{' (e.g. a ```json fence) and after the closing '}' is ignored.
+    """
+
+    def __init__(self, array_keys=("entries",)):
+        self.array_keys = set(array_keys)
+        self.buffer = ""
+        self.pos = 0
+        self.stack = []            # open containers: '{' or '['
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+        self.member_state = None   # "key" | "colon" | "value" | "after" while inside the top-level object
+        self.key = None
+        self.value_start = None
+        self.item_start = None
+        self.item_index = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> list[tuple]:
+        """ Appends a chunk of model output and returns the events it completed. """
+        self.buffer += chunk
+        events = []
+        buf = self.buffer
+        i = self.pos
+        while i < len(buf) and not self.done:
+            c = buf[i]
+            depth = len(self.stack)
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif c == "\\":
+                    self.escape = True
+                elif c == '"':
+                    self.in_string = False
+                    self._on_string_end(i, events)
+                i += 1
+                continue
+
+            if depth == 0:
+                if c == "{":
+                    self.stack.append("{")
+                    self.member_state = "key"
+                i += 1
+                continue
+
+            if c.isspace():
+                i += 1
+                continue
+
+            if depth == 1 and self.member_state == "value" and self.value_start is None:
+                self.value_start = i
+            if depth == 2 and self._in_tracked_array() and self.item_start is None and c not in ",]":
+                self.item_start = i
+
+            if c == '"':
+                self.in_string = True
+                self.string_start = i
+            elif c in "{[":
+                self.stack.append(c)
+            elif c in "}]":
+                if depth == 1:
+                    self._finish_primitive(i, events)
+                    self.done = True
+                else:
+                    if depth == 2 and self._in_tracked_array() and self.item_start is not None:
+                        # Last primitive element, terminated by the array's ']' rather than ','
+                        self._emit_item(buf[self.item_start:i], events)
+                    self.stack.pop()
+                    self._on_container_end(i, events)
+            elif c == ":" and depth == 1 and self.member_state == "colon":
+                self.member_state = "value"
+                self.value_start = None
+            elif c == ",":
+                if depth == 1:
+                    self._finish_primitive(i, events)
+                    self.member_state = "key"
+                elif depth == 2 and self._in_tracked_array() and self.item_start is not None:
+                    # Primitive array element (numbers, literals)
+                    self._emit_item(buf[self.item_start:i], events)
+            i += 1
+
+        self.pos = i
+        return events
+
+    def _in_tracked_array(self) -> bool:
+        return len(self.stack) == 2 and self.stack[1] == "[" and self.key in self.array_keys
+
+    def _on_string_end(self, i: int, events: list):
+        depth = len(self.stack)
+        if depth == 1:
+            if self.member_state == "key":
+                self.key = json.loads(self.buffer[self.string_start:i + 1])
+                self.member_state = "colon"
+            elif self.member_state == "value":
+                self._emit_member(self.buffer[self.value_start:i + 1], events)
+        elif depth == 2 and self._in_tracked_array() and self.item_start == self.string_start:
+            self._emit_item(self.buffer[self.item_start:i + 1], events)
+
+    def _on_container_end(self, i: int, events: list):
+        depth = len(self.stack)
+        if depth == 1 and self.member_state == "value":
+            self._emit_member(self.buffer[self.value_start:i + 1], events)
+        elif depth == 2 and self._in_tracked_array() and self.item_start is not None:
+            self._emit_item(self.buffer[self.item_start:i + 1], events)
+
+    def _finish_primitive(self, i: int, events: list):
+        """ Emits a number/boolean/null member terminated by ',' or '}'. """
+        if self.member_state == "value" and self.value_start is not None:
+            self._emit_member(self.buffer[self.value_start:i].strip(), events)
+
+    def _emit_member(self, raw: str, events: list):
+        self.member_state = "after"
+        self.value_start = None
+        self.item_start = None
+        self.item_index = 0
+        try:
+            events.append(("member", self.key, json.loads(raw)))
+        except ValueError:
+            pass
+
+    def _emit_item(self, raw: str, events: list):
+        self.item_start = None
+        try:
+            events.append(("item", self.key, self.item_index, json.loads(raw.strip())))
+        except ValueError:
+            pass
+        self.item_index += 1
@@ -0,0 +1,271 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .docx_stream_renderer import DocxTemplate, Rendition
+except ImportError:
+    from docx_stream_renderer import DocxTemplate, Rendition
+
+DEFAULT_TEMPLATE_CACHE_MAX_MB = 128
+DEFAULT_RENDITION_CACHE_SIZE = 256
+MAX_HASHED_FILES = 1024
+
+
+class TemplateCache:
+    """
+    Bounded in-process cache of parsed resume templates (see DocxTemplate), keyed by
+    resume id and content hash, so rendering many variants of one resume parses it once.
+    Eviction is least-recently-used against a memory budget (each template's estimated
+    footprint), shared with the renditions made from cached templates (see RenditionCache):
+    evicting a template drops its renditions. Concurrent misses for the same key wait for
+    a single parse.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversized = 0
+        self.renditions = None # RenditionCache charged against this budget
+
+    def _lookup(self, key):
+        template = self._entries.get(key)
+        if template is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return template
+
+    def get(self, key, loader):
+        """ Returns the cached template for key, calling loader() to parse it on a miss. """
+        with self._lock:
+            template = self._lookup(key)
+            if template is not None:
+                return template
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                template = self._lookup(key)
+                if template is not None:
+                    return template
+                self.misses += 1
+            try:
+                template = loader()
+                self._put(key, template)
+            finally:
+                with self._lock:
+                    self._loading.pop(key, None)
+        return template
+
+    def _put(self, key, template):
+        with self._lock:
+            if template.nbytes > self.max_bytes:
+                # Rendered from once, but never worth evicting everything else for
+                self.oversized += 1
+                return
+            self._entries[key] = template
+            self.bytes += template.nbytes
+            self._shrink()
+
+    def _holds(self, template) -> bool:
+        return any(cached is template for cached in self._entries.values())
+
+    def _shrink(self):
+        """ Evicts least recently used templates, with their renditions, until within budget. Caller holds the lock. """
+        while self.bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self.evictions += 1
+            if self.renditions is not None:
+                self.renditions._drop_template(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "oversized": self.oversized,
+            }
+
+
+class RenditionCache:
+    """
+    The last rendition (see Rendition) of each (job, resume), so regenerating after a
+    small edit to the approved plan patches only the paragraphs whose text changed instead
+    of rendering the whole document again. A rendition pins its template, so only
+    renditions of templates held by the template cache are kept: their own bytes count
+    against its memory budget, and they go when their template is evicted. Also bounded
+    by entry count, least recently used first; a rendition only counts if it was made from
+    the template currently in use.
+    """
+
+    def __init__(self, templates: TemplateCache, max_entries: int):
+        self.templates = templates
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # One lock for both caches: template eviction drops renditions and vice versa
+        self._lock = templates._lock
+        templates.renditions = self
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.patched_paragraphs = 0
+
+    def get(self, key, template: DocxTemplate):
+        """ Returns the last rendition for key if it was rendered from template, else None. """
+        with self._lock:
+            rendition = self._entries.get(key)
+            if rendition is not None and rendition.template is template:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return rendition
+            # Rendered from an older upload or an evicted parse: no longer a valid base
+            self._discard(key)
+            self.misses += 1
+            return None
+
+    def put(self, key, rendition: Rendition, patched: bool = False):
+        with self._lock:
+            self._discard(key)
+            if patched:
+                self.patched_paragraphs += rendition.changed
+            if not self.templates._holds(rendition.template):
+                # Rendered from an uncached (oversized) template: could never be reused
+                return
+            self._entries[key] = rendition
+            self.bytes += rendition.nbytes
+            self.templates.bytes += rendition.nbytes
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+            self.templates._shrink()
+
+    def _discard(self, key):
+        """ Forgets a rendition and releases its bytes. Caller holds the lock. """
+        rendition = self._entries.pop(key, None)
+        if rendition is not None:
+            self.bytes -= rendition.nbytes
+            self.templates.bytes -= rendition.nbytes
+
+    def _drop_template(self, template):
+        """ Forgets the renditions of an evicted template. Caller holds the lock. """
+        for key in [key for key, rendition in self._entries.items() if rendition.template is template]:
+            self._discard(key)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "patched_paragraphs": self.patched_paragraphs,
+            }
+
+
+_hashes = OrderedDict()
+_hashes_lock = threading.Lock()
+
+
+def file_content_hash(path: str) -> str:
+    """
+    SHA-256 of a file's contents. Remembered per (path, size, mtime), so repeated renders
+    from an unchanged upload don't re-read it just to build the cache key.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    with _hashes_lock:
+        known = _hashes.get(path)
+        if known and known[0] == signature:
+            _hashes.move_to_end(path)
+            return known[1]
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    with _hashes_lock:
+        _hashes[path] = (signature, digest)
+        _hashes.move_to_end(path)
+        while len(_hashes) > MAX_HASHED_FILES:
+            _hashes.popitem(last=False)
+    return digest
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_template_cache():
+    """
+    Returns the process-wide template cache, or None when disabled. Configured through
+    environment variables:
+      TEMPLATE_CACHE_MAX_MB  memory budget for parsed templates and their renditions (0 disables the cache)
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_mb = float(os.getenv("TEMPLATE_CACHE_MAX_MB", DEFAULT_TEMPLATE_CACHE_MAX_MB))
+            if max_mb <= 0:
+                return None
+            _cache = TemplateCache(int(max_mb * 1024 * 1024))
+        return _cache
+
+
+_renditions = None
+_renditions_lock = threading.Lock()
+
+
+def get_rendition_cache():
+    """
+    Returns the process-wide rendition cache, or None when disabled (renditions are only
+    reusable with the template cache enabled). Configured through environment variables:
+      RENDITION_CACHE_SIZE  number of (job, resume) renditions kept for incremental re-renders (0 disables)
+    Their memory counts against TEMPLATE_CACHE_MAX_MB.
+    """
+    global _renditions
+    with _renditions_lock:
+        if _renditions is None:
+            size = int(os.getenv("RENDITION_CACHE_SIZE", DEFAULT_RENDITION_CACHE_SIZE))
+            templates = get_template_cache()
+            if size <= 0 or templates is None:
+                return None
+            _renditions = RenditionCache(templates, size)
+        return _renditions
+
+
+def get_template(source, resume_id=None, content_hash: str = None) -> DocxTemplate:
+    """
+    Returns the parsed template for a resume (a file path or an in-memory binary file), from
+    the cache when possible. Templates are keyed by resume id (or the path when there is
+    none) and content hash, so a re-uploaded file under the same id is parsed afresh.
+    """
+    cache = get_template_cache()
+    if cache is None:
+        return DocxTemplate(source)
+    if isinstance(source, str):
+        content_hash = content_hash or file_content_hash(source)
+        owner = resume_id if resume_id is not None else source
+    else:
+        content_hash = content_hash or hashlib.sha256(source.getbuffer()).hexdigest()
+        owner = resume_id
+    return cache.get((owner, content_hash), lambda: DocxTemplate(source))
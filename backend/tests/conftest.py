@@ -0,0 +1,110 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+import pytest
+from docx import Document
+
+# Several modules write next to the working directory (./resume_generator.db, ./uploads,
+# ./llm_cache.db ...), so the suite runs from a scratch directory. The defaults keep every
+# model call on the deterministic fake and every cache out of the way unless a test opts in.
+_workdir = tempfile.mkdtemp(prefix="resume-tests-")
+os.chdir(_workdir)
+
+for _name, _value in {
+    "LLM_PROVIDER": "fake",
+    "LLM_FAKE_LATENCY": "fixed:0",
+    "LLM_CACHE_BACKEND": "none",
+    "LLM_SCHEDULER_STORE": "memory",
+    "GEMINI_RPM": "100000",
+    "GEMINI_TPM": "100000000",
+    "PARSE_WORKERS": "0",
+    "AWS_DEFAULT_REGION": "us-east-1", # the Lambda modules create their boto3 clients at import
+    "ARTIFACT_STORE_DIR": os.path.join(_workdir, "generated"),
+}.items():
+    os.environ.setdefault(_name, _value)
+
+_ids = itertools.count(1)
+
+JOB_DESCRIPTION = (
+    "Senior Backend Engineer at Initech, building Python services on Kubernetes "
+    "and owning their reliability. Requirements: five years of Python, PostgreSQL and AWS."
+)
+
+
+def build_resume_docx(path: str, name: str = "Jane Doe", entries: int = 2) -> str:
+    """ Writes a small resume the section classifier understands: summary, experience, education. """
+    doc = Document()
+    doc.add_paragraph(name)
+    doc.add_paragraph("PROFESSIONAL SUMMARY")
+    doc.add_paragraph("Backend engineer with eight years of experience building services.")
+    doc.add_paragraph("PROFESSIONAL EXPERIENCE")
+    for i in range(entries):
+        doc.add_paragraph(f"Engineer {i} | Company {i} | {2010 + i} - {2011 + i}")
+        doc.add_paragraph(f"Built service {i} in Python", style="List Bullet")
+        doc.add_paragraph(f"Cut the costs of team {i} by {10 + i}%", style="List Bullet")
+    doc.add_paragraph("EDUCATION")
+    doc.add_paragraph("BSc Computer Science")
+    doc.save(path)
+    return path
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from ..main import app
+    return TestClient(app)
+
+
+@pytest.fixture
+def db():
+    from ..database import SessionLocal, engine
+    from ..models import Base
+    # Tests that don't import the app still need its tables
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def make_resume(db, tmp_path):
+    """ Stores an indexed DOCX resume row (each one unique, so content hashes never collide). """
+    from ..models import Resume
+    from ..resume_index import build_resume_index
+
+    def make(entries: int = 2) -> Resume:
+        n = next(_ids)
+        path = build_resume_docx(str(tmp_path / f"resume-{n}.docx"), name=f"Jane Doe {n}", entries=entries)
+        with open(path, "rb") as f:
+            content_hash = hashlib.sha256(f.read()).hexdigest()
+        resume = Resume(filename=f"resume-{n}.docx", content="", original_path=path, content_hash=content_hash,
+                        structure_index=json.dumps(build_resume_index(path)))
+        db.add(resume)
+        db.commit()
+        return resume
+    return make
+
+
+@pytest.fixture
+def make_job(db):
+    """ Stores a job post with a unique URL. """
+    from ..models import JobPost
+
+    def make(description: str = JOB_DESCRIPTION, company_name: str = None, **fields) -> JobPost:
+        job = JobPost(url=f"https://jobs.example.com/{next(_ids)}", description=description,
+                      company_name=company_name, **fields)
+        db.add(job)
+        db.commit()
+        return job
+    return make
+
+
+@pytest.fixture
+def fake_provider():
+    """ The process-wide fake model; its call counter shows whether a request reached the model. """
+    from ..llm_providers import _get_fake_provider
+    return _get_fake_provider()
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import hashlib
+import os
+from email.utils import formatdate
+import pytest
+
+from .. import artifact_store
+from ..artifact_store import ArtifactStore, artifact_key
+
+PLAN = {"company_name": "Initech", "summary": {"optimized": "Better"}, "experience_entries": []}
+
+
+def test_artifact_key_ignores_volatile_plan_fields():
+    key = artifact_key("resume-hash", "JD", PLAN, "template")
+    assert artifact_key("resume-hash", "JD", {**PLAN, "plan_id": 7, "jd_compaction": {"dropped_sections": []}}, "template") == key
+    assert len({key, artifact_key("other", "JD", PLAN, "template"), artifact_key("resume-hash", "JD 2", PLAN, "template"),
+                artifact_key("resume-hash", "JD", {**PLAN, "company_name": "Globex"}, "template"),
+                artifact_key("resume-hash", "JD", PLAN, "stream")}) == 5
+
+
+def test_put_then_get(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=1024)
+    assert store.get("k1") is None
+    meta = store.put("k1", b"docx bytes", "resume.docx")
+    assert meta["etag"] == f'"{hashlib.sha256(b"docx bytes").hexdigest()}"' and meta["size"] == 10
+    found = store.get("k1")
+    assert found["path"] == os.path.join(str(tmp_path), "k1", "resume.docx") and found["etag"] == meta["etag"]
+    assert store.stats()["hits"] == 1 and store.stats()["misses"] == 1
+
+
+def test_incomplete_artifacts_are_invisible(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=1024)
+    store.put("k1", b"docx", "resume.docx")
+    os.remove(os.path.join(str(tmp_path), "k1", "resume.docx"))
+    os.makedirs(os.path.join(str(tmp_path), "k2"))
+    assert store.get("k1") is None and store.get("k2") is None
+
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(artifact_store.time, "time", lambda: now[0])
+    store = ArtifactStore(str(tmp_path), max_bytes=25)
+    for key in ("a", "b"):
+        store.put(key, b"x" * 10, "resume.docx")
+        now[0] += 1
+    store.get("a")
+    now[0] += 1
+    store.put("c", b"x" * 10, "resume.docx")
+    assert store.get("b") is None and not os.path.exists(os.path.join(str(tmp_path), "b"))
+    assert store.get("a") and store.get("c")
+    # A new process rebuilds the sizes from disk
+    assert ArtifactStore(str(tmp_path), max_bytes=25).stats()["bytes"] == 20
+
+
+@pytest.fixture
+def generated(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    body = {"job_id": job.id, "resume_id": resume.id}
+    first = client.post("/generate-resume", json=body).json()
+    return body, first
+
+
+def test_identical_generations_reuse_the_artifact(client, generated, fake_provider):
+    body, first = generated
+    calls = fake_provider.calls
+    second = client.post("/generate-resume", json=body).json()
+    assert (first["artifact_source"], second["artifact_source"]) == ("rendered", "cached")
+    assert second["download_url"] == first["download_url"] and fake_provider.calls == calls
+
+
+def test_downloads_are_conditional(client, generated):
+    url = generated[1]["download_url"]
+    response = client.get(url)
+    etag, last_modified = response.headers["etag"], response.headers["last-modified"]
+    assert response.headers["cache-control"] == "public, max-age=31536000, immutable"
+    assert response.headers["accept-ranges"] == "bytes"
+
+    for validators in ({"If-None-Match": etag}, {"If-None-Match": f'"other", W/{etag}'}, {"If-None-Match": "*"},
+                       {"If-Modified-Since": last_modified}):
+        not_modified = client.get(url, headers=validators)
+        assert not_modified.status_code == 304 and not_modified.content == b""
+        assert not_modified.headers["etag"] == etag
+    # If-None-Match takes precedence over If-Modified-Since
+    assert client.get(url, headers={"If-None-Match": '"other"', "If-Modified-Since": last_modified}).status_code == 200
+    assert client.get(url, headers={"If-Modified-Since": formatdate(0, usegmt=True)}).status_code == 200
+
+    partial = client.get(url, headers={"Range": "bytes=0-9"})
+    assert partial.status_code == 206 and partial.content == response.content[:10]
+    head = client.head(url)
+    assert head.status_code == 200 and head.headers["etag"] == etag and head.content == b""
+
+
+def test_downloads_reject_unknown_names(client, generated):
+    url = generated[1]["download_url"]
+    token = url.split("/")[2]
+    assert client.get(f"/download-resume/{token}/other.docx").status_code == 404
+    assert client.get(f"/download-resume/{'0' * 64}/resume.docx").status_code == 404
+    assert client.get(f"/download-resume/not-a-token/resume.docx").status_code == 404
+    assert client.get(f"/download-resume/{token}/..%2F..%2Fresume_generator.db").status_code == 404
+
+
+def test_legacy_files_are_revalidated(client):
+    os.makedirs("backend/generated", exist_ok=True)
+    with open("backend/generated/old_resume.docx", "wb") as f:
+        f.write(b"legacy document")
+    response = client.get("/download-resume/old_resume.docx")
+    assert response.status_code == 200 and response.headers["cache-control"] == "no-cache"
+    assert client.get("/download-resume/old_resume.docx", headers={"If-None-Match": response.headers["etag"]}).status_code == 304
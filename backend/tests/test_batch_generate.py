@@ -0,0 +1,63 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import io
+import json
+import zipfile
+
+from .. import main
+
+OTHER_JD = "Data Engineer at Globex, building Spark pipelines. Requirements: SQL, Airflow and Scala."
+
+
+def _archive(response) -> zipfile.ZipFile:
+    assert response.status_code == 200 and response.headers["content-type"] == "application/zip"
+    return zipfile.ZipFile(io.BytesIO(response.content))
+
+
+def test_batch_zips_a_document_per_job(client, make_job, make_resume):
+    resume = make_resume()
+    jobs = [make_job(), make_job(description=OTHER_JD), make_job()]
+    response = client.post("/batch-generate", json={"resume_id": resume.id, "job_ids": [job.id for job in jobs] + [jobs[0].id]})
+    archive = _archive(response)
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest["resume_id"] == resume.id
+    # Duplicates are dropped and the manifest keeps request order, whatever order jobs finished in
+    assert [entry["job_id"] for entry in manifest["jobs"]] == [job.id for job in jobs]
+    assert {entry["status"] for entry in manifest["jobs"]} == {"ok"}
+    names = [entry["filename"] for entry in manifest["jobs"]]
+    assert sorted(archive.namelist()) == sorted(names + ["manifest.json"])
+    for name in names:
+        assert archive.read(name)[:2] == b"PK"
+    assert archive.getinfo(names[0]).compress_type == zipfile.ZIP_STORED
+
+
+def test_failed_jobs_are_reported_in_the_manifest(client, make_job, make_resume):
+    resume, job = make_resume(), make_job()
+    response = client.post("/batch-generate", json={"resume_id": resume.id, "job_ids": [999999, job.id], "urls": ["not a url"]})
+    archive = _archive(response)
+    entries = json.loads(archive.read("manifest.json"))["jobs"]
+    assert [entry["status"] for entry in entries] == ["error", "ok", "error"]
+    assert entries[0]["error"] and entries[2]["error"] == "Please enter valid URL"
+    assert archive.namelist() == [entries[1]["filename"], "manifest.json"]
+
+
+def test_batch_urls_are_scraped_and_stored(client, make_job, make_resume, monkeypatch):
+    resume, job = make_resume(), make_job()
+    seen = []
+
+    def refresh(session, url):
+        seen.append(url)
+        return session.get(type(job), job.id), False
+    monkeypatch.setattr(main, "_refresh_job", refresh)
+    response = client.post("/batch-generate", json={"resume_id": resume.id, "urls": ["https://www.linkedin.com/jobs/view/42?utm_source=x"]})
+    entries = json.loads(_archive(response).read("manifest.json"))["jobs"]
+    assert entries[0]["status"] == "ok" and entries[0]["job_id"] == job.id
+    assert seen == [entries[0]["url"]] == ["https://www.linkedin.com/jobs/view/42"]
+
+
+def test_batch_requests_are_validated(client, make_resume, monkeypatch):
+    resume = make_resume()
+    assert client.post("/batch-generate", json={"resume_id": resume.id}).status_code == 422
+    assert client.post("/batch-generate", json={"resume_id": 999999, "job_ids": [1]}).status_code == 404
+    monkeypatch.setattr(main, "BATCH_MAX_JOBS", 2)
+    assert client.post("/batch-generate", json={"resume_id": resume.id, "job_ids": [1, 2, 3]}).status_code == 422
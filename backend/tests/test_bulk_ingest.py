@@ -0,0 +1,154 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import itertools
+import json
+import threading
+from datetime import datetime, timezone
+import pytest
+
+from .. import bulk_ingest
+from ..bulk_ingest import HostLimiter, _backoff, ingest_urls
+from ..job_cache import description_hash, is_fresh
+from ..models import JobPost
+
+_ids = itertools.count(1)
+
+
+def _urls(count: int, host: str = "www.linkedin.com") -> list:
+    return [f"https://{host}/jobs/view/ingest-{next(_ids)}" for _ in range(count)]
+
+
+class FakeRefresh:
+    """ Stands in for refresh_job_posting: scripted scrape outcomes per URL, "new" by default. """
+
+    def __init__(self, scripts: dict = None):
+        self.scripts = scripts or {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url, stored=None, now=None):
+        if stored and stored.get("description") and is_fresh(stored.get("fetched_at")):
+            return {"status": "fresh", "fields": {}}
+        with self._lock:
+            self.calls.append(url)
+            script = self.scripts.get(url)
+            outcome = script.pop(0) if script else "new"
+        if outcome == "new":
+            description = f"Engineer role posted at {url}"
+            return {"status": "new", "fields": {"description": description, "content_hash": description_hash(description),
+                                                "fetched_at": datetime.now(timezone.utc), "company_name": "Initech"}}
+        return {"status": "failed", "fields": {}, "error": "503 Service Unavailable", "retryable": outcome == "retry", "retry_after": None}
+
+
+@pytest.fixture
+def refresh(db, monkeypatch):
+    fake = FakeRefresh()
+    monkeypatch.setattr(bulk_ingest, "refresh_job_posting", fake)
+    return fake
+
+
+def _collect(urls, **options) -> list:
+    async def run():
+        return [event async for event in ingest_urls(urls, **{"host_interval": 0.0, "retry_base": 0.001, **options})]
+    return asyncio.run(run())
+
+
+def test_events_cover_every_input_url(refresh, db):
+    urls = _urls(3)
+    events = _collect([urls[0], urls[1] + "?utm_source=feed", "https://example.org/not-a-job", urls[2], urls[0] + "#apply"])
+    start, done, per_url = events[0], events[-1], events[1:-1]
+    assert start == {"event": "start", "total": 5, "unique": 3, "invalid": 1, "duplicates": 1}
+    assert [event["done"] for event in per_url] == [1, 2, 3, 4, 5]
+    assert done["statuses"] == {"invalid": 1, "duplicate": 1, "new": 3}
+    duplicate = next(event for event in per_url if event["status"] == "duplicate")
+    assert duplicate["duplicate_of"] == urls[0]
+    # Tracking parameters are dropped before storing, but events echo the URL as given
+    ingested = {event["url"]: event["job_id"] for event in per_url if event["status"] == "new"}
+    assert set(ingested) == {urls[0], urls[1] + "?utm_source=feed", urls[2]}
+    assert db.get(JobPost, ingested[urls[1] + "?utm_source=feed"]).url == urls[1]
+
+
+def test_transient_failures_are_retried(refresh):
+    retried, broken, gone = _urls(3)
+    refresh.scripts.update({retried: ["retry", "retry", "new"], broken: ["retry"] * 5, gone: ["failed"]})
+    events = {event["url"]: event for event in _collect([retried, broken, gone], max_attempts=3)[1:-1]}
+    assert (events[retried]["status"], events[retried]["attempts"]) == ("new", 3)
+    assert (events[broken]["status"], events[broken]["attempts"]) == ("failed", 3)
+    assert events[broken]["error"] == "503 Service Unavailable" and events[broken]["job_id"] is None
+    assert events[gone]["attempts"] == 1
+
+
+def test_stored_fresh_postings_are_not_rescraped(refresh):
+    url = _urls(1)[0]
+    first = _collect([url])[1]
+    assert len(refresh.calls) == 1
+    second = _collect([url])[1]
+    assert second["status"] == "fresh" and second["job_id"] == first["job_id"] and second["attempts"] == 0
+    assert len(refresh.calls) == 1
+
+
+def test_results_are_committed_in_batches(refresh, monkeypatch):
+    batches = []
+    store = bulk_ingest._store_outcomes
+    monkeypatch.setattr(bulk_ingest, "_store_outcomes", lambda outcomes: batches.append(len(outcomes)) or store(outcomes))
+    events = _collect(_urls(7), commit_batch=3, commit_interval=5.0)
+    assert batches == [3, 3, 1]
+    assert events[-1]["statuses"] == {"new": 7}
+
+
+def test_a_batch_that_cannot_be_stored_fails_only_its_urls(refresh, db, monkeypatch):
+    urls = _urls(7)
+    index = bulk_ingest.index_job_post
+
+    def failing_index(session, job):
+        if job.url == urls[4]:
+            raise RuntimeError("database is locked")
+        return index(session, job)
+    monkeypatch.setattr(bulk_ingest, "index_job_post", failing_index)
+    events = _collect(urls, concurrency=1, commit_batch=3, commit_interval=5.0)
+    per_url = {event["url"]: event for event in events[1:-1]}
+    failed = [url for url in urls if per_url[url]["status"] == "failed"]
+    assert urls[4] in failed and len(failed) == 3
+    assert all("database is locked" in per_url[url]["error"] and per_url[url]["job_id"] is None for url in failed)
+    assert events[-1]["event"] == "done" and events[-1]["statuses"] == {"new": 4, "failed": 3}
+    stored = {job.url for job in db.query(JobPost).filter(JobPost.url.in_(urls))}
+    assert stored == set(urls) - set(failed)
+
+
+def test_host_limiter_bounds_concurrency_and_spaces_starts():
+    async def run():
+        limiter = HostLimiter(concurrency=2, interval=0.02)
+        loop = asyncio.get_running_loop()
+        starts, active, peak = [], [0], [0]
+
+        async def request(host):
+            async with limiter.slot(host):
+                starts.append((host, loop.time()))
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+                await asyncio.sleep(0.05)
+                active[0] -= 1
+        await asyncio.gather(*(request("a") for _ in range(4)), request("b"))
+        return starts, peak[0]
+
+    starts, peak = asyncio.run(run())
+    a_starts = [at for host, at in starts if host == "a"]
+    assert peak <= 3 # two for host a, one for host b
+    assert all(later - earlier >= 0.019 for earlier, later in zip(a_starts, a_starts[1:]))
+    # Another host doesn't wait behind host a
+    assert dict(starts)["b"] - a_starts[0] < 0.02
+
+
+def test_backoff_is_jittered_and_honours_retry_after():
+    assert all(0 <= _backoff(3, 1.0) <= 4.0 for _ in range(100))
+    assert _backoff(1, 0.001, retry_after=5.0) == 5.0
+    assert _backoff(1, 0.001, retry_after=3600.0) == bulk_ingest.MAX_RETRY_AFTER_SECONDS
+
+
+def test_ingest_endpoint_streams_ndjson(client, refresh):
+    assert client.post("/ingest-urls", json={"urls": []}).status_code == 422
+    response = client.post("/ingest-urls", json={"urls": _urls(2)})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == ["start", "url", "url", "done"]
@@ -0,0 +1,63 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import pytest
+
+from ..job_extractors import clean_company_name, company_from_slug, extract_job_posting
+from ..models import JobPost
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("  Acme\n Corp | ", "Acme Corp"),
+    ("Confidential", None),
+    ("company", None),
+    ("", None),
+    (None, None),
+    ({"name": "Acme"}, None),
+])
+def test_clean_company_name(name, expected):
+    assert clean_company_name(name) == expected
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://www.linkedin.com/jobs/view/senior-engineer-at-globex-corporation-4344831856/", "Globex Corporation"),
+    ("https://www.linkedin.com/company/initech/jobs", "Initech"),
+    ("https://www.linkedin.com/jobs/view/4344831856/", None),
+])
+def test_company_from_slug(url, expected):
+    assert company_from_slug(url) == expected
+
+
+@pytest.mark.parametrize("organization", ['{"@type": "Organization", "name": "Hooli"}', '[{"name": "Hooli"}]', '"Hooli"'])
+def test_company_from_json_ld_hiring_organization(organization):
+    page = ('<html><head><script type="application/ld+json">{"@type": "JobPosting", "title": "Engineer", '
+            f'"description": "<p>Build search.</p>", "hiringOrganization": {organization}}}</script></head></html>')
+    assert extract_job_posting(page.encode(), "https://careers.example.org/1")["company_name"] == "Hooli"
+
+
+def _generate(client, job, resume, company_name="Company") -> dict:
+    plan = client.post("/preview-optimization", json={"job_id": job.id, "resume_id": resume.id}).json()
+    plan["company_name"] = company_name
+    response = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id, "approved_plan": plan})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_scraped_company_names_the_document_without_a_model_call(client, make_job, make_resume, fake_provider):
+    job, resume = make_job(company_name="Globex"), make_resume()
+    calls = fake_provider.calls
+    result = _generate(client, job, resume)
+    assert result["filename"].endswith("_Optimized_Globex.docx")
+    assert fake_provider.calls == calls + 1 # the preview only
+
+
+def test_model_fallback_runs_once_and_is_remembered(client, db, make_job, make_resume, fake_provider):
+    job, resume = make_job(description="Staff engineer at Hooli, working on search ranking."), make_resume()
+    calls = fake_provider.calls
+    assert _generate(client, job, resume)["filename"].endswith("_Optimized_Hooli.docx")
+    assert fake_provider.calls == calls + 2 # the preview and the company lookup
+    db.expire_all()
+    assert db.query(JobPost).filter(JobPost.id == job.id).one().company_name == "Hooli"
+
+    calls = fake_provider.calls
+    assert _generate(client, job, resume)["filename"].endswith("_Optimized_Hooli.docx")
+    assert fake_provider.calls == calls + 1
@@ -0,0 +1,108 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import io
+import zipfile
+import pytest
+from docx import Document
+from lxml import etree
+
+from .. import resume_generator
+from ..docx_stream_renderer import DOCUMENT_PART, StaleIndexError, render_docx
+from ..resume_generator import apply_edits, render_resume
+from ..resume_index import build_resume_index
+from .conftest import build_resume_docx
+
+
+def build_resume(bullets: int = 6) -> bytes:
+    """ A small resume with formatted runs, a table, list bullets and a header part. """
+    doc = Document()
+    doc.add_heading("Jane Doe", level=1)
+    summary = doc.add_paragraph("Summary: ")
+    summary.add_run("distributed systems").bold = True
+    doc.add_table(rows=1, cols=2).cell(0, 0).text = "Table cell paragraphs are not body paragraphs"
+    doc.add_heading("Professional Experience", level=1)
+    for i in range(bullets):
+        doc.add_paragraph(f"Bullet {i}: reduced latency & cost by <{i}%>", style="List Bullet")
+    doc.sections[0].header.paragraphs[0].text = "Header"
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+def render_with_python_docx(original: bytes, edits: dict) -> bytes:
+    doc = Document(io.BytesIO(original))
+    apply_edits(doc, edits)
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+
+def render_with_stream(original: bytes, edits: dict) -> bytes:
+    output = io.BytesIO()
+    render_docx(io.BytesIO(original), edits, output)
+    return output.getvalue()
+
+
+def canonical_document(package: bytes) -> bytes:
+    """ C14N of word/document.xml: equal for documents that differ only in serialization details. """
+    return etree.tostring(etree.fromstring(zipfile.ZipFile(io.BytesIO(package)).read(DOCUMENT_PART)), method="c14n")
+
+
+def paragraph_texts(package: bytes) -> list:
+    return [p.text for p in Document(io.BytesIO(package)).paragraphs]
+
+
+EDIT_CASES = {
+    "none": {},
+    "rewrite formatted runs": {1: "Summary rewritten without formatting"},
+    "tabs, breaks and outer whitespace": {1: "Lead\twith tab\nand break\r\nand more", 4: "  spaced  "},
+    "delete": {2: None, 5: None},
+    "markup and unicode": {3: "Ünïcödé <b>not markup</b> & more"},
+    "mixed": {0: "John Doe", 2: "Experience", 3: None, 4: "\tIndented", 8: "Last bullet"},
+}
+
+
+@pytest.mark.parametrize("case", sorted(EDIT_CASES))
+def test_render_docx_matches_python_docx(case):
+    original = build_resume()
+    edits = EDIT_CASES[case]
+    streamed = render_with_stream(original, edits)
+    expected = render_with_python_docx(original, edits)
+    assert canonical_document(streamed) == canonical_document(expected)
+    assert paragraph_texts(streamed) == paragraph_texts(expected)
+
+
+def test_render_docx_copies_other_parts_unchanged():
+    original = build_resume()
+    streamed = render_with_stream(original, {1: "New summary"})
+    with zipfile.ZipFile(io.BytesIO(original)) as zin, zipfile.ZipFile(io.BytesIO(streamed)) as zout:
+        assert zout.testzip() is None
+        assert zout.namelist() == zin.namelist()
+        for name in zin.namelist():
+            if name != DOCUMENT_PART:
+                assert zout.read(name) == zin.read(name)
+
+
+def test_render_docx_rejects_stale_paragraph_count():
+    original = build_resume()
+    count = len(Document(io.BytesIO(original)).paragraphs)
+    assert render_docx(io.BytesIO(original), {}, io.BytesIO(), expected_paragraphs=count) == count
+    with pytest.raises(StaleIndexError):
+        render_docx(io.BytesIO(original), {}, io.BytesIO(), expected_paragraphs=count + 1)
+
+
+def test_render_resume_agrees_across_renderers(tmp_path, monkeypatch):
+    path = build_resume_docx(str(tmp_path / "resume.docx"))
+    plan = {"summary": {"optimized": "Rewritten summary"},
+            "experience_entries": [{"optimized_bullets": ["New bullet", "Another", "Extra line"]}, {"optimized_bullets": []}]}
+    # A stale index (e.g. from an older upload of the file) is rebuilt rather than misapplied
+    index = {**build_resume_index(path), "paragraph_count": 3}
+    rendered = {}
+    for renderer in ("python-docx", "stream", "template"):
+        monkeypatch.setattr(resume_generator, "DOCX_RENDERER", renderer)
+        output = io.BytesIO()
+        render_resume(path, index, plan, output)
+        rendered[renderer] = paragraph_texts(output.getvalue())
+    assert rendered["python-docx"] == rendered["stream"] == rendered["template"]
+    assert "Rewritten summary" in rendered["stream"] and "Another\nExtra line" in rendered["stream"]
+    assert "Built service 1 in Python" not in rendered["stream"]
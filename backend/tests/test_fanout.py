@@ -0,0 +1,96 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import threading
+import time
+
+from ..copilot import ResumeCopilot, chunk_entries, merge_fanout_results, should_fan_out
+from ..jd_compactor import estimate_tokens
+
+JD = "Senior Backend Engineer at Initech, building Python services on Kubernetes."
+
+
+def _entries(count: int, bullet_chars: int = 200) -> list[dict]:
+    return [{"header": f"Engineer {i} | Company {i}", "bullets": [f"{i}" * bullet_chars, f"Shipped project {i}"]}
+            for i in range(count)]
+
+
+def test_chunks_are_consecutive_and_within_budget():
+    entries = _entries(12)
+    chunks = chunk_entries(entries, token_budget=150)
+    assert [i for chunk in chunks for i, _ in chunk] == list(range(12))
+    for chunk in chunks:
+        sizes = [estimate_tokens(e["header"] + "\n".join(e["bullets"])) for _, e in chunk]
+        assert len(chunk) == 1 or sum(sizes) <= 150
+
+
+def test_oversized_entry_gets_its_own_chunk():
+    entries = _entries(1, 20) + _entries(1, 4000) + _entries(1, 20)
+    assert [[i for i, _ in chunk] for chunk in chunk_entries(entries, token_budget=100)] == [[0], [1], [2]]
+
+
+def test_short_resumes_are_not_fanned_out():
+    assert not should_fan_out(_entries(2), token_budget=1000)
+    assert should_fan_out(_entries(20), token_budget=1000)
+    assert not should_fan_out([], token_budget=1000)
+
+
+def test_merge_keeps_originals_for_failed_parts():
+    entries = _entries(3, 5)
+    chunks = chunk_entries(entries, token_budget=1)
+    ok = {"entries": [{"id": 0, "optimized_bullets": ["new 0"]}]}
+    result, complete = merge_fanout_results("summary", entries, {"company_name": "Initech", "summary": "better"},
+                                            [(chunks[0], ok), (chunks[1], None), (chunks[2], {"entries": ["junk"]})])
+    assert not complete
+    assert result["company_name"] == "Initech" and result["summary"] == "better"
+    assert [e["optimized_bullets"] for e in result["entries"]] == [["new 0"], entries[1]["bullets"], entries[2]["bullets"]]
+
+
+def test_merge_reports_complete_only_when_everything_answered():
+    entries = _entries(2, 5)
+    chunks = chunk_entries(entries, token_budget=1)
+    answers = [(chunk, {"entries": [{"id": i, "optimized_bullets": [f"new {i}"]}]}) for i, chunk in enumerate(chunks)]
+    assert merge_fanout_results("s", entries, {"summary": "better"}, answers)[1]
+    assert not merge_fanout_results("s", entries, None, answers)[1]
+    assert merge_fanout_results("s", entries, None, [(chunk, None) for chunk in chunks]) == (None, False)
+
+
+def _slow_copilot(monkeypatch, delay: float):
+    """ A copilot whose fake model takes `delay` seconds per call and records peak concurrency. """
+    assistant = ResumeCopilot()
+    state = {"active": 0, "peak": 0}
+    lock = threading.Lock()
+    respond = assistant.provider.respond
+
+    def generate(prompt):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(delay)
+        with lock:
+            state["active"] -= 1
+        return respond(prompt)
+
+    async def generate_async(prompt):
+        return await asyncio.to_thread(generate, prompt)
+
+    monkeypatch.setattr(assistant.provider, "generate", generate)
+    monkeypatch.setattr(assistant.provider, "generate_async", generate_async)
+    return assistant, state
+
+
+def test_fanout_runs_chunks_concurrently_and_matches_the_schema(monkeypatch):
+    entries = _entries(20)
+    assistant, state = _slow_copilot(monkeypatch, 0.05)
+    result = assistant.optimize_all_content("Backend engineer", entries, JD, fanout=True)
+    assert state["peak"] > 1
+    assert [e["id"] for e in result["entries"]] == list(range(20))
+    assert result["company_name"] == "Initech" and result["summary"].startswith("Backend engineer")
+    assert all(e["optimized_bullets"][0].startswith(entries[e["id"]]["bullets"][0]) for e in result["entries"])
+
+
+def test_async_fanout_matches_the_sync_result(monkeypatch):
+    entries = _entries(20)
+    assistant, _ = _slow_copilot(monkeypatch, 0.01)
+    expected = assistant.optimize_all_content("Backend engineer", entries, JD, fanout=True)
+    assert asyncio.run(assistant.optimize_all_content_async("Backend engineer", entries, JD, fanout=True)) == expected
@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import gzip
+import httpx
+import pytest
+
+from .. import http_client
+from ..http_client import FetchTimeoutError, ResponseTooLargeError, ScrapingClient, close_http_client, get_http_client
+
+
+def _client(handler, max_bytes=1024, total_timeout=30.0) -> ScrapingClient:
+    client = ScrapingClient(5.0, 15.0, total_timeout, max_bytes, 4)
+    client.http = httpx.Client(transport=httpx.MockTransport(handler), headers=client.http.headers, follow_redirects=True)
+    return client
+
+
+def test_fetch_follows_redirects_and_decodes():
+    def handler(request):
+        if request.url.path == "/old":
+            return httpx.Response(301, headers={"Location": "https://jobs.example.com/new"})
+        assert request.headers["User-Agent"].startswith("Mozilla/5.0") and request.headers["If-None-Match"] == '"v1"'
+        return httpx.Response(200, content=gzip.compress(b"<html>job</html>"), headers={"Content-Encoding": "gzip"})
+
+    result = _client(handler).fetch("https://jobs.example.com/old", headers={"If-None-Match": '"v1"'})
+    assert result["url"] == "https://jobs.example.com/new" and result["status_code"] == 200
+    assert result["content"] == b"<html>job</html>"
+
+
+def test_http_errors_raise_and_are_counted():
+    client = _client(lambda request: httpx.Response(503))
+    with pytest.raises(httpx.HTTPStatusError):
+        client.fetch("https://jobs.example.com/1")
+    client.http = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"ok")))
+    client.fetch("https://jobs.example.com/2")
+    stats = client.stats()["jobs.example.com"]
+    assert (stats["requests"], stats["errors"], stats["bytes"]) == (2, 1, 2)
+
+
+def test_declared_oversized_bodies_are_rejected_before_reading():
+    client = _client(lambda request: httpx.Response(200, content=b"x" * 2048))
+    with pytest.raises(ResponseTooLargeError, match="2048 bytes"):
+        client.fetch("https://jobs.example.com/big")
+    assert client.stats()["jobs.example.com"]["bytes"] == 0
+
+
+def test_decompressed_size_is_bounded_while_streaming():
+    # 2 KB of html compresses far below the cap: only the decoded size counts
+    body = gzip.compress(b"x" * 2048)
+    assert len(body) < 1024
+    client = _client(lambda request: httpx.Response(200, content=body, headers={"Content-Encoding": "gzip"}))
+    with pytest.raises(ResponseTooLargeError, match="exceeded 1024 bytes"):
+        client.fetch("https://jobs.example.com/bomb")
+
+
+def test_total_timeout_covers_the_whole_body(monkeypatch):
+    now = [0.0]
+
+    def slow_body():
+        for _ in range(3):
+            now[0] += 20
+            yield b"chunk"
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+    client = _client(lambda request: httpx.Response(200, content=slow_body()), total_timeout=30.0)
+    with pytest.raises(FetchTimeoutError):
+        client.fetch("https://jobs.example.com/slow")
+    assert client.stats()["jobs.example.com"]["errors"] == 1
+
+
+def test_latency_percentiles(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(http_client.time, "monotonic", lambda: now[0])
+
+    def handler(request):
+        now[0] += int(request.url.path.strip("/")) / 1000
+        return httpx.Response(200, content=b"ok")
+    client = _client(handler)
+    for ms in range(1, 101):
+        client.fetch(f"https://jobs.example.com/{ms}")
+    stats = client.stats()["jobs.example.com"]
+    assert (stats["p50_ms"], stats["p95_ms"], stats["max_ms"]) == (51.0, 96.0, 100.0)
+
+
+def test_the_client_is_shared_and_configured_from_the_environment(monkeypatch):
+    close_http_client()
+    monkeypatch.setenv("SCRAPER_MAX_MB", "0.5")
+    monkeypatch.setenv("SCRAPER_TOTAL_TIMEOUT", "7")
+    try:
+        client = get_http_client()
+        assert get_http_client() is client
+        assert client.max_bytes == 512 * 1024 and client.total_timeout == 7.0
+        assert client.http.timeout.connect == 5.0 and client.http.timeout.read == 15.0
+        close_http_client()
+        assert client.http.is_closed and get_http_client() is not client
+    finally:
+        close_http_client()
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import io
+import json
+import re
+import pytest
+from docx import Document
+
+from .. import lambda_main
+from ..main import DOCX_MEDIA_TYPE
+from .conftest import JOB_DESCRIPTION, build_resume_docx
+
+
+def _texts(content: bytes) -> list:
+    return [p.text for p in Document(io.BytesIO(content)).paragraphs]
+
+
+def test_stream_delivery_returns_the_document(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    body = {"job_id": job.id, "resume_id": resume.id, "delivery": "stream"}
+    response = client.post("/generate-resume", json=body, headers={"Idempotency-Key": "stream-1"})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == DOCX_MEDIA_TYPE
+    assert response.headers["content-disposition"] == f'attachment; filename="{resume.filename[:-5]}_Optimized_Initech.docx"'
+    assert response.headers["x-plan-source"] == "generated" and response.headers["x-plan-id"]
+    assert any("Focused on" in text for text in _texts(response.content))
+
+    replay = client.post("/generate-resume", json=body, headers={"Idempotency-Key": "stream-1"})
+    assert replay.headers["idempotent-replayed"] == "true" and replay.content == response.content
+
+
+def test_link_delivery_returns_a_download_url(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    result = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id}).json()
+    assert re.fullmatch(r"/download-resume/[0-9a-f]{64}/.+_Optimized_Initech\.docx", result["download_url"])
+    assert "content" not in result
+    download = client.get(result["download_url"])
+    assert download.status_code == 200 and _texts(download.content)
+
+
+def test_unknown_delivery_is_rejected(client, make_job, make_resume):
+    body = {"job_id": make_job().id, "resume_id": make_resume().id, "delivery": "email"}
+    assert client.post("/generate-resume", json=body).status_code == 422
+
+
+@pytest.fixture
+def lambda_client(tmp_path, monkeypatch):
+    """ The serverless app with DynamoDB and S3 replaced by in-memory stand-ins. """
+    from fastapi.testclient import TestClient
+    path = build_resume_docx(str(tmp_path / "resume.docx"), name="Lambda Resume")
+    with open(path, "rb") as f:
+        objects = {"uploads/resume.docx": f.read()}
+    jobs = {"job-1": {"id": "job-1", "description": JOB_DESCRIPTION}}
+    resumes = {"resume-1": {"id": "resume-1", "filename": "resume.docx", "original_path": "uploads/resume.docx"}}
+
+    def upload(fileobj, key, content_type=None):
+        objects[key] = fileobj.read()
+        return True
+
+    monkeypatch.setattr(lambda_main.db, "get_job_post_by_id", jobs.get)
+    monkeypatch.setattr(lambda_main.db, "get_resume_by_id", resumes.get)
+    monkeypatch.setattr(lambda_main.db, "set_job_company_name", lambda job_id, name: jobs[job_id].update(company_name=name))
+    monkeypatch.setattr(lambda_main.aws_utils, "get_gemini_api_key", lambda: None)
+    monkeypatch.setattr(lambda_main.aws_utils, "read_s3_object", lambda key: io.BytesIO(objects[key]) if key in objects else None)
+    monkeypatch.setattr(lambda_main.aws_utils, "upload_fileobj_to_s3", upload)
+    monkeypatch.setattr(lambda_main.aws_utils, "get_presigned_url", lambda key: f"https://s3.example.com/{key}")
+    return TestClient(lambda_main.app), objects, resumes
+
+
+def test_lambda_uploads_the_rendered_buffer(lambda_client):
+    client, objects, _ = lambda_client
+    result = client.post("/generate-resume", json={"job_id": "job-1", "resume_id": "resume-1"}).json()
+    key, = [key for key in objects if key.startswith("generated/")]
+    assert re.fullmatch(r"generated/[0-9a-f]{32}/resume_Initech\.docx", key)
+    assert result["download_url"] == f"https://s3.example.com/{key}" and result["filename"] == "resume_Initech.docx"
+    assert any("Focused on" in text for text in _texts(objects[key]))
+
+
+def test_lambda_fails_cleanly_without_the_source_file(lambda_client):
+    client, objects, resumes = lambda_client
+    resumes["resume-1"]["original_path"] = "uploads/missing.docx"
+    response = client.post("/generate-resume", json={"job_id": "job-1", "resume_id": "resume-1"})
+    assert response.status_code == 500
+    assert not [key for key in objects if key.startswith("generated/")]
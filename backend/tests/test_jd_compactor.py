@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+from ..copilot import ResumeCopilot
+from ..jd_compactor import compact_job_description, estimate_tokens, segment_sections
+
+JOB_PAGE = """Sign in
+Join now
+Senior Backend Engineer
+Initech - Austin, TX
+Apply
+Save
+About the job
+We are looking for a backend engineer to own our billing platform.
+Responsibilities:
+Design and build Python services on Kubernetes.
+Own the reliability of the payments pipeline.
+Design and build Python services on Kubernetes.
+Requirements:
+Five years of Python and PostgreSQL.
+Experience operating services on AWS.
+Benefits
+Unlimited PTO and a generous 401(k) match.
+Free lunch on Fridays.
+Initech is an equal opportunity employer and considers applicants without regard to race, color or religion.
+Similar Jobs
+Backend Engineer at Globex
+Staff Engineer at Hooli
+"""
+
+
+def test_segment_sections():
+    sections = segment_sections("Title\nIntro line.\nRequirements:\nPython.\nGo.\n\nBenefits\nPTO.")
+    assert sections == [
+        {"heading": "Title", "lines": ["Intro line."]},
+        {"heading": "Requirements:", "lines": ["Python.", "Go."]},
+        {"heading": "Benefits", "lines": ["PTO."]},
+    ]
+
+
+def test_boilerplate_chrome_and_repeats_are_dropped():
+    result = compact_job_description(JOB_PAGE, token_budget=1000)
+    text = result["text"]
+    for kept in ("Senior Backend Engineer", "Responsibilities:", "Own the reliability", "Five years of Python"):
+        assert kept in text
+    for dropped in ("Sign in", "Apply", "Unlimited PTO", "equal opportunity", "Globex", "Staff Engineer at Hooli"):
+        assert dropped not in text
+    assert text.count("Design and build Python services") == 1
+    assert result["dropped_sections"] == ["Benefits", "Similar Jobs"]
+    assert result["original_tokens"] == estimate_tokens(JOB_PAGE) > result["compacted_tokens"] == estimate_tokens(text)
+
+
+def test_tight_budget_keeps_requirements_before_the_intro():
+    intro = "\n".join(f"Our story, chapter {i}, is long and inspiring." for i in range(40))
+    page = f"About us\n{intro}\nRequirements:\nFive years of Python.\nKubernetes in production."
+    result = compact_job_description(page, token_budget=60)
+    assert result["compacted_tokens"] <= 60
+    assert "Five years of Python." in result["text"] and "Kubernetes in production." in result["text"]
+    # Kept sections stay in document order
+    assert result["text"].index("chapter 0") < result["text"].index("Requirements:")
+
+
+def test_model_token_counter_is_verified_and_failures_fall_back():
+    page = "Requirements:\n" + "\n".join(f"Skill number {i} is required." for i in range(200))
+
+    # A tokenizer that counts twice the estimate makes the compactor shrink its estimated budget
+    result = compact_job_description(page, token_budget=200, count_tokens=lambda text: 2 * estimate_tokens(text))
+    assert result["compacted_tokens"] <= 200
+
+    def broken(text):
+        raise RuntimeError("count_tokens unavailable")
+    result = compact_job_description(page, token_budget=200, count_tokens=broken)
+    assert result["compacted_tokens"] == estimate_tokens(result["text"]) <= 200
+
+
+def test_short_descriptions_pass_through_unchanged():
+    text = "Backend Engineer\nBuild Python services."
+    assert compact_job_description(text, token_budget=100)["text"] == text
+
+
+def test_copilot_prompts_with_the_compacted_description(monkeypatch):
+    assistant = ResumeCopilot()
+    prompts = []
+    respond = assistant.provider.respond
+    monkeypatch.setattr(assistant.provider, "generate", lambda prompt: prompts.append(prompt) or respond(prompt))
+    entries = [{"header": "Engineer | Acme", "bullets": ["Built billing"]}]
+    assistant.optimize_all_content("Backend engineer", entries, JOB_PAGE, fanout=False)
+    assert "Own the reliability" in prompts[0] and "Unlimited PTO" not in prompts[0]
+    assert assistant.last_compaction["dropped_sections"] == ["Benefits", "Similar Jobs"]
@@ -0,0 +1,109 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+
+from .. import scraper
+from ..models import JobPost, Plan
+from ..job_cache import description_hash, is_fresh, job_cache_stats, refresh_job_posting
+
+NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class FakeSite:
+    """ Serves one JSON-LD job page with an ETag, answering 304 to a matching If-None-Match. """
+
+    def __init__(self, description="Build Python services at Initech."):
+        self.requests = []
+        self.publish(description)
+
+    def publish(self, description):
+        self.description = description
+        self.etag = f'"{description_hash(description)[:8]}"'
+
+    def fetch(self, url, headers=None):
+        self.requests.append(dict(headers or {}))
+        response_headers = httpx.Headers({"ETag": self.etag, "Last-Modified": "Sun, 01 Jun 2025 10:00:00 GMT"})
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return {"url": url, "status_code": 304, "headers": response_headers, "content": b""}
+        posting = {"@type": "JobPosting", "title": "Engineer", "description": self.description, "hiringOrganization": {"name": "Initech"}}
+        page = f'<html><script type="application/ld+json">{json.dumps(posting)}</script></html>'
+        return {"url": url, "status_code": 200, "headers": response_headers, "content": page.encode()}
+
+
+@pytest.fixture
+def site(monkeypatch):
+    site = FakeSite()
+    monkeypatch.setattr(scraper, "get_http_client", lambda: site)
+    return site
+
+
+URL = "https://www.linkedin.com/jobs/view/1"
+
+
+def test_freshness_window(monkeypatch):
+    monkeypatch.setenv("JOB_CACHE_TTL_SECONDS", "60")
+    assert is_fresh(NOW - timedelta(seconds=59), NOW)
+    assert not is_fresh(NOW - timedelta(seconds=60), NOW)
+    # Naive SQLite timestamps and DynamoDB's ISO strings are both UTC
+    assert is_fresh((NOW - timedelta(seconds=1)).replace(tzinfo=None), NOW)
+    assert is_fresh((NOW - timedelta(seconds=1)).isoformat(), NOW)
+    assert not is_fresh(None, NOW)
+
+
+def test_policy_outcomes(site, monkeypatch):
+    monkeypatch.setenv("JOB_CACHE_TTL_SECONDS", "60")
+    new = refresh_job_posting(URL, None, NOW)
+    assert new["status"] == "new" and new["fields"]["etag"] == site.etag and new["fields"]["company_name"] == "Initech"
+    stored = dict(new["fields"])
+
+    assert refresh_job_posting(URL, stored, NOW + timedelta(seconds=30)) == {"status": "fresh", "fields": {}}
+    assert len(site.requests) == 1
+
+    later = NOW + timedelta(minutes=5)
+    not_modified = refresh_job_posting(URL, stored, later)
+    assert not_modified["status"] == "not_modified" and not_modified["fields"]["fetched_at"] == later
+    assert site.requests[-1] == {"If-None-Match": stored["etag"], "If-Modified-Since": stored["last_modified"]}
+
+    # A new ETag with the same text keeps plans; new text doesn't
+    site.etag = '"rotated"'
+    assert refresh_job_posting(URL, stored, later)["status"] == "unchanged"
+    site.publish("Build Go services at Initech.")
+    changed = refresh_job_posting(URL, stored, later)
+    assert changed["status"] == "changed" and changed["fields"]["content_hash"] == description_hash("Build Go services at Initech.")
+
+
+def test_failed_rescrapes_keep_the_stored_description(monkeypatch):
+    monkeypatch.setenv("JOB_CACHE_TTL_SECONDS", "0")
+
+    def failing(url, headers=None):
+        raise httpx.ConnectError("refused")
+    monkeypatch.setattr(scraper, "get_http_client", lambda: type("Client", (), {"fetch": staticmethod(failing)})())
+    stored = {"description": "Old text", "fetched_at": NOW}
+    outcome = refresh_job_posting(URL, stored, NOW)
+    assert outcome["status"] == "failed" and outcome["fields"] == {} and outcome["retryable"] is True
+    assert refresh_job_posting(URL, None, NOW)["fields"]["description"] == ""
+
+
+def test_validate_url_applies_the_policy(client, db, site, monkeypatch):
+    monkeypatch.setenv("JOB_CACHE_TTL_SECONDS", "3600")
+    before = job_cache_stats().get("fresh", 0)
+    first = client.post("/validate-url", json={"url": URL + "?utm_source=mail"}).json()["data"]
+    assert first["fetch_status"] == "new"
+    assert client.post("/validate-url", json={"url": URL}).json()["data"] == {**first, "fetch_status": "fresh"}
+    assert len(site.requests) == 1 and job_cache_stats()["fresh"] == before + 1
+
+    job_id = first["job_id"]
+    db.add(Plan(job_id=job_id, resume_id=1, content="{}"))
+    db.commit()
+    monkeypatch.setenv("JOB_CACHE_TTL_SECONDS", "0")
+    assert client.post("/validate-url", json={"url": URL}).json()["data"]["fetch_status"] == "not_modified"
+    assert db.query(Plan).filter(Plan.job_id == job_id).count() == 1
+
+    site.publish("Build Go services at Initech.")
+    assert client.post("/validate-url", json={"url": URL}).json()["data"]["fetch_status"] == "changed"
+    db.expire_all()
+    assert db.query(Plan).filter(Plan.job_id == job_id).count() == 0
+    assert db.get(JobPost, job_id).description == "Build Go services at Initech."
@@ -0,0 +1,94 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import random
+import pytest
+
+from ..job_dedup import (DEFAULT_JOB_DEDUP_THRESHOLD, MIN_SHINGLES, NUM_PERM, SHINGLE_WORDS, decode_signature,
+                         encode_signature, index_job_post, minhash_signature, similarity)
+
+_WORDS = ("python services kubernetes reliability postgres latency oncall design review mentor roadmap "
+          "billing payments queue kafka observability migrations testing customers platform api").split()
+
+
+def posting(seed: int, words: int = 160) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(_WORDS) + str(rng.randrange(50)) for _ in range(words))
+
+
+def repost(text: str, edits: int = 3, offset: int = 0) -> str:
+    """ The same posting with a few words changed, as agencies and reposts do. """
+    words = text.split()
+    for i in range(edits):
+        words[(i + 1) * len(words) // (edits + 1) + offset] = "changed"
+    return " ".join(words)
+
+
+def test_signatures_are_stable_and_round_trip():
+    signature = minhash_signature(posting(1))
+    assert len(signature) == NUM_PERM and signature == minhash_signature(posting(1))
+    assert decode_signature(encode_signature(signature)) == signature
+    assert decode_signature("") is None and decode_signature(encode_signature(signature[:10])) is None
+
+
+def test_short_descriptions_are_not_signed():
+    # k words make k - SHINGLE_WORDS + 1 shingles
+    assert minhash_signature(posting(1, words=MIN_SHINGLES + SHINGLE_WORDS - 2)) is None
+    assert minhash_signature(posting(1, words=MIN_SHINGLES + SHINGLE_WORDS - 1)) is not None
+    assert minhash_signature("Sign in to view this job") is None
+
+
+def test_similarity_estimates_overlap():
+    original = minhash_signature(posting(1))
+    assert similarity(original, minhash_signature(repost(posting(1)))) >= 0.8
+    assert similarity(original, minhash_signature(posting(2))) < 0.2
+
+
+def test_reposts_link_to_the_earliest_posting(make_job, db):
+    original = make_job(description=posting(10))
+    copy, other = make_job(description=repost(posting(10))), make_job(description=posting(11))
+    for job in (original, copy, other):
+        index_job_post(db, job)
+    db.commit()
+    assert original.canonical_job_id is None and other.canonical_job_id is None
+    assert copy.canonical_job_id == original.id
+
+
+def test_near_duplicates_do_not_chain(make_job, db):
+    # Each edit keeps the posting close to the previous one, but the third drifts from the first
+    first = posting(40)
+    second = repost(first, edits=4)
+    third = repost(second, edits=4, offset=10)
+    threshold = DEFAULT_JOB_DEDUP_THRESHOLD
+    assert similarity(minhash_signature(first), minhash_signature(second)) >= threshold
+    assert similarity(minhash_signature(second), minhash_signature(third)) >= threshold
+    assert similarity(minhash_signature(first), minhash_signature(third)) < threshold
+    jobs = [make_job(description=text) for text in (first, second, third)]
+    for job in jobs:
+        index_job_post(db, job)
+    db.commit()
+    assert [job.canonical_job_id for job in jobs] == [None, jobs[0].id, None]
+
+
+def test_changed_text_relinks_dependents(make_job, db):
+    original, copy = make_job(description=posting(20)), make_job(description=repost(posting(20)))
+    index_job_post(db, original)
+    index_job_post(db, copy)
+    original.description = posting(21)
+    index_job_post(db, original)
+    db.commit()
+    assert copy.canonical_job_id is None
+
+
+def test_threshold_above_one_disables_linking(make_job, db, monkeypatch):
+    monkeypatch.setenv("JOB_DEDUP_THRESHOLD", "1.01")
+    original, copy = make_job(description=posting(30)), make_job(description=posting(30))
+    index_job_post(db, original)
+    index_job_post(db, copy)
+    assert copy.canonical_job_id is None and copy.minhash
+
+
+@pytest.mark.parametrize("description", ["", "Sign in to view this job"])
+def test_unsigned_postings_are_never_linked(make_job, db, description):
+    job = make_job(description=description)
+    index_job_post(db, job)
+    assert job.minhash == "" and job.canonical_job_id is None
@@ -0,0 +1,138 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import pytest
+
+from .. import llm_cache
+from ..copilot import ResumeCopilot
+from ..llm_cache import ResponseCache, SQLiteCacheBackend, make_cache_key
+
+ENTRIES = [{"header": "Engineer, Acme", "bullets": ["Built the billing service", "Cut costs by 20%"]}]
+JD = "We are hiring at Initech. Python and Kubernetes experience required."
+
+
+def _key(**overrides):
+    args = {"summary_text": "Backend engineer", "experience_entries": ENTRIES, "job_description": JD,
+            "prompt_version": "batch-v1", "model_name": "gemini"}
+    args.update(overrides)
+    return make_cache_key(**args)
+
+
+def test_cache_key_ignores_cosmetic_whitespace():
+    spaced = [{"header": " Engineer,\tAcme ", "bullets": ["Built the  billing service\n", "Cut costs by 20%"]}]
+    assert _key() == _key(summary_text="  Backend\n engineer ", experience_entries=spaced, job_description=JD + "\n\n")
+
+
+@pytest.mark.parametrize("change", [
+    {"summary_text": "Frontend engineer"},
+    {"experience_entries": ENTRIES + [{"header": "Intern", "bullets": []}]},
+    {"job_description": JD.replace("Python", "Go")},
+    {"prompt_version": "batch-v2"},
+    {"model_name": "gemini-pro"},
+])
+def test_cache_key_changes_with_the_request(change):
+    assert _key(**change) != _key()
+
+
+def test_sqlite_entries_expire_after_the_ttl(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), ttl_seconds=60)
+    backend.set("k", "v")
+    now[0] += 60
+    assert backend.get("k") == "v"
+    now[0] += 1
+    assert backend.get("k") is None
+    assert backend.describe()["entries"] == 0
+
+
+def test_sqlite_evicts_least_recently_used_by_count(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_entries=2)
+    for key in ("a", "b"):
+        backend.set(key, key)
+        now[0] += 1
+    assert backend.get("a") == "a" # now more recently used than b
+    now[0] += 1
+    backend.set("c", "c")
+    assert backend.get("b") is None
+    assert backend.get("a") == "a" and backend.get("c") == "c"
+
+
+def test_sqlite_evicts_by_total_size(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    backend = SQLiteCacheBackend(str(tmp_path / "cache.db"), max_bytes=10)
+    backend.set("a", "x" * 6)
+    now[0] += 1
+    backend.set("b", "y" * 6)
+    assert backend.get("a") is None and backend.get("b") == "y" * 6
+    assert backend.describe()["bytes"] == 6
+
+
+class _BrokenBackend:
+    def get(self, key):
+        raise OSError("table missing")
+
+    def set(self, key, value):
+        raise OSError("throttled")
+
+    def describe(self):
+        return {"backend": "broken"}
+
+
+def test_backend_errors_are_misses():
+    cache = ResponseCache(_BrokenBackend())
+    cache.set("k", {"summary": "x"})
+    assert cache.get("k") is None
+    assert cache.stats() == {"hits": 0, "misses": 1, "errors": 2, "hit_rate": 0.0, "backend": "broken"}
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(SQLiteCacheBackend(str(tmp_path / "cache.db")))
+    monkeypatch.setattr(llm_cache, "_cache", cache)
+    return cache
+
+
+def _counting_copilot(monkeypatch) -> tuple[ResumeCopilot, list]:
+    assistant = ResumeCopilot()
+    prompts = []
+    generate = assistant.provider.generate
+
+    def counting(prompt):
+        prompts.append(prompt)
+        return generate(prompt)
+    monkeypatch.setattr(assistant.provider, "generate", counting)
+    return assistant, prompts
+
+
+def test_repeated_optimization_is_served_from_the_cache(response_cache, monkeypatch):
+    assistant, prompts = _counting_copilot(monkeypatch)
+    first = assistant.optimize_all_content("Backend engineer", ENTRIES, JD, fanout=False)
+    assert first["entries"][0]["id"] == 0 and len(prompts) == 1
+
+    assert assistant.optimize_all_content(" Backend engineer ", ENTRIES, JD, fanout=False) == first
+    assert len(prompts) == 1
+    assert response_cache.stats()["hits"] == 1
+
+    # Fan-out responses use their own prompt version, so they are keyed separately
+    assistant.optimize_all_content("Backend engineer", ENTRIES, JD, fanout=True)
+    assert len(prompts) == 3
+
+
+def test_async_optimization_shares_the_cache(response_cache, monkeypatch):
+    assistant, prompts = _counting_copilot(monkeypatch)
+    first = assistant.optimize_all_content("Backend engineer", ENTRIES, JD, fanout=False)
+    assert asyncio.run(assistant.optimize_all_content_async("Backend engineer", ENTRIES, JD, fanout=False)) == first
+    assert len(prompts) == 1
+    assert response_cache.stats()["hits"] == 1
+
+
+def test_failed_responses_are_not_cached(response_cache, monkeypatch):
+    assistant = ResumeCopilot()
+    monkeypatch.setattr(assistant.provider, "generate", lambda prompt: "not json")
+    assert assistant.optimize_all_content("Backend engineer", ENTRIES, JD, fanout=False) is None
+    assert response_cache.stats()["entries"] == 0
+
@@ -0,0 +1,146 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+import pytest
+
+from .. import llm_client
+from ..llm_client import GeminiClient, aclose_clients, extract_response_text, get_async_client, get_concurrency_stats
+from ..llm_providers import GeminiProvider
+
+
+def _reply(text: str) -> dict:
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    """ Routes the pooled client to an in-process handler; yields the list of requests it saw. """
+    requests = []
+    state = {"active": 0, "peak": 0, "delay": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(state["delay"])
+        state["active"] -= 1
+        prompt = json.loads(request.content)["contents"][0]["parts"][0]["text"]
+        if prompt == "fail":
+            return httpx.Response(429, json={"error": "quota"})
+        if request.url.path.endswith(":streamGenerateContent"):
+            body = "".join(f"data: {json.dumps(_reply(word))}\n\n" for word in prompt.split())
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+        return httpx.Response(200, json=_reply(prompt.upper()))
+
+    client_class = httpx.AsyncClient
+    monkeypatch.setattr(httpx, "AsyncClient", lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs))
+    monkeypatch.setattr(llm_client, "_transport", None)
+    yield requests, state
+    llm_client._transport = None
+
+
+def test_generate_content_posts_to_the_model(gemini):
+    requests, _ = gemini
+    assert asyncio.run(get_async_client("key-1", "gemini-test").generate_content("hello")) == "HELLO"
+    assert str(requests[0].url) == f"{llm_client.GEMINI_API_BASE}/models/gemini-test:generateContent"
+    assert requests[0].headers["x-goog-api-key"] == "key-1"
+
+
+def test_errors_raise_http_status_error(gemini):
+    with pytest.raises(httpx.HTTPStatusError) as error:
+        asyncio.run(get_async_client("key-1", "gemini-test").generate_content("fail"))
+    assert error.value.response.status_code == 429
+
+
+def test_stream_yields_chunks_as_they_arrive(gemini):
+    async def collect():
+        return [chunk async for chunk in get_async_client("key-1", "gemini-test").stream_generate_content("one two three")]
+    assert asyncio.run(collect()) == ["one", "two", "three"]
+    assert gemini[0][0].url.params["alt"] == "sse"
+
+
+def test_clients_share_one_pool_and_a_concurrency_bound(gemini, monkeypatch):
+    _, state = gemini
+    state["delay"] = 0.01
+    monkeypatch.setattr(llm_client, "MAX_CONCURRENCY", 3)
+
+    async def main():
+        clients = [get_async_client(f"key-{i % 2}", "gemini-test") for i in range(10)]
+        results = await asyncio.gather(*(client.generate_content(f"p{i}") for i, client in enumerate(clients)))
+        transport = llm_client._transport
+        await aclose_clients()
+        return results, transport
+
+    results, transport = asyncio.run(main())
+    assert results == [f"P{i}" for i in range(10)]
+    assert state["peak"] == 3
+    assert transport.http.is_closed and llm_client._transport is None
+    assert get_async_client("key-0", "gemini-test") is get_async_client("key-0", "gemini-test")
+    assert get_concurrency_stats()["in_flight"] == 0
+
+
+def test_transport_is_rebuilt_for_a_new_event_loop(gemini):
+    async def transport():
+        await get_async_client("key-1", "gemini-test").generate_content("x")
+        return llm_client._transport
+    first = asyncio.run(transport())
+    assert asyncio.run(transport()) is not first
+
+
+def test_extract_response_text():
+    assert extract_response_text({"candidates": [{"content": {"parts": [{"text": "a"}, {"text": "b"}]}}]}) == "ab"
+    with pytest.raises(ValueError, match="no candidates"):
+        extract_response_text({"promptFeedback": {"blockReason": "SAFETY"}})
+
+
+@pytest.fixture
+def sync_gemini(monkeypatch):
+    """ Routes the pooled blocking client to an in-process handler; yields the requests it saw. """
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        text = json.loads(request.content)["contents"][0]["parts"][0]["text"]
+        if request.url.path.endswith(":countTokens"):
+            return httpx.Response(200, json={"totalTokens": len(text.split())})
+        if text == "fail":
+            return httpx.Response(429, json={"error": "quota"})
+        return httpx.Response(200, json=_reply(f"{request.headers['x-goog-api-key']}: {text}"))
+
+    client_class = httpx.Client
+    monkeypatch.setattr(httpx, "Client", lambda **kwargs: client_class(transport=httpx.MockTransport(handler), **kwargs))
+    monkeypatch.setattr(llm_client, "_sync_http", None)
+    yield requests
+    asyncio.run(aclose_clients())
+
+
+def test_sync_calls_carry_their_own_key(sync_gemini):
+    """ Interleaved calls with different keys each use their own, over one pooled client. """
+    calls = [(f"key-{i % 3}", f"prompt {i}") for i in range(30)]
+    with ThreadPoolExecutor(8) as pool:
+        answers = list(pool.map(lambda call: GeminiClient(call[0], "gemini-test").generate_content(call[1]), calls))
+    assert answers == [f"{key}: {prompt}" for key, prompt in calls]
+    assert str(sync_gemini[0].url) == f"{llm_client.GEMINI_API_BASE}/models/gemini-test:generateContent"
+    assert llm_client._sync_http is llm_client._get_sync_http()
+
+
+def test_sync_count_tokens_and_errors(sync_gemini):
+    client = GeminiClient("key-1", "gemini-test")
+    assert client.count_tokens("three little words") == 3
+    with pytest.raises(httpx.HTTPStatusError):
+        client.generate_content("fail")
+
+
+def test_gemini_provider_uses_the_request_key(sync_gemini):
+    first, second = GeminiProvider("key-a", "gemini-test"), GeminiProvider("key-b", "gemini-test")
+    assert (first.generate("hi"), second.generate("hi"), first.generate("hi")) == ("key-a: hi", "key-b: hi", "key-a: hi")
+    assert second.count_tokens("a b") == 2
+
+
+def test_aclose_clients_closes_the_sync_pool(sync_gemini):
+    http = llm_client._get_sync_http()
+    asyncio.run(aclose_clients())
+    assert http.is_closed and llm_client._sync_http is None
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import random
+import pytest
+
+from ..copilot import build_batch_prompt, build_entries_prompt, build_summary_prompt, parse_json_response
+from ..llm_providers import (FakeProvider, FakeProviderError, LLMProvider, RecordReplayProvider, ReplayMissError,
+                             get_provider, parse_latency_spec)
+
+JD = "Senior Backend Engineer at Initech, working with Python, Kubernetes and PostgreSQL."
+ENTRIES = [{"header": "Engineer | Acme", "bullets": ["Built billing", "Cut costs"]},
+           {"header": "Intern | Globex", "bullets": ["Wrote tests"]}]
+
+
+def test_parse_latency_spec():
+    rng = random.Random(0)
+    assert parse_latency_spec("fixed:0.25")(rng) == 0.25
+    assert parse_latency_spec(None)(rng) == 0
+    assert all(1 <= parse_latency_spec("uniform:1:2")(rng) <= 2 for _ in range(100))
+    samples = sorted(parse_latency_spec("lognormal:1.0:0.4")(rng) for _ in range(1001))
+    assert samples[500] == pytest.approx(1.0, rel=0.1)
+    with pytest.raises(ValueError):
+        parse_latency_spec("gamma:1:2")
+
+
+def test_fake_answers_every_copilot_prompt_with_valid_json():
+    fake = FakeProvider(seed=1)
+    batch = parse_json_response(fake.generate(build_batch_prompt("Backend engineer", ENTRIES, JD)))
+    assert batch["company_name"] == "Initech"
+    assert [e["id"] for e in batch["entries"]] == [0, 1]
+    assert batch["entries"][0]["optimized_bullets"][0].startswith("Built billing, applying ")
+
+    chunk = parse_json_response(fake.generate(build_entries_prompt([(1, ENTRIES[1])], JD)))
+    assert [e["id"] for e in chunk["entries"]] == [1]
+    summary = parse_json_response(fake.generate(build_summary_prompt("Backend engineer", JD)))
+    assert summary["summary"].startswith("Backend engineer Focused on ")
+    assert fake.generate(f"Extract only the company name from this job description.\n\nJob Description:\n{JD}") == "Initech"
+
+
+def test_fake_responses_are_deterministic_per_seed_and_prompt():
+    prompt = build_batch_prompt("Backend engineer", ENTRIES, JD)
+    assert FakeProvider(seed=3).generate(prompt) == FakeProvider(seed=3).generate(prompt)
+    assert FakeProvider(seed=3).generate(prompt) != FakeProvider(seed=4).generate(prompt)
+
+
+def test_fake_injects_seeded_errors():
+    def outcomes(seed):
+        fake, results = FakeProvider(seed=seed, error_rate=0.5, error_codes=(429, 503)), []
+        for _ in range(40):
+            try:
+                fake.generate("hello")
+                results.append(None)
+            except FakeProviderError as e:
+                results.append(e.code)
+        return results
+    first = outcomes(7)
+    assert first == outcomes(7)
+    assert {429, 503, None} == set(first)
+
+
+def test_fake_stream_reassembles_to_the_response():
+    fake = FakeProvider()
+    prompt = build_batch_prompt("Backend engineer", ENTRIES, JD)
+
+    async def collect():
+        return [chunk async for chunk in fake.stream_async(prompt)]
+    chunks = asyncio.run(collect())
+    assert len(chunks) > 1 and "".join(chunks) == fake.respond(prompt)
+
+
+def test_record_then_replay(tmp_path):
+    directory = str(tmp_path / "recordings")
+    inner = FakeProvider(seed=5)
+    recorder = RecordReplayProvider(directory, "record", inner=inner)
+    recorded = recorder.generate("prompt one")
+    streamed = asyncio.run(_collect(recorder.stream_async("prompt two")))
+
+    replayer = RecordReplayProvider(directory, "replay", model_name=inner.model_name)
+    assert replayer.generate("prompt one") == recorded
+    assert asyncio.run(replayer.generate_async("prompt two")) == "".join(streamed)
+    with pytest.raises(ReplayMissError):
+        replayer.generate("never recorded")
+    assert (replayer.hits, replayer.misses) == (2, 1)
+    # Recordings are keyed by model as well as prompt
+    with pytest.raises(ReplayMissError):
+        RecordReplayProvider(directory, "replay", model_name="other-model").generate("prompt one")
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+def test_record_replay_validates_its_mode(tmp_path):
+    with pytest.raises(ValueError):
+        RecordReplayProvider(str(tmp_path), "rewind")
+    with pytest.raises(ValueError):
+        RecordReplayProvider(str(tmp_path), "record")
+
+
+def test_get_provider_follows_llm_provider(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_RECORD_DIR", str(tmp_path))
+    monkeypatch.setenv("LLM_PROVIDER", "fake")
+    assert get_provider(None, "gemini-test") is get_provider("key", "other")
+    assert isinstance(get_provider(None, "gemini-test"), FakeProvider)
+
+    monkeypatch.setenv("LLM_PROVIDER", "replay")
+    replay = get_provider(None, "gemini-test")
+    assert isinstance(replay, RecordReplayProvider) and (replay.mode, replay.model_name) == ("replay", "gemini-test")
+
+    # Gemini (and recording from it) needs an API key
+    for name in ("gemini", "record"):
+        monkeypatch.setenv("LLM_PROVIDER", name)
+        assert get_provider(None, "gemini-test") is None
+
+
+def test_providers_must_implement_generate():
+    with pytest.raises(TypeError):
+        LLMProvider()
+
+    class Echo(LLMProvider):
+        def generate(self, prompt):
+            return prompt
+
+    assert asyncio.run(Echo().generate_async("hi")) == "hi"
+    assert asyncio.run(_collect(Echo().stream_async("hi"))) == ["hi"]
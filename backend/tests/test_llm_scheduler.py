@@ -0,0 +1,187 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import sqlite3
+from email.utils import formatdate
+import pytest
+
+from .. import copilot, llm_scheduler
+from ..llm_providers import FakeProviderError
+from ..llm_scheduler import (MemoryBucketStore, QuotaScheduler, SQLiteBucketStore, PRIORITY_BATCH,
+                             PRIORITY_INTERACTIVE, backoff_delay, classify_error, parse_retry_after)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBucketStore()
+    return SQLiteBucketStore(str(tmp_path / "buckets.db"))
+
+
+def test_bucket_starts_full_and_reports_wait_when_empty(store):
+    # 2 requests of capacity, refilled at 1 per second
+    assert store.try_consume([("rpm", 2, 1.0, 1)]) == 0
+    assert store.try_consume([("rpm", 2, 1.0, 1)]) == 0
+    assert store.try_consume([("rpm", 2, 1.0, 1)]) == pytest.approx(1.0, abs=0.05)
+
+
+def test_buckets_are_taken_together_or_not_at_all(store):
+    assert store.try_consume([("rpm", 10, 1.0, 1), ("tpm", 100, 10.0, 80)]) == 0
+    # The token bucket can't cover 50 more, so the request bucket is left untouched too
+    assert store.try_consume([("rpm", 10, 1.0, 1), ("tpm", 100, 10.0, 50)]) == pytest.approx(3.0, abs=0.05)
+    assert store.try_consume([("rpm", 10, 1.0, 9)]) == 0
+
+
+def test_request_larger_than_the_bucket_passes_when_full(store):
+    assert store.try_consume([("tpm", 100, 10.0, 500)]) == 0
+    assert store.try_consume([("tpm", 100, 10.0, 1)]) > 0
+
+
+def test_sqlite_buckets_are_shared_between_stores(tmp_path):
+    path = str(tmp_path / "buckets.db")
+    assert SQLiteBucketStore(path).try_consume([("rpm", 1, 0.1, 1)]) == 0
+    assert SQLiteBucketStore(path).try_consume([("rpm", 1, 0.1, 1)]) > 0
+
+
+def test_sqlite_lock_timeout_is_not_masked(tmp_path, monkeypatch):
+    path = str(tmp_path / "buckets.db")
+    store = SQLiteBucketStore(path)
+    holder = sqlite3.connect(path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: connect(*args, **{**kwargs, "timeout": 0}))
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            store.try_consume([("rpm", 1, 1.0, 1)])
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(formatdate(llm_scheduler.time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code, headers)
+
+
+class _CodedError(Exception):
+    def __init__(self, code):
+        super().__init__(f"code {code}")
+        self.code = code
+
+
+class ConnectTimeout(Exception):
+    pass
+
+
+def test_classify_error():
+    assert classify_error(_HTTPError(429, {"Retry-After": "12"})) == (True, 12.0)
+    assert classify_error(_HTTPError(503)) == (True, None)
+    assert classify_error(_HTTPError(400)) == (False, None)
+    assert classify_error(_CodedError(500)) == (True, None)
+    assert classify_error(_CodedError(403)) == (False, None)
+    assert classify_error(ConnectTimeout("reset")) == (True, None)
+    assert classify_error(ValueError("bad JSON")) == (False, None)
+
+
+def test_backoff_delay_bounds():
+    for attempt in range(8):
+        for _ in range(50):
+            assert 0 <= backoff_delay(attempt, base=1.0, cap=10.0) <= min(10.0, 2 ** attempt)
+    # Retry-After is a floor, plus at most `base` of jitter
+    assert all(20 <= backoff_delay(0, retry_after=20, base=1.0) <= 21 for _ in range(50))
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "backoff_delay", lambda attempt, retry_after=None: 0)
+
+
+def _flaky(failures: list):
+    calls = []
+
+    def call():
+        calls.append(1)
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+    return call, calls
+
+
+def test_run_retries_retryable_failures(no_backoff):
+    scheduler = QuotaScheduler(rpm=1000, tpm=1_000_000, store=MemoryBucketStore(), max_retries=3)
+    call, calls = _flaky([_HTTPError(429), _HTTPError(503)])
+    assert scheduler.run(call, tokens=10) == "ok"
+    assert len(calls) == 3
+    assert scheduler.stats()["retries"] == 2 and scheduler.stats()["granted"] == 3
+
+
+def test_run_gives_up_on_permanent_errors_and_after_max_retries(no_backoff):
+    scheduler = QuotaScheduler(rpm=1000, tpm=1_000_000, store=MemoryBucketStore(), max_retries=2)
+    call, calls = _flaky([_HTTPError(400)])
+    with pytest.raises(_HTTPError):
+        scheduler.run(call, tokens=10)
+    assert len(calls) == 1
+
+    call, calls = _flaky([_HTTPError(429)] * 5)
+
+    async def call_async():
+        return call()
+    with pytest.raises(_HTTPError):
+        asyncio.run(scheduler.run_async(call_async, tokens=10))
+    assert len(calls) == 3
+    assert scheduler.stats()["failures"] == 2
+
+
+def test_interactive_requests_overtake_queued_batch_work():
+    # 600 requests per minute refill one every 0.1s; drain the bucket so both callers must queue
+    store = MemoryBucketStore()
+    scheduler = QuotaScheduler(rpm=600, tpm=1_000_000, store=store)
+    store.try_consume([("rpm", 600, 10.0, 600)])
+    granted = []
+
+    async def caller(name, priority):
+        await scheduler.acquire_async(1, priority)
+        granted.append(name)
+
+    async def main():
+        batch = asyncio.ensure_future(caller("batch", PRIORITY_BATCH))
+        await asyncio.sleep(0)
+        await caller("interactive", PRIORITY_INTERACTIVE)
+        await batch
+
+    asyncio.run(main())
+    assert granted == ["interactive", "batch"]
+    assert scheduler.stats()["queue_depth"] == 0
+
+
+def test_copilot_calls_are_retried_through_the_scheduler(no_backoff, monkeypatch):
+    scheduler = QuotaScheduler(rpm=1000, tpm=1_000_000, store=MemoryBucketStore(), max_retries=3)
+    monkeypatch.setattr(copilot, "get_scheduler", lambda: scheduler)
+    assistant = copilot.ResumeCopilot()
+    failures = [FakeProviderError(429), FakeProviderError(503)]
+    respond = assistant.provider.respond
+
+    def generate(prompt):
+        if failures:
+            raise failures.pop(0)
+        return respond(prompt)
+    monkeypatch.setattr(assistant.provider, "generate", generate)
+    entries = [{"header": "Engineer | Acme", "bullets": ["Built billing"]}]
+    assert assistant.optimize_all_content("Backend engineer", entries, "Engineer at Initech.", fanout=False)["entries"]
+    assert scheduler.stats()["retries"] == 2
+    assert scheduler.stats()["granted"] == 3
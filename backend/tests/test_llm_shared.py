@@ -0,0 +1,149 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import importlib
+import os
+import sys
+import pytest
+
+from .. import llm_scheduler, llm_shared
+from ..llm_shared import FakeProvider, FakeProviderError, RecordReplayProvider, select_provider
+
+LAMBDA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "lambda")
+
+REWRITE_PROMPT = """
+---
+JOB DESCRIPTION:
+Backend Engineer at Initech. Python, Kubernetes and PostgreSQL.
+
+---
+ORIGINAL RESUME:
+# Jane Doe
+- Built the billing service.
+- Cut costs by 20%
+
+---
+OUTPUT (Markdown format):
+"""
+
+
+@pytest.mark.parametrize("module", [llm_shared, llm_scheduler])
+def test_lambda_copies_are_identical(module):
+    name = os.path.basename(module.__file__)
+    with open(module.__file__, "rb") as backend, open(os.path.join(LAMBDA_DIR, name), "rb") as copy:
+        assert copy.read() == backend.read(), f"lambda/{name} must be a copy of backend/{name}"
+
+
+def test_fake_answers_the_rewrite_prompt_in_markdown():
+    text = FakeProvider(seed=3).respond(REWRITE_PROMPT)
+    lines = text.splitlines()
+    assert lines[0] == "# Jane Doe"
+    assert lines[1].startswith("- Built the billing service, applying ") and lines[2].startswith("- Cut costs by 20%, applying ")
+    assert "## Key Skills" in text and text == FakeProvider(seed=3).respond(REWRITE_PROMPT)
+
+
+def test_select_provider(monkeypatch, tmp_path):
+    fake = FakeProvider()
+    gemini = FakeProvider(seed=1)
+    gemini.model_name = "gemini-test"
+    monkeypatch.setenv("LLM_RECORD_DIR", str(tmp_path))
+    for name, expected in (("fake", fake), ("gemini", gemini), ("GEMINI", gemini)):
+        monkeypatch.setenv("LLM_PROVIDER", name)
+        assert select_provider(lambda: gemini, "gemini-test", lambda: fake) is expected
+
+    monkeypatch.setenv("LLM_PROVIDER", "record")
+    recorder = select_provider(lambda: gemini, "gemini-test")
+    assert isinstance(recorder, RecordReplayProvider) and recorder.inner is gemini
+    answer = recorder.generate("prompt")
+    monkeypatch.setenv("LLM_PROVIDER", "replay")
+    assert select_provider(lambda: None, "gemini-test").generate("prompt") == answer
+
+    monkeypatch.setenv("LLM_PROVIDER", "gemini")
+    assert select_provider(lambda: None, "gemini-test") is None
+
+
+def test_fake_from_env(monkeypatch):
+    monkeypatch.setenv("LLM_FAKE_SEED", "7")
+    monkeypatch.setenv("LLM_FAKE_LATENCY", "fixed:0")
+    monkeypatch.setenv("LLM_FAKE_ERROR_RATE", "1")
+    monkeypatch.setenv("LLM_FAKE_ERROR_CODES", "503")
+    fake = llm_shared.fake_provider_from_env()
+    assert fake.seed == 7
+    with pytest.raises(FakeProviderError) as error:
+        fake.generate("prompt")
+    assert error.value.code == 503
+
+
+@pytest.fixture
+def lambda_modules(monkeypatch):
+    """ Imports the standalone Lambda's modules the way its runtime does: flat, from lambda/. """
+    monkeypatch.syspath_prepend(LAMBDA_DIR)
+    names = ("llm_shared", "llm_scheduler", "gemini_client", "prompt_templates")
+    saved = {name: sys.modules.pop(name) for name in names if name in sys.modules}
+    yield importlib.import_module
+    for name in names:
+        sys.modules.pop(name, None)
+    sys.modules.update(saved)
+
+
+def test_lambda_uses_the_shared_providers(lambda_modules, monkeypatch, tmp_path):
+    gemini_client = lambda_modules("gemini_client")
+    prompt = lambda_modules("prompt_templates").get_resume_rewrite_prompt("- Built the billing service.", "Python at Initech.")
+    monkeypatch.setenv("LLM_PROVIDER", "fake")
+    client = gemini_client.get_client()
+    assert client is gemini_client.get_client() and client.name == "fake"
+    assert client.generate(prompt).startswith("- Built the billing service, applying ")
+
+    monkeypatch.setenv("LLM_PROVIDER", "replay")
+    monkeypatch.setenv("LLM_RECORD_DIR", str(tmp_path))
+    replay = gemini_client.get_client()
+    assert replay.model_name == gemini_client.GeminiClient.model_name
+    with pytest.raises(lambda_modules("llm_shared").ReplayMissError):
+        replay.generate(prompt)
+
+
+def test_lambda_gemini_sends_the_key_in_a_header(lambda_modules, monkeypatch):
+    gemini_client = lambda_modules("gemini_client")
+    sent = []
+
+    class Response:
+        status_code = 200
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"candidates": [{"content": {"parts": [{"text": "# Resume"}]}}]}
+
+    monkeypatch.setenv("GEMINI_API_KEY", "secret-key")
+    monkeypatch.setattr(gemini_client.requests, "post", lambda url, **kwargs: sent.append((url, kwargs)) or Response())
+    assert gemini_client.GeminiClient().generate("prompt") == "# Resume"
+    url, kwargs = sent[0]
+    assert "secret-key" not in url and kwargs["headers"]["x-goog-api-key"] == "secret-key"
+
+
+def test_lambda_calls_go_through_the_quota_scheduler(lambda_modules, monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_SCHEDULER_STORE", "sqlite")
+    monkeypatch.setenv("LLM_SCHEDULER_PATH", str(tmp_path / "quota.db"))
+    gemini_client, scheduler = lambda_modules("gemini_client"), lambda_modules("llm_scheduler")
+    monkeypatch.setattr(scheduler.time, "sleep", lambda seconds: None)
+    fake = lambda_modules("llm_shared").FakeProvider(seed=1, error_rate=0.5, error_codes=(429,))
+    answers = [gemini_client.generate_content(fake, REWRITE_PROMPT) for _ in range(5)]
+    assert answers == [fake.respond(REWRITE_PROMPT)] * 5
+
+    stats = scheduler.get_scheduler().stats()
+    assert stats["store"] == "sqlite" and stats["granted"] == fake.calls > 5 and stats["retries"] == fake.calls - 5
+    failing = lambda_modules("llm_shared").FakeProvider(error_rate=1.0, error_codes=(400,))
+    with pytest.raises(Exception, match="400"):
+        gemini_client.generate_content(failing, REWRITE_PROMPT)
+    assert failing.calls == 1
+
+
+def test_lambda_quota_state_lives_under_tmp(lambda_modules, monkeypatch):
+    monkeypatch.setenv("LLM_SCHEDULER_STORE", "sqlite")
+    monkeypatch.delenv("LLM_SCHEDULER_PATH", raising=False)
+    monkeypatch.setenv("AWS_LAMBDA_FUNCTION_NAME", "resume-rewriter")
+    scheduler = lambda_modules("llm_scheduler")
+    paths = []
+    monkeypatch.setattr(scheduler, "SQLiteBucketStore", lambda path: paths.append(path) or scheduler.MemoryBucketStore())
+    scheduler.get_scheduler()
+    assert paths == ["/tmp/llm_scheduler.db"]
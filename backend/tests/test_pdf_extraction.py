@@ -0,0 +1,122 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import pytest
+from pypdf import PdfReader
+
+from .. import pdf_page_cache, process_pool, resume_parser
+from ..pdf_page_cache import PageTextCache
+from ..resume_parser import extract_text_from_pdf
+
+
+def build_pdf(path: str, pages: int) -> str:
+    """ A text-only PDF whose page i reads "Page i line j" on three lines. """
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        stream = b"BT /F1 10 Tf 12 TL 50 760 Td " + b" ".join(b"(Page %d line %d) '" % (page, line) for line in range(3)) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects))
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as f:
+        f.write(out)
+    return path
+
+
+def _sequential_text(path: str) -> str:
+    return "".join(page.extract_text() for page in PdfReader(path).pages)
+
+
+@pytest.fixture
+def page_cache(tmp_path, monkeypatch):
+    cache = PageTextCache(str(tmp_path / "pages.db"))
+    monkeypatch.setattr(resume_parser, "get_page_cache", lambda: cache)
+    return cache
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """ Pretends to have three workers and records the page runs sent to them (run inline). """
+    runs = []
+
+    def map_inline(fn, arg_lists):
+        runs.extend(pages for _, pages in arg_lists)
+        return [fn(*args) for args in arg_lists]
+    monkeypatch.setattr(resume_parser, "pool_size", lambda: 3)
+    monkeypatch.setattr(resume_parser, "map_in_process_pool", map_inline)
+    monkeypatch.setattr(resume_parser, "PDF_PARALLEL_MIN_PAGES", 4)
+    return runs
+
+
+def test_parallel_extraction_matches_sequential(tmp_path, page_cache, parallel):
+    path = build_pdf(str(tmp_path / "long.pdf"), 10)
+    text = extract_text_from_pdf(path)
+    assert text == _sequential_text(path) and "Page 9 line 2" in text
+    assert parallel == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+def test_short_documents_are_extracted_inline(tmp_path, page_cache, parallel):
+    path = build_pdf(str(tmp_path / "short.pdf"), 3)
+    assert extract_text_from_pdf(path) == _sequential_text(path)
+    assert parallel == []
+
+
+def test_cached_documents_are_not_parsed_again(tmp_path, page_cache, monkeypatch):
+    path = build_pdf(str(tmp_path / "resume.pdf"), 5)
+    text = extract_text_from_pdf(path, content_hash="abc")
+    assert page_cache.get("abc")[0] == 5
+
+    def no_parse(*args, **kwargs):
+        raise AssertionError("PDF parsed despite a complete cache")
+    monkeypatch.setattr(resume_parser, "PdfReader", no_parse)
+    assert extract_text_from_pdf(path, content_hash="abc") == text
+
+
+def test_only_missing_pages_are_extracted(tmp_path, page_cache, parallel):
+    path = build_pdf(str(tmp_path / "resume.pdf"), 10)
+    page_cache.set("abc", 10, {page: f"cached {page}\n" for page in range(0, 10, 2)})
+    text = extract_text_from_pdf(path, content_hash="abc")
+    assert text.startswith("cached 0\nPage 1 line 0")
+    assert parallel == [[1, 3], [5, 7], [9]]
+    assert len(page_cache.get("abc")[1]) == 10
+
+
+def test_mmap_and_in_memory_reads_agree(tmp_path, page_cache, monkeypatch):
+    path = build_pdf(str(tmp_path / "resume.pdf"), 2)
+    in_memory = extract_text_from_pdf(path, content_hash="a")
+    monkeypatch.setattr(resume_parser, "PDF_MMAP_MIN_BYTES", 0)
+    assert extract_text_from_pdf(path, content_hash="b") == in_memory
+
+
+def test_page_cache_evicts_least_recently_used_documents(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(pdf_page_cache.time, "time", lambda: now[0])
+    cache = PageTextCache(str(tmp_path / "pages.db"), max_documents=2)
+    for name in ("a", "b"):
+        cache.set(name, 1, {0: name})
+        now[0] += 1
+    cache.get("a")
+    now[0] += 1
+    cache.set("c", 1, {0: "c"})
+    assert cache.get("b") == (None, {})
+    assert cache.get("a") == (1, {0: "a"}) and cache.get("c") == (1, {0: "c"})
+
+
+def test_process_pool_runs_in_marked_workers(monkeypatch):
+    monkeypatch.setenv("PARSE_WORKERS", "2")
+    process_pool.shutdown_process_pool()
+    try:
+        assert process_pool.pool_size() == 2
+        assert process_pool.map_in_process_pool(process_pool.in_worker_process, [(), (), ()]) == [True, True, True]
+        assert not process_pool.in_worker_process()
+    finally:
+        process_pool.shutdown_process_pool()
@@ -0,0 +1,88 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import functools
+import io
+import random
+import zipfile
+import pytest
+
+from .. import resume_generator
+from ..docx_stream_renderer import DOCUMENT_PART, SEGMENT_FRAGMENTS, DocxTemplate
+from ..resume_generator import render_template
+from ..template_cache import RenditionCache, TemplateCache
+from .test_docx_stream_renderer import build_resume, paragraph_texts, render_with_python_docx, render_with_stream
+
+
+@functools.lru_cache(maxsize=None)
+def build_large_resume() -> bytes:
+    """ Enough body children for several independently compressed rendition segments. """
+    return build_resume(bullets=SEGMENT_FRAGMENTS * 2 + 40)
+
+
+def _document_xml(package: bytes) -> bytes:
+    with zipfile.ZipFile(io.BytesIO(package)) as zin:
+        assert zin.testzip() is None
+        return zin.read(DOCUMENT_PART)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rendition_patches_match_full_renders(seed):
+    """ Random edit / restore / delete sequences patched onto the last rendition render what render_docx does. """
+    rng = random.Random(seed)
+    original = build_large_resume()
+    template = DocxTemplate(io.BytesIO(original))
+    rendition = template.rendition({})
+    edits = {}
+    for step in range(12):
+        for ordinal in rng.sample(range(template.paragraph_count), rng.randint(1, 8)):
+            action = rng.choice(("edit", "edit", "restore", "delete"))
+            if action == "edit":
+                edits[ordinal] = f"Step {step} text for paragraph {ordinal}"
+            elif action == "restore":
+                edits.pop(ordinal, None)
+            else:
+                edits[ordinal] = None
+        rendition = rendition.patch(edits)
+        patched = io.BytesIO()
+        rendition.write(patched)
+        assert _document_xml(patched.getvalue()) == _document_xml(render_with_stream(original, edits))
+    assert paragraph_texts(patched.getvalue()) == paragraph_texts(render_with_python_docx(original, edits))
+
+
+def test_renditions_share_the_template_budget():
+    first, second = DocxTemplate(io.BytesIO(build_resume())), DocxTemplate(io.BytesIO(build_resume(bullets=12)))
+    templates = TemplateCache(first.nbytes + second.nbytes + 64 * 1024)
+    renditions = RenditionCache(templates, max_entries=8)
+    templates.get("first", lambda: first)
+    renditions.put(("job", 1), first.rendition({1: "Edited"}))
+    assert renditions.get(("job", 1), first) is not None
+    assert templates.bytes == first.nbytes + renditions.bytes > first.nbytes
+
+    # Caching a template that doesn't fit evicts the least recently used one, and its renditions with it
+    templates.max_bytes = first.nbytes + second.nbytes - 1
+    templates.get("second", lambda: second)
+    assert renditions.get(("job", 1), first) is None
+    assert renditions.bytes == 0 and templates.bytes == second.nbytes
+
+    # Renditions of templates the cache doesn't hold are never kept
+    renditions.put(("job", 2), first.rendition({}))
+    assert renditions.stats()["entries"] == 0
+
+
+def test_render_template_patches_the_last_rendition(monkeypatch):
+    template = DocxTemplate(io.BytesIO(build_large_resume()))
+    renditions = RenditionCache(TemplateCache(64 * 1024 * 1024), max_entries=4)
+    renditions.templates.get("large", lambda: template)
+    monkeypatch.setattr(resume_generator, "get_rendition_cache", lambda: renditions)
+
+    edits = {1: "Rewritten summary", 5: "Rewritten bullet"}
+    render_template(template, edits, io.BytesIO(), rendition_key=("job", 1))
+    edits[5] = "Rewritten again"
+    output = io.BytesIO()
+    render_template(template, edits, output, rendition_key=("job", 1))
+    assert renditions.stats()["hits"] == 1 and renditions.stats()["patched_paragraphs"] == 1
+    assert _document_xml(output.getvalue()) == _document_xml(render_with_stream(build_large_resume(), edits))
+
+    # Other keys never start from another job's rendition
+    render_template(template, {}, io.BytesIO(), rendition_key=("job", 2))
+    assert renditions.stats()["misses"] == 2
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+from docx import Document
+
+from ..models import Resume
+from ..resume_generator import extract_plan_skeleton
+from ..resume_index import INDEX_VERSION, build_resume_index, compute_edits, is_current_index, plan_skeleton_from_index
+from .conftest import build_resume_docx
+
+
+def _literal_bullet_resume(path: str) -> str:
+    doc = Document()
+    doc.add_paragraph("PROFESSIONAL SUMMARY")
+    doc.add_paragraph("First summary line.")
+    doc.add_paragraph("Second summary line.")
+    doc.add_paragraph("")
+    doc.add_paragraph("EXPERIENCE")
+    doc.add_paragraph("Acme Corp")
+    doc.add_paragraph("Engineer, 2020 - 2024")
+    doc.add_paragraph("• Built billing")
+    doc.add_paragraph("• Cut costs")
+    doc.add_paragraph("• Wrote docs")
+    doc.add_paragraph("SKILLS")
+    doc.add_paragraph("Python")
+    doc.save(path)
+    return path
+
+
+def test_index_records_sections_summary_and_entries(tmp_path):
+    index = build_resume_index(build_resume_docx(str(tmp_path / "r.docx")))
+    assert index["version"] == INDEX_VERSION and is_current_index(index)
+    assert index["paragraph_count"] == 12
+    assert [(s["kind"], s["header_ordinal"], s["end"]) for s in index["sections"]] == \
+        [("summary", 1, 3), ("experience", 3, 10), ("stop", 10, 12)]
+    assert index["summary"] == {"ordinals": [2], "texts": ["Backend engineer with eight years of experience building services."]}
+    assert [(e["header"], e["header_ordinals"], [b["ordinal"] for b in e["bullets"]]) for e in index["entries"]] == \
+        [("Engineer 0 | Company 0 | 2010 - 2011", [4], [5, 6]), ("Engineer 1 | Company 1 | 2011 - 2012", [7], [8, 9])]
+    assert index["entries"][0]["bullets"][0]["style"] == {"word_list": True, "literal_prefix": None}
+    # The index survives a JSON round trip (it is stored as a column)
+    assert plan_skeleton_from_index(json.loads(json.dumps(index))) == extract_plan_skeleton(str(tmp_path / "r.docx"))
+
+
+def test_multi_line_headers_and_literal_bullets(tmp_path):
+    index = build_resume_index(_literal_bullet_resume(str(tmp_path / "r.docx")))
+    assert index["summary"]["ordinals"] == [1, 2]
+    entry, = index["entries"]
+    assert (entry["header"], entry["header_ordinals"]) == ("Acme Corp | Engineer, 2020 - 2024", [5, 6])
+    assert entry["bullets"][0]["style"] == {"word_list": False, "literal_prefix": "• "}
+
+
+def test_outdated_indexes_are_not_current(tmp_path):
+    index = build_resume_index(build_resume_docx(str(tmp_path / "r.docx")))
+    assert not is_current_index(None)
+    assert not is_current_index({**index, "version": INDEX_VERSION - 1})
+    assert not is_current_index({**index, "classifier": "other vocabulary"})
+
+
+def test_compute_edits(tmp_path):
+    index = build_resume_index(_literal_bullet_resume(str(tmp_path / "r.docx")))
+    plan = {"summary": {"optimized": "One better summary."},
+            "experience_entries": [{"optimized_bullets": ["Built billing v2", "• Cut costs 30%"]}]}
+    assert compute_edits(index, plan) == {1: "One better summary.", 2: None, 7: "• Built billing v2", 8: "• Cut costs 30%", 9: None}
+
+    # Surplus optimized bullets become extra lines of the last rewritten bullet
+    plan["experience_entries"][0]["optimized_bullets"] += ["Mentored two engineers", "Ran the on-call rotation"]
+    edits = compute_edits(index, plan)
+    assert (edits[7], edits[8]) == ("• Built billing v2", "• Cut costs 30%")
+    assert edits[9] == "• Mentored two engineers\n• Ran the on-call rotation"
+
+
+def test_upload_indexes_once_and_old_rows_are_indexed_on_use(client, db, make_job, tmp_path):
+    path = build_resume_docx(str(tmp_path / "upload.docx"), name="Index Upload")
+    with open(path, "rb") as f:
+        uploaded = client.post("/upload-resume", files={"file": ("upload.docx", f.read())}).json()["data"]
+    resume = db.query(Resume).filter(Resume.id == uploaded["resume_id"]).one()
+    assert is_current_index(json.loads(resume.structure_index))
+
+    resume.structure_index = None
+    db.commit()
+    response = client.post("/preview-optimization", json={"job_id": make_job().id, "resume_id": resume.id})
+    assert response.status_code == 200
+    db.expire_all()
+    assert is_current_index(json.loads(db.query(Resume).filter(Resume.id == resume.id).one().structure_index))
@@ -0,0 +1,95 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+import os
+import pytest
+
+# Offline: job pages are read from the fixture corpus, never fetched
+from .. import scraper
+from ..job_extractors import SiteAdapter, adapter_for, extract_job_posting, read_json_ld, register_adapter, _adapters
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "job_pages")
+
+with open(os.path.join(FIXTURES_DIR, "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+
+def _page(name: str) -> bytes:
+    with open(os.path.join(FIXTURES_DIR, name), "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_extract_fixture(name):
+    expected = EXPECTED[name]
+    posting = extract_job_posting(_page(name), expected["url"])
+    assert posting["adapter"] == expected["adapter"]
+    assert posting["source"] == expected["source"]
+    assert posting["title"] == expected["title"]
+    assert posting["company_name"] == expected["company_name"]
+    for snippet in expected["description_contains"]:
+        assert snippet in posting["description"]
+    for snippet in expected["description_excludes"]:
+        assert snippet not in posting["description"]
+
+
+def test_json_ld_skips_breadcrumbs_and_malformed_blocks():
+    assert read_json_ld(_page("monster_jsonld_graph.html"))["title"] == "Java Developer"
+    # Truncated JSON is ignored rather than raised
+    assert read_json_ld(_page("monster_container.html")) is None
+    assert read_json_ld(b"<html><body>No structured data</body></html>") is None
+
+
+def test_company_falls_back_to_url_slug():
+    page = b"<html><head><title>Job</title></head><body><article><p>Build things.</p></article></body></html>"
+    posting = extract_job_posting(page, "https://www.linkedin.com/jobs/view/java-developer-at-acme-corp-4344831856")
+    assert posting["company_name"] == "Acme Corp"
+    assert posting["description"] == "Build things."
+
+
+@pytest.mark.parametrize("url, adapter", [
+    ("https://www.linkedin.com/jobs/view/1", "linkedin"),
+    ("https://uk.linkedin.com/jobs/view/1", "linkedin"),
+    ("https://www.monster.com/job-openings/qa--7c1d", "monster"),
+    ("https://notlinkedin.com/jobs/view/1", "generic"),
+    ("https://linkedin.com.example.org/jobs", "generic"),
+])
+def test_adapters_match_hosts_and_subdomains(url, adapter):
+    assert adapter_for(url).name == adapter
+
+
+def test_registered_adapter_takes_precedence():
+    adapter = SiteAdapter("example", hosts=("jobs.example.com",), description_classes=("posting-body",),
+                          company_classes=("employer",))
+    register_adapter(adapter)
+    try:
+        page = (b'<html><body><span class="employer">Example Co</span><article>Sidebar</article>'
+                b'<div class="posting-body"><p>Own the roadmap.</p></div></body></html>')
+        url = "https://careers.jobs.example.com/123"
+        assert adapter_for(url) is adapter
+        posting = extract_job_posting(page, url)
+        assert (posting["company_name"], posting["description"], posting["source"]) == ("Example Co", "Own the roadmap.", "container")
+    finally:
+        _adapters.remove(adapter)
+
+
+def test_scrape_job_posting_reads_fetched_page(monkeypatch):
+    expected = EXPECTED["linkedin_container.html"]
+
+    class FakeClient:
+        def fetch(self, url, headers=None):
+            return {"url": url, "status_code": 200, "headers": {"ETag": '"v1"'}, "content": _page("linkedin_container.html")}
+
+    monkeypatch.setattr(scraper, "get_http_client", lambda: FakeClient())
+    scraped = scraper.scrape_job_posting(expected["url"])
+    assert scraped["company_name"] == expected["company_name"]
+    assert scraped["etag"] == '"v1"' and scraped["last_modified"] is None
+    assert not scraped["not_modified"]
+    assert expected["description_contains"][0] in scraped["description"]
+
+
+def test_normalize_job_url_drops_tracking_and_fragment():
+    assert scraper.normalize_job_url(" HTTPS://WWW.LinkedIn.com/jobs/view/4344831856/?refId=abc&trackingId=x%3D&trk=public_jobs&utm_source=mail#top ") == \
+        "https://www.linkedin.com/jobs/view/4344831856/"
+    assert scraper.normalize_job_url("https://www.monster.com/job-openings/qa--7c1d?id=42&utm_medium=feed") == \
+        "https://www.monster.com/job-openings/qa--7c1d?id=42"
@@ -0,0 +1,84 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+import random
+import pytest
+from docx import Document
+
+from ..section_classifier import LOCALE_VOCABULARIES, SECTION_KINDS, SectionClassifier, load_vocabulary
+
+EN = LOCALE_VOCABULARIES["en"]
+
+
+def _substring_scan(vocabulary: dict, lower_text: str):
+    """ The pre-compilation rule: the first kind (in priority order) with any term in the text. """
+    for kind in SECTION_KINDS:
+        if any(term in lower_text for term in vocabulary[kind]):
+            return kind
+    return None
+
+
+@pytest.mark.parametrize("text, kind", [
+    ("professional experience", "experience"),
+    ("summary of experience", "experience"), # experience outranks summary wherever it appears
+    ("skills summary", "summary"),
+    ("technical skills", "stop"),
+    ("references", None),
+])
+def test_header_kind_priority(text, kind):
+    assert SectionClassifier(EN).header_kind(text) == kind
+
+
+def test_compiled_pattern_matches_the_substring_scan():
+    vocabulary = load_vocabulary(["de", "fr", "es"])
+    classifier = SectionClassifier(vocabulary)
+    terms = [t for kind in SECTION_KINDS for t in vocabulary[kind]] + ["and", "my", "notes", "2024"]
+    rng = random.Random(0)
+    for _ in range(2000):
+        text = " ".join(rng.choice(terms) for _ in range(rng.randint(1, 4))).lower()
+        assert classifier.header_kind(text) == _substring_scan(vocabulary, text), text
+
+
+def test_classify_paragraph_kinds():
+    doc = Document()
+    doc.add_heading("Work History", level=1)
+    doc.add_paragraph("EDUCATION")
+    doc.add_paragraph().add_run("Profile").bold = True
+    doc.add_paragraph("Profile of a long-serving engineer with deep experience in payments")
+    doc.add_paragraph("Owned payments", style="List Bullet")
+    doc.add_paragraph("– Dash bullet")
+    doc.add_paragraph("Senior Engineer | Acme")
+    doc.add_paragraph("   ")
+    doc.add_paragraph("REFERENCES")
+    assert SectionClassifier(EN).classify_document(doc) == [
+        ("experience_section_header", "Work History"),
+        ("stop_section_header", "EDUCATION"),
+        ("summary_section_header", "Profile"),
+        ("text", "Profile of a long-serving engineer with deep experience in payments"),
+        ("bullet", "Owned payments"),
+        ("bullet", "– Dash bullet"),
+        ("text", "Senior Engineer | Acme"),
+        ("empty", ""),
+        ("text", "REFERENCES"),
+    ]
+
+
+def test_load_vocabulary_merges_locales_and_a_custom_file(tmp_path):
+    path = tmp_path / "headers.json"
+    path.write_text(json.dumps({"experience": ["Track Record"], "stop": ["Publications"]}), encoding="utf-8")
+    vocabulary = load_vocabulary(["de", "xx"], str(path))
+    assert "berufserfahrung" in vocabulary["experience"] and "Track Record" in vocabulary["experience"]
+    assert vocabulary["summary"][:len(EN["summary"])] == EN["summary"]
+
+    classifier = SectionClassifier(vocabulary)
+    assert classifier.header_kind("track record") == "experience"
+    assert classifier.header_kind("publications") == "stop"
+    assert classifier.signature != SectionClassifier(EN).signature
+    # The signature only depends on the vocabulary, not on term order or case
+    reordered = {kind: [t.upper() for t in reversed(terms)] for kind, terms in vocabulary.items()}
+    assert SectionClassifier(reordered).signature == classifier.signature
+
+
+def test_empty_vocabulary_classifies_no_headers():
+    assert SectionClassifier({}).header_kind("experience") is None
+
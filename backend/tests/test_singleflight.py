@@ -0,0 +1,174 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import datetime
+import os
+import shutil
+import httpx
+
+from .. import singleflight
+from ..artifact_store import get_artifact_store
+from ..main import app
+from ..singleflight import AsyncSingleFlight, IdempotencyStore, request_fingerprint
+
+
+class _Work:
+    """ A computation that counts its runs and finishes when released. """
+
+    def __init__(self, result="done", error=None):
+        self.result = result
+        self.error = error
+        self.runs = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.runs += 1
+        await self.release.wait()
+        if self.error:
+            raise self.error
+        return self.result
+
+
+async def _start(flights, key, work, callers):
+    tasks = [asyncio.ensure_future(flights.do(key, work)) for _ in range(callers)]
+    await asyncio.sleep(0)
+    return tasks
+
+
+def test_concurrent_identical_calls_share_one_computation():
+    async def main():
+        flights, work = AsyncSingleFlight(), _Work()
+        tasks = await _start(flights, "same", work, 5)
+        assert flights.stats() == {"in_flight": 1, "started": 1, "coalesced": 4}
+        work.release.set()
+        assert await asyncio.gather(*tasks) == ["done"] * 5
+        assert work.runs == 1
+        assert flights.stats()["in_flight"] == 0
+
+    asyncio.run(main())
+
+
+def test_different_keys_and_later_calls_run_separately():
+    async def main():
+        flights, work = AsyncSingleFlight(), _Work()
+        work.release.set()
+        assert await asyncio.gather(flights.do("a", work), flights.do("b", work)) == ["done", "done"]
+        # Results are not cached once the flight has landed
+        assert await flights.do("a", work) == "done"
+        assert work.runs == 3
+
+    asyncio.run(main())
+
+
+def test_failure_reaches_every_waiter_and_is_not_remembered():
+    async def main():
+        flights, work = AsyncSingleFlight(), _Work(error=RuntimeError("model down"))
+        tasks = await _start(flights, "key", work, 3)
+        work.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        work.error = None
+        assert await flights.do("key", work) == "done"
+        assert work.runs == 2
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_work():
+    async def main():
+        flights, work = AsyncSingleFlight(), _Work()
+        first, second = await _start(flights, "key", work, 2)
+        first.cancel()
+        await asyncio.sleep(0)
+        work.release.set()
+        assert await second == "done"
+        assert first.cancelled()
+        assert work.runs == 1
+
+    asyncio.run(main())
+
+
+def test_request_fingerprint():
+    payload = {"job_id": 1, "resume_id": 2, "approved_plan": {"summary": "x", "entries": []}}
+    reordered = {"resume_id": 2, "approved_plan": {"entries": [], "summary": "x"}, "job_id": 1}
+    assert request_fingerprint("generate-resume", payload) == request_fingerprint("generate-resume", reordered)
+    assert request_fingerprint("generate-resume", payload) != request_fingerprint("preview-optimization", payload)
+    assert request_fingerprint("generate-resume", payload) != request_fingerprint("generate-resume", {**payload, "job_id": 3})
+    # Values JSON can't represent are hashed by their string form
+    assert request_fingerprint("x", {"at": datetime.date(2025, 1, 1)}) == request_fingerprint("x", {"at": "2025-01-01"})
+
+
+def test_idempotency_store_replays_within_the_window(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(singleflight.time, "time", lambda: now[0])
+    store = IdempotencyStore(window_seconds=60, max_entries=10)
+    store.set("generate-resume:key-1", "fp", {"filename": "a.docx"})
+    now[0] += 60
+    assert store.get("generate-resume:key-1") == ("fp", {"filename": "a.docx"})
+    now[0] += 1
+    assert store.get("generate-resume:key-1") is None
+    assert store.stats() == {"entries": 0, "hits": 1, "window_seconds": 60}
+
+
+def test_idempotency_store_evicts_oldest_first():
+    store = IdempotencyStore(window_seconds=60, max_entries=2)
+    store.set("a", "fa", 1)
+    store.set("b", "fb", 2)
+    store.set("a", "fa", 1) # refreshed: now newer than b
+    store.set("c", "fc", 3)
+    assert store.get("b") is None
+    assert store.get("a") == ("fa", 1) and store.get("c") == ("fc", 3)
+
+
+
+def test_idempotency_key_replays_the_response(client, make_job, make_resume, fake_provider):
+    job, resume = make_job(), make_resume()
+    body = {"job_id": job.id, "resume_id": resume.id}
+    first = client.post("/preview-optimization", json=body, headers={"Idempotency-Key": "k-1"})
+    calls = fake_provider.calls
+    replay = client.post("/preview-optimization", json=body, headers={"Idempotency-Key": "k-1"})
+    assert replay.headers["Idempotent-Replayed"] == "true" and "Idempotent-Replayed" not in first.headers
+    assert replay.json() == first.json() and fake_provider.calls == calls
+
+    # The same key with another body is rejected; keys are scoped per endpoint
+    assert client.post("/preview-optimization", json={**body, "api_key": "x"}, headers={"Idempotency-Key": "k-1"}).status_code == 422
+    generated = client.post("/generate-resume", json=body, headers={"Idempotency-Key": "k-1"})
+    assert generated.status_code == 200 and "Idempotent-Replayed" not in generated.headers
+
+
+def test_concurrent_identical_previews_share_one_model_call(client, make_job, make_resume, fake_provider, monkeypatch):
+    job, resume = make_job(), make_resume()
+    monkeypatch.setattr(fake_provider, "sample_latency", lambda rng: 0.2)
+    body = {"job_id": job.id, "resume_id": resume.id}
+    calls = fake_provider.calls
+
+    async def main():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+            return await asyncio.gather(*(http.post("/preview-optimization", json=body) for _ in range(4)))
+
+    responses = asyncio.run(main())
+    assert len({response.json()["plan_id"] for response in responses}) == 1
+    assert fake_provider.calls == calls + 1
+
+
+def test_streamed_documents_are_replayed_from_the_artifact_store(client, make_job, make_resume, fake_provider):
+    body = {"job_id": make_job().id, "resume_id": make_resume().id, "delivery": "stream"}
+    first = client.post("/generate-resume", json=body, headers={"Idempotency-Key": "stream-replay"})
+    _, entry = singleflight.get_idempotency_store().get("generate-resume:stream-replay")
+    # The store keeps the artifact key, never the document bytes
+    assert "content" not in entry and len(entry["artifact_key"]) == 64
+
+    replay = client.post("/generate-resume", json=body, headers={"Idempotency-Key": "stream-replay"})
+    assert replay.headers["idempotent-replayed"] == "true" and replay.content == first.content
+
+    # An evicted artifact is rendered again (from the stored plan) rather than replayed
+    shutil.rmtree(os.path.join(get_artifact_store().directory, entry["artifact_key"]))
+    calls = fake_provider.calls
+    again = client.post("/generate-resume", json=body, headers={"Idempotency-Key": "stream-replay"})
+    assert again.status_code == 200 and "idempotent-replayed" not in again.headers
+    assert again.content == first.content and fake_provider.calls == calls
+
+
+def test_link_results_keep_the_artifact_key_internal(client, make_job, make_resume):
+    result = client.post("/generate-resume", json={"job_id": make_job().id, "resume_id": make_resume().id}).json()
+    assert "artifact_key" not in result
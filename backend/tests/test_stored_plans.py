@@ -0,0 +1,65 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+
+from ..models import Plan
+
+
+def _preview(client, job, resume) -> dict:
+    response = client.post("/preview-optimization", json={"job_id": job.id, "resume_id": resume.id})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_preview_stores_its_plan(client, db, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    plan = _preview(client, job, resume)
+    stored = db.query(Plan).filter(Plan.id == plan["plan_id"]).one()
+    assert (stored.job_id, stored.resume_id) == (job.id, resume.id)
+    assert json.loads(stored.content)["experience_entries"] == plan["experience_entries"]
+    assert plan["company_name"] == "Initech"
+
+
+def test_generate_reuses_the_stored_plan_without_a_model_call(client, make_job, make_resume, fake_provider):
+    job, resume = make_job(), make_resume()
+    plan = _preview(client, job, resume)
+    calls = fake_provider.calls
+
+    by_id = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id, "plan_id": plan["plan_id"]}).json()
+    assert (by_id["plan_source"], by_id["plan_id"]) == ("stored", plan["plan_id"])
+    # Without a plan_id, the latest preview for the (job, resume) pair is used
+    latest = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id}).json()
+    assert (latest["plan_source"], latest["plan_id"]) == ("stored", plan["plan_id"])
+    assert fake_provider.calls == calls
+
+
+def test_latest_preview_wins(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    _preview(client, job, resume)
+    second = _preview(client, job, resume)
+    assert client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id}).json()["plan_id"] == second["plan_id"]
+
+
+def test_generate_without_a_stored_plan_generates_and_stores_one(client, db, make_job, make_resume, fake_provider):
+    job, resume = make_job(), make_resume()
+    calls = fake_provider.calls
+    result = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id}).json()
+    assert result["plan_source"] == "generated" and fake_provider.calls == calls + 1
+    assert db.query(Plan).filter(Plan.id == result["plan_id"], Plan.job_id == job.id).count() == 1
+
+
+def test_approved_plan_takes_precedence(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    plan = _preview(client, job, resume)
+    plan["summary"]["optimized"] = "Edited by hand."
+    result = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id, "approved_plan": plan}).json()
+    assert result["plan_source"] == "approved"
+
+
+def test_unknown_plan_id_is_404(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    other_job = make_job()
+    plan = _preview(client, other_job, resume)
+    # A plan belongs to its (job, resume) pair
+    response = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id, "plan_id": plan["plan_id"]})
+    assert response.status_code == 404
@@ -0,0 +1,118 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import json
+import random
+import pytest
+
+from ..stream_parser import IncrementalPlanParser
+
+PLAN = {
+    "company_name": "Acme \"Rockets\" {Inc}",
+    "summary": "Engineer with 10+ years.\nLikes [brackets], {braces}, \\ and ümlauts — plus \"quotes\".",
+    "entries": [
+        {"id": 0, "optimized_bullets": ["Cut p99 latency by 40%", "Led a team of 5, \"hands-on\""]},
+        {"id": 1, "optimized_bullets": []},
+        {"id": 2, "optimized_bullets": ["Migrated {services} to [k8s]"], "notes": {"nested": [1, [2, 3]]}},
+    ],
+    "score": 0.87,
+    "approved": False,
+    "reviewer": None,
+}
+RESPONSE = "```json\n" + json.dumps(PLAN, indent=2, ensure_ascii=False) + "\n```\nTrailing chatter {ignored}"
+
+
+def feed_chunks(chunks, array_keys=("entries",)) -> list:
+    parser = IncrementalPlanParser(array_keys=array_keys)
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+def expected_events() -> list:
+    events = []
+    for key, value in PLAN.items():
+        if key == "entries":
+            events.extend(("item", key, index, item) for index, item in enumerate(value))
+        events.append(("member", key, value))
+    return events
+
+
+def test_whole_response():
+    assert feed_chunks([RESPONSE]) == expected_events()
+
+
+def test_one_character_at_a_time():
+    assert feed_chunks(RESPONSE) == expected_events()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_random_chunk_boundaries(seed):
+    rng = random.Random(seed)
+    cuts = sorted(rng.sample(range(1, len(RESPONSE)), rng.randint(1, 40)))
+    chunks = [RESPONSE[start:end] for start, end in zip([0] + cuts, cuts + [len(RESPONSE)])]
+    assert feed_chunks(chunks) == expected_events()
+
+
+def test_items_are_reported_before_the_array_closes():
+    first_entry_end = RESPONSE.index('"id": 1')
+    parser = IncrementalPlanParser()
+    events = parser.feed(RESPONSE[:first_entry_end])
+    assert ("item", "entries", 0, PLAN["entries"][0]) in events
+    assert all(event[:2] != ("member", "entries") for event in events)
+    assert ("member", "summary", PLAN["summary"]) in events
+
+
+def test_primitive_array_items_including_the_last():
+    events = feed_chunks(['{"ids": [1, true, null, "x", 2.5], "empty": []}'], array_keys=("ids", "empty"))
+    assert events == [
+        ("item", "ids", 0, 1), ("item", "ids", 1, True), ("item", "ids", 2, None),
+        ("item", "ids", 3, "x"), ("item", "ids", 4, 2.5),
+        ("member", "ids", [1, True, None, "x", 2.5]),
+        ("member", "empty", []),
+    ]
+
+
+def test_untracked_arrays_report_only_the_member():
+    events = feed_chunks(['{"entries": [{"id": 0}], "tags": ["a", "b"]}'])
+    assert events == [("item", "entries", 0, {"id": 0}), ("member", "entries", [{"id": 0}]), ("member", "tags", ["a", "b"])]
+
+
+def test_nothing_after_the_closing_brace():
+    parser = IncrementalPlanParser()
+    assert parser.feed('{"summary": "done"}') == [("member", "summary", "done")]
+    assert parser.feed('\n{"summary": "second object"}') == []
+    assert parser.done
+
+
+def test_truncated_response_reports_only_complete_values():
+    cut = RESPONSE.index('"id": 2')
+    events = feed_chunks([RESPONSE[:cut]])
+    assert events == expected_events()[:4]
+
+
+def _sse_events(body: str) -> list:
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_preview_stream_sends_the_plan_piece_by_piece(client, make_job, make_resume):
+    job, resume = make_job(), make_resume()
+    response = client.post("/preview-optimization/stream", json={"job_id": job.id, "resume_id": resume.id})
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(response.text)
+    names = [name for name, _ in events]
+    assert names[0] == "plan" and names[-1] == "done"
+    assert names.count("entry") == 2 and "summary" in names and "company_name" in names
+
+    skeleton, final = events[0][1], events[-1][1]
+    assert skeleton["summary"]["optimized"] == "" and final["plan_id"]
+    entries = {data["id"]: data["optimized_bullets"] for name, data in events if name == "entry"}
+    assert [entries[i] for i in range(2)] == [entry["optimized_bullets"] for entry in final["experience_entries"]]
+    assert dict(events)["summary"] == final["summary"]["optimized"]
+    # The streamed plan is stored like a /preview-optimization one
+    generated = client.post("/generate-resume", json={"job_id": job.id, "resume_id": resume.id}).json()
+    assert (generated["plan_source"], generated["plan_id"]) == ("stored", final["plan_id"])
@@ -0,0 +1,113 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import io
+import os
+import threading
+import time
+import zipfile
+
+from .. import template_cache
+from ..docx_stream_renderer import DOCUMENT_PART, DocxTemplate, render_docx
+from ..template_cache import TemplateCache, file_content_hash, get_template
+from .conftest import build_resume_docx
+
+
+class _Template:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+def test_least_recently_used_templates_are_evicted_by_size():
+    cache = TemplateCache(max_bytes=100)
+    a, b, c, reloaded = _Template(40), _Template(40), _Template(40), _Template(40)
+    cache.get("a", lambda: a)
+    cache.get("b", lambda: b)
+    assert cache.get("a", lambda: None) is a # a is now more recent than b
+    cache.get("c", lambda: c)
+    assert cache.get("b", lambda: reloaded) is reloaded
+    # b made room for c, then a (now the least recent) for the reloaded b
+    assert cache.get("c", lambda: None) is c
+    assert cache.stats() == {"entries": 2, "bytes": 80, "max_bytes": 100, "hits": 2, "misses": 4,
+                             "hit_rate": 0.3333, "evictions": 2, "oversized": 0}
+
+
+def test_oversized_templates_are_returned_but_not_cached():
+    cache = TemplateCache(max_bytes=100)
+    small = cache.get("small", lambda: _Template(10))
+    big = _Template(500)
+    assert cache.get("big", lambda: big) is big
+    assert cache.get("small", lambda: None) is small
+    assert cache.stats()["oversized"] == 1 and cache.bytes == 10
+
+
+def test_concurrent_misses_parse_once():
+    cache = TemplateCache(max_bytes=100)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return _Template(1)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get("key", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(loads) == 1 and len({id(result) for result in results}) == 1
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 7
+
+
+def test_failed_parse_is_not_cached():
+    cache = TemplateCache(max_bytes=100)
+
+    def broken():
+        raise ValueError("not a docx")
+    try:
+        cache.get("key", broken)
+    except ValueError:
+        pass
+    assert cache.get("key", lambda: _Template(1)).nbytes == 1
+
+
+def test_templates_render_like_render_docx(tmp_path):
+    path = build_resume_docx(str(tmp_path / "resume.docx"))
+    template = DocxTemplate(path)
+    for edits in ({2: "New summary"}, {5: None, 6: "Only bullet"}, {}):
+        from_template, streamed = io.BytesIO(), io.BytesIO()
+        template.render(edits, from_template)
+        render_docx(path, edits, streamed)
+        assert _document_xml(from_template) == _document_xml(streamed)
+
+
+def _document_xml(package) -> bytes:
+    with zipfile.ZipFile(package) as zin:
+        assert zin.testzip() is None
+        return zin.read(DOCUMENT_PART)
+
+
+def test_get_template_is_keyed_by_resume_and_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(template_cache, "_cache", TemplateCache(64 * 1024 * 1024))
+    path = build_resume_docx(str(tmp_path / "resume.docx"))
+    first = get_template(path, resume_id=1)
+    assert get_template(path, resume_id=1) is first
+    assert get_template(path, resume_id=2) is not first
+    with open(path, "rb") as f:
+        assert get_template(io.BytesIO(f.read()), resume_id=1) is first
+
+    # A file replaced under the same id is parsed afresh
+    old_hash = file_content_hash(path)
+    build_resume_docx(path, name="Someone Else")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert file_content_hash(path) != old_hash
+    assert get_template(path, resume_id=1) is not first
+
+
+def test_disabled_cache_parses_every_time(tmp_path, monkeypatch):
+    monkeypatch.setattr(template_cache, "_cache", None)
+    monkeypatch.setattr(template_cache, "_renditions", None)
+    monkeypatch.setenv("TEMPLATE_CACHE_MAX_MB", "0")
+    path = build_resume_docx(str(tmp_path / "resume.docx"))
+    assert get_template(path, resume_id=1) is not get_template(path, resume_id=1)
+    assert template_cache.get_rendition_cache() is None
@@ -0,0 +1,163 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import hashlib
+import io
+import os
+import pytest
+
+from .. import upload_store
+from ..upload_store import UploadFormError, UploadTooLargeError, store_upload, store_upload_stream
+from .conftest import build_resume_docx
+
+
+def test_uploads_are_stored_by_content_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_store, "UPLOAD_CHUNK_BYTES", 7)
+    data = b"resume bytes " * 100
+    stored = store_upload(io.BytesIO(data), "My Resume.DOCX", str(tmp_path))
+    digest = hashlib.sha256(data).hexdigest()
+    assert stored == {"content_hash": digest, "path": os.path.join(str(tmp_path), digest + ".docx"), "size": len(data)}
+    with open(stored["path"], "rb") as f:
+        assert f.read() == data
+
+
+def test_identical_uploads_share_a_file_and_same_names_never_collide(tmp_path):
+    first = store_upload(io.BytesIO(b"one"), "resume.pdf", str(tmp_path))
+    again = store_upload(io.BytesIO(b"one"), "copy.pdf", str(tmp_path))
+    other = store_upload(io.BytesIO(b"two"), "resume.pdf", str(tmp_path))
+    assert first["path"] == again["path"] != other["path"]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(s["path"]) for s in (first, other))
+
+
+def test_oversized_uploads_keep_nothing(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_store, "UPLOAD_CHUNK_BYTES", 4)
+    with pytest.raises(UploadTooLargeError):
+        store_upload(io.BytesIO(b"x" * 11), "resume.pdf", str(tmp_path), max_bytes=10)
+    assert os.listdir(tmp_path) == []
+    assert store_upload(io.BytesIO(b"x" * 10), "resume.pdf", str(tmp_path), max_bytes=10)["size"] == 10
+
+
+def test_upload_max_bytes_reads_the_environment(monkeypatch):
+    monkeypatch.setenv("UPLOAD_MAX_MB", "0.5")
+    assert upload_store.upload_max_bytes() == 512 * 1024
+
+
+def _upload(client, data: bytes, filename: str = "resume.docx"):
+    return client.post("/upload-resume", files={"file": (filename, data)})
+
+
+def test_reupload_returns_the_existing_resume(client, tmp_path):
+    with open(build_resume_docx(str(tmp_path / "resume.docx"), name="Upload Twice"), "rb") as f:
+        data = f.read()
+    first = _upload(client, data).json()["data"]
+    second = _upload(client, data, "renamed.docx").json()["data"]
+    assert first["duplicate"] is False
+    assert second == {"resume_id": first["resume_id"], "filename": "resume.docx", "duplicate": True}
+
+
+def test_oversized_upload_is_413(client, monkeypatch):
+    monkeypatch.setenv("UPLOAD_MAX_MB", str(1 / 1024)) # 1 KB
+    response = _upload(client, b"x" * 2048)
+    assert response.status_code == 413
+
+
+BOUNDARY = "resume-boundary"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _form(data: bytes, filename: str = "resume.pdf", name: str = "file") -> bytes:
+    head = (f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nhello\r\n"
+            f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+            "Content-Type: application/octet-stream\r\n\r\n")
+    return head.encode() + data + f"\r\n--{BOUNDARY}--\r\n".encode()
+
+
+def _chunks(body: bytes, size: int, read: list = None):
+    """ The body as a request stream in `size`-byte chunks, recording each chunk handed out. """
+    async def stream():
+        for i in range(0, len(body), size):
+            if read is not None:
+                read.append(i)
+            yield body[i:i + size]
+    return stream()
+
+
+def test_stream_parses_the_file_part_into_the_store(tmp_path):
+    data = b"%PDF resume " * 500
+    stored = asyncio.run(store_upload_stream(_chunks(_form(data, "CV.PDF"), 37), CONTENT_TYPE, str(tmp_path)))
+    digest = hashlib.sha256(data).hexdigest()
+    assert stored == {"content_hash": digest, "path": os.path.join(str(tmp_path), digest + ".pdf"),
+                      "size": len(data), "filename": "CV.PDF"}
+    assert os.listdir(tmp_path) == [digest + ".pdf"]
+
+
+def test_stream_rejects_a_declared_oversized_body_without_reading(tmp_path):
+    read = []
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(store_upload_stream(_chunks(b"x" * 10, 1, read), CONTENT_TYPE, str(tmp_path), max_bytes=10,
+                                        content_length=10 + upload_store.UPLOAD_FORM_OVERHEAD_BYTES + 1))
+    assert read == [] and os.listdir(tmp_path) == []
+
+
+def test_stream_stops_reading_once_the_file_crosses_the_cap(tmp_path):
+    read = []
+    body = _form(b"x" * 4096)
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(store_upload_stream(_chunks(body, 256, read), CONTENT_TYPE, str(tmp_path), max_bytes=1024))
+    assert len(read) < len(body) // 256 and os.listdir(tmp_path) == []
+
+
+@pytest.mark.parametrize("content_type, body", [
+    ("application/json", b"{}"),
+    (CONTENT_TYPE, _form(b"data", name="attachment")),
+    (CONTENT_TYPE, b"--another-boundary\r\n\r\n"),
+])
+def test_stream_without_the_file_part_is_a_form_error(tmp_path, content_type, body):
+    with pytest.raises(UploadFormError):
+        asyncio.run(store_upload_stream(_chunks(body, 64), content_type, str(tmp_path)))
+    assert os.listdir(tmp_path) == []
+
+
+def _post_chunks(chunks: list, headers: dict) -> tuple[int, int]:
+    """
+    POSTs the chunks to /upload-resume straight through the ASGI app (the test client reads
+    the whole body up front) and returns the status and how many chunks the app received.
+    """
+    from ..main import app
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1} for i, chunk in enumerate(chunks)]
+    received, sent = [], []
+
+    async def receive():
+        if len(received) < len(messages):
+            received.append(messages[len(received)])
+            return received[-1]
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+    scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+             "path": "/upload-resume", "raw_path": b"/upload-resume", "query_string": b"", "root_path": "",
+             "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+             "client": ("testclient", 50000), "server": ("testserver", 80)}
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], len(received)
+
+
+def test_oversized_content_length_is_413_before_the_body_is_read(monkeypatch):
+    monkeypatch.setenv("UPLOAD_MAX_MB", str(1 / 1024)) # 1 KB
+    body = _form(b"x" * 100 * 1024)
+    headers = {"Content-Type": CONTENT_TYPE, "Content-Length": str(len(body))}
+    assert _post_chunks([body[i:i + 1024] for i in range(0, len(body), 1024)], headers) == (413, 0)
+
+
+def test_chunked_upload_is_cut_off_at_the_cap(monkeypatch):
+    monkeypatch.setenv("UPLOAD_MAX_MB", str(1 / 1024)) # 1 KB
+    body = _form(b"x" * 200 * 1024)
+    status, received = _post_chunks([body[i:i + 1024] for i in range(0, len(body), 1024)], {"Content-Type": CONTENT_TYPE})
+    assert status == 413 and received < 5
+    assert not [name for name in os.listdir("backend/uploads") if name.endswith(".part")]
+
+
+def test_upload_without_a_file_is_422(client):
+    response = client.post("/upload-resume", data={"note": "no file"})
+    assert response.status_code == 422
@@ -0,0 +1,194 @@
+# Copyright (c) 2025 Veekshith Gullapudi. All rights reserved.
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+
+# Support both Lambda (relative) and local dev (absolute) imports
+try:
+    from .resume_parser import parse_resume
+    from .resume_index import build_resume_index
+    from .process_pool import run_in_process_pool_async
+except ImportError:
+    from resume_parser import parse_resume
+    from resume_index import build_resume_index
+    from process_pool import run_in_process_pool_async
+
+try:
+    from python_multipart.exceptions import FormParserError
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError: # python-multipart before 0.0.13 installs as "multipart"
+    from multipart.exceptions import FormParserError
+    from multipart.multipart import MultipartParser, parse_options_header
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+DEFAULT_UPLOAD_MAX_MB = 10
+# Room for the multipart boundaries and part headers around the file itself
+UPLOAD_FORM_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """ The upload exceeded the size cap; nothing was stored. """
+
+
+class UploadFormError(ValueError):
+    """ The request body was not a multipart form carrying the expected file. """
+
+
+def upload_max_bytes() -> int:
+    """ Size cap for uploaded resumes (UPLOAD_MAX_MB, default 10 MB). """
+    return int(float(os.getenv("UPLOAD_MAX_MB", DEFAULT_UPLOAD_MAX_MB)) * 1024 * 1024)
+
+
+class _ContentAddressedWriter:
+    """
+    One upload on its way into content-addressed storage: chunks go to a temp file in
+    upload_dir, hashed and counted against the cap as they arrive; commit() moves the file
+    to <sha256><ext> and discard() removes whatever was written.
+    """
+
+    def __init__(self, upload_dir: str, max_bytes: int):
+        os.makedirs(upload_dir, exist_ok=True)
+        self.upload_dir = upload_dir
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._hasher = hashlib.sha256()
+        fd, self._temp_path = tempfile.mkstemp(dir=upload_dir, suffix=".part")
+        self._out = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(f"Upload exceeds {self.max_bytes} bytes")
+        self._hasher.update(chunk)
+        self._out.write(chunk)
+
+    def commit(self, filename: str) -> dict:
+        self._out.close()
+        content_hash = self._hasher.hexdigest()
+        path = os.path.join(self.upload_dir, content_hash + os.path.splitext(filename or "")[1].lower())
+        # Same content, same name: an existing copy is already correct
+        os.replace(self._temp_path, path)
+        return {"content_hash": content_hash, "path": path, "size": self.size}
+
+    def discard(self):
+        self._out.close()
+        if os.path.exists(self._temp_path):
+            os.remove(self._temp_path)
+
+
+def store_upload(fileobj, filename: str, upload_dir: str, max_bytes: int = None) -> dict:
+    """
+    Streams an uploaded file into content-addressed storage, computing its SHA-256 in the
+    same pass and enforcing the size cap while reading. The file ends up at
+    <upload_dir>/<sha256><ext>, so identical uploads share one file and uploads with the
+    same name never overwrite each other. Returns content_hash, path and size.
+    Raises UploadTooLargeError (and keeps nothing) once the cap is exceeded.
+    """
+    writer = _ContentAddressedWriter(upload_dir, upload_max_bytes() if max_bytes is None else max_bytes)
+    try:
+        while chunk := fileobj.read(UPLOAD_CHUNK_BYTES):
+            writer.write(chunk)
+        return writer.commit(filename)
+    except BaseException:
+        writer.discard()
+        raise
+
+
+async def store_upload_stream(chunks, content_type: str, upload_dir: str, max_bytes: int = None,
+                              content_length: int = None, field_name: str = "file") -> dict:
+    """
+    store_upload for a raw multipart/form-data request body, so the upload is never spooled
+    in full first: the body is parsed as it arrives and the bytes of the `field_name` file
+    part go straight to content-addressed storage (disk writes run in a thread).
+    A declared content_length over the cap (plus UPLOAD_FORM_OVERHEAD_BYTES of form framing)
+    is rejected before anything is read; otherwise reading stops as soon as the file or the
+    body crosses it. Returns store_upload's fields plus the part's filename.
+    Raises UploadTooLargeError or UploadFormError, keeping nothing.
+    """
+    max_bytes = upload_max_bytes() if max_bytes is None else max_bytes
+    max_body = max_bytes + UPLOAD_FORM_OVERHEAD_BYTES
+    if content_length is not None and content_length > max_body:
+        raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+    media_type, options = parse_options_header(content_type or "")
+    if media_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise UploadFormError("Expected a multipart/form-data body")
+
+    headers, header = {}, [b"", b""]
+    pending = [] # file bytes parsed from the current chunk, written after it
+    state = {"in_file": False, "filename": None}
+
+    def on_header_field(data, start, end):
+        header[0] += data[start:end]
+
+    def on_header_value(data, start, end):
+        header[1] += data[start:end]
+
+    def on_header_end():
+        headers[header[0].lower()] = header[1]
+        header[:] = [b"", b""]
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(headers.pop(b"content-disposition", b""))
+        headers.clear()
+        filename = disposition.get(b"filename")
+        # Only the first matching file part is stored; any later ones are skipped
+        state["in_file"] = (state["filename"] is None and filename is not None
+                            and disposition.get(b"name") == field_name.encode())
+        if state["in_file"]:
+            state["filename"] = filename.decode("utf-8", errors="replace")
+
+    def on_part_data(data, start, end):
+        if state["in_file"]:
+            pending.append(data[start:end])
+
+    def on_part_end():
+        state["in_file"] = False
+
+    parser = MultipartParser(options[b"boundary"], {
+        "on_header_field": on_header_field, "on_header_value": on_header_value, "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished, "on_part_data": on_part_data, "on_part_end": on_part_end,
+    })
+    writer = await asyncio.to_thread(_ContentAddressedWriter, upload_dir, max_bytes)
+    try:
+        received = 0
+        async for chunk in chunks:
+            received += len(chunk)
+            if received > max_body:
+                raise UploadTooLargeError(f"Upload exceeds {max_bytes} bytes")
+            parser.write(chunk)
+            if pending:
+                data = b"".join(pending)
+                pending.clear()
+                await asyncio.to_thread(writer.write, data)
+        parser.finalize()
+        if state["filename"] is None:
+            raise UploadFormError(f"The form has no '{field_name}' file")
+        stored = await asyncio.to_thread(writer.commit, state["filename"])
+    except FormParserError as e:
+        writer.discard()
+        raise UploadFormError(f"Malformed multipart body: {e}") from e
+    except BaseException:
+        writer.discard()
+        raise
+    return {**stored, "filename": state["filename"]}
+
+
+def analyze_upload(path: str, content_hash: str = None) -> tuple[str, str]:
+    """ Extracts the text and (for DOCX) the JSON structure index of a stored upload. """
+    content = parse_resume(path, content_hash)
+    structure_index = json.dumps(build_resume_index(path)) if path.lower().endswith(".docx") else None
+    return content, structure_index
+
+
+async def analyze_upload_async(path: str, content_hash: str = None) -> tuple[str, str]:
+    """
+    analyze_upload off the event loop. DOCX parsing runs in the shared process pool; PDFs
+    are driven from a thread because their pages are extracted across the pool in parallel
+    (see resume_parser.extract_text_from_pdf).
+    """
+    if path.lower().endswith(".pdf"):
+        return await asyncio.to_thread(analyze_upload, path, content_hash)
+    return await run_in_process_pool_async(analyze_upload, path, content_hash)
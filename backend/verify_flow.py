@@ -6,7 +6,8 @@ from docx import Document
 # Add backend to path
 sys.path.append(os.path.join(os.getcwd(), 'backend'))
 
-from resume_generator import get_optimization_plan, generate_tailored_resume, _get_paragraph_info
+from resume_generator import get_optimization_plan, generate_tailored_resume
+from section_classifier import get_classifier
 
 def verify():
     # 1. Setup paths
@@ -20,12 +21,11 @@ def verify():
 
     print(f"--- 1. Testing Paragraph Detection ---")
     doc = Document(resume_path)
-    experience_headers = ["experience", "professional experience"]
-    summary_headers = ["summary", "profile"]
-    stop_headers = ["education", "skills"]
+    classifier = get_classifier()
+    style_cache = {}
     
     for i, p in enumerate(doc.paragraphs[:20]):
-        p_type, text = _get_paragraph_info(p, experience_headers, summary_headers, stop_headers)
+        p_type, text = classifier.classify(p, style_cache)
         if text:
             print(f"[{p_type}] {text[:50]}...")
 
@@ -1,7 +1,7 @@
 import { useState } from 'react';
 import './App.css';
 
-import { validateUrl, uploadResume, generateResume, getDownloadUrl, previewOptimization } from './api';
+import { validateUrl, uploadResume, generateResume, getDownloadUrl, previewOptimizationStream } from './api';
 import ResumePreview from './ResumePreview';
 import OptimizationReview from './OptimizationReview';
 
@@ -95,7 +95,12 @@ function App() {
     setStatus('previewing');
 
     try {
-      const plan = await previewOptimization(resumeId, jobId, apiKey);
+      let completedEntries = 0;
+      const plan = await previewOptimizationStream(resumeId, jobId, apiKey, (event, data) => {
+        if (event === 'company_name') setMessage(`Tailoring your resume for ${data}...`);
+        if (event === 'summary') setMessage('Summary optimized, rewriting experience...');
+        if (event === 'entry') setMessage(`Optimized ${++completedEntries} experience entries...`);
+      });
       setOptimizationPlan(plan);
       setStatus('reviewing');
       setMessage('Optimization plan ready for review.');
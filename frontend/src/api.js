@@ -60,6 +60,62 @@ export const previewOptimization = async (resumeId, jobId, apiKey = null) => {
     }
 };
 
+/**
+ * Streams the optimization plan over Server-Sent Events.
+ * @param {Function} onEvent - Called with (eventName, data) for each event as it arrives.
+ * @returns {Promise<Object>} - The final plan (payload of the 'done' event).
+ */
+export async function previewOptimizationStream(resumeId, jobId, apiKey = null, onEvent = () => {}) {
+    const response = await fetch(`${API_URL}/preview-optimization/stream`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            resume_id: resumeId,
+            job_id: jobId,
+            api_key: apiKey
+        }),
+    });
+
+    if (!response.ok || !response.body) {
+        throw new Error('Failed to start preview');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let finalPlan = null;
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+            const rawEvent = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let eventName = 'message';
+            let data = '';
+            for (const line of rawEvent.split('\n')) {
+                if (line.startsWith('event:')) eventName = line.slice(6).trim();
+                else if (line.startsWith('data:')) data += line.slice(5).trim();
+            }
+            const payload = data ? JSON.parse(data) : null;
+            if (eventName === 'done') finalPlan = payload;
+            onEvent(eventName, payload);
+        }
+    }
+
+    if (!finalPlan) {
+        throw new Error('Preview stream ended unexpectedly');
+    }
+    return finalPlan;
+}
+
 export async function generateResume(resumeId, jobId, apiKey = null, approvedPlan = null) {
     const response = await fetch(`${API_URL}/generate-resume`, {
         method: 'POST',
@@ -70,14 +126,15 @@ export async function generateResume(resumeId, jobId, apiKey = null, approvedPla
             resume_id: resumeId,
             job_id: jobId,
             api_key: apiKey,
-            approved_plan: approvedPlan
+            approved_plan: approvedPlan,
+            plan_id: approvedPlan ? approvedPlan.plan_id : null
         }),
     });
 
     if (!response.ok) {
         throw new Error('Failed to start generation');
     }
-    return response.json(); // { message: "...", download_url: "..." }
+    return response.json(); // { message: "...", download_url: "...", plan_id, plan_source }
 }
 
 /**
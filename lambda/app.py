@@ -5,7 +5,7 @@ import uuid
 from s3_utils import read_json, write_json, upload_file, generate_presigned_url
 from ddb_utils import get_item
 from url_scraper import scrape_job_description
-from gemini_client import GeminiClient
+from gemini_client import generate_content, get_client
 from prompt_templates import get_resume_rewrite_prompt
 
 # Configure logging
@@ -77,11 +77,11 @@ def handler(event, context):
              job_description_text = "No job description available."
 
         # 4. Generate Content with Gemini
-        client = GeminiClient(secret_name=GEMINI_SECRET_NAME)
+        client = get_client(secret_name=GEMINI_SECRET_NAME)
         prompt = get_resume_rewrite_prompt(resume_content, job_description_text)
         
         # Call AI
-        new_resume_text = client.generate_content(prompt)
+        new_resume_text = generate_content(client, prompt)
         
         if not new_resume_text:
             raise RuntimeError("Gemini returned no content")
@@ -1,16 +1,28 @@
 import os
 import json
-import time
+import threading
 import requests
 import logging
 import boto3
+# Copies of backend/llm_shared.py (the provider interface, the fake and record/replay) and
+# backend/llm_scheduler.py (the RPM/TPM quota and retries)
+from llm_shared import LLMProvider, fake_provider_from_env, select_provider
+from llm_scheduler import get_scheduler
 
 logger = logging.getLogger()
 
-class GeminiClient:
+# Expected response size, charged against the tokens-per-minute quota up front (as in the backend)
+EXPECTED_OUTPUT_TOKENS = int(os.environ.get("LLM_EXPECTED_OUTPUT_TOKENS", 1000))
+
+class GeminiClient(LLMProvider):
+    """ Gemini over its REST API, with the key from Secrets Manager (or GEMINI_API_KEY) sent in a header. """
+
+    name = "gemini"
+    model_name = "gemini-1.5-flash"
+
     def __init__(self, secret_name=None, region_name='us-east-1'):
         self.api_key = self._get_api_key(secret_name, region_name)
-        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.api_key}"
+        self.api_url = f"https://generativelanguage.googleapis.com/v1beta/models/{self.model_name}:generateContent"
 
     def _get_api_key(self, secret_name, region_name):
         if not secret_name:
@@ -29,39 +41,54 @@ class GeminiClient:
             logger.error(f"Error retrieving secret {secret_name}: {str(e)}")
             raise
 
-    def generate_content(self, prompt, max_retries=3):
+    def generate(self, prompt):
         """
-        Generates content using Gemini API with exponential backoff.
+        One generateContent call. Raises requests.exceptions.RequestException on HTTP and
+        connection errors; returns None for a response without candidates.
         """
         payload = {
             "contents": [{
                 "parts": [{"text": prompt}]
             }]
         }
-        headers = {'Content-Type': 'application/json'}
-        
-        for attempt in range(max_retries):
-            try:
-                response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
-                response.raise_for_status()
-                
-                result = response.json()
-                # Extract text from response
-                if 'candidates' in result and result['candidates']:
-                    return result['candidates'][0]['content']['parts'][0]['text']
-                else:
-                    logger.warning(f"Unexpected response format from Gemini: {result}")
-                    return None
-                    
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    sleep_time = (2 ** attempt) # Exponential backoff: 1s, 2s, 4s
-                    time.sleep(sleep_time)
-                else:
-                    logger.error("Max retries reached for Gemini API")
-                    raise
-            except Exception as e:
-                logger.error(f"Unexpected error calling Gemini API: {str(e)}")
-                raise
+        headers = {'Content-Type': 'application/json', 'x-goog-api-key': self.api_key}
+        response = requests.post(self.api_url, headers=headers, json=payload, timeout=30)
+        response.raise_for_status()
+
+        result = response.json()
+        # Extract text from response
+        if 'candidates' in result and result['candidates']:
+            return result['candidates'][0]['content']['parts'][0]['text']
+        logger.warning(f"Unexpected response format from Gemini: {result}")
+        return None
+
+
+def generate_content(client, prompt):
+    """
+    Generates content with any provider under the backend's quota scheduler: calls wait for
+    GEMINI_RPM / GEMINI_TPM headroom, tracked in SQLite under /tmp so invocations sharing a
+    warm container share the quota, and 429/5xx/connection errors (real or injected by the
+    fake) are retried with jittered backoff that honors Retry-After (LLM_MAX_RETRIES).
+    """
+    return get_scheduler().run(lambda: client.generate(prompt), tokens=client.count_tokens(prompt) + EXPECTED_OUTPUT_TOKENS)
+
+
+_fake_provider = None
+_fake_lock = threading.Lock()
+
+def _get_fake_provider():
+    """ One fake per warm container, so its seeded latency/error sequence spans invocations. """
+    global _fake_provider
+    with _fake_lock:
+        if _fake_provider is None:
+            _fake_provider = fake_provider_from_env()
+        return _fake_provider
+
 
+def get_client(secret_name=None):
+    """
+    Returns the provider selected by LLM_PROVIDER, chosen exactly as the backend's
+    get_provider does (see llm_shared.select_provider): gemini (default), fake, record or
+    replay. Point LLM_RECORD_DIR at /tmp inside Lambda.
+    """
+    return select_provider(lambda: GeminiClient(secret_name=secret_name), GeminiClient.model_name, _get_fake_provider)
@@ -1,9 +1,64 @@
+import os
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import logging
 
 logger = logging.getLogger()
 
+# (connect, read) seconds; the read timeout applies to each read of the body
+TIMEOUT = (float(os.environ.get('SCRAPER_CONNECT_TIMEOUT', 5)), float(os.environ.get('SCRAPER_READ_TIMEOUT', 10)))
+# Bound on the whole fetch, so a server dripping bytes can't stay under the read timeout forever
+TOTAL_TIMEOUT = float(os.environ.get('SCRAPER_TOTAL_TIMEOUT', 30))
+MAX_BYTES = int(float(os.environ.get('SCRAPER_MAX_MB', 5)) * 1024 * 1024)
+CHUNK_BYTES = 64 * 1024
+
+# One session per container: warm invocations reuse its pooled keep-alive connections
+# (one pool per host) instead of paying a new TCP+TLS handshake for every scrape.
+# requests advertises gzip/deflate, and br when the brotli package is installed.
+_session = requests.Session()
+_session.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+_session.mount('http://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+_session.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# host -> {"requests", "errors", "total_ms", "max_ms"} for this container
+_host_stats = {}
+
+def _fetch(url):
+    """
+    GETs url through the shared session, streaming the body so it can be cut off at
+    MAX_BYTES. Records and logs the fetch latency per host.
+    """
+    host = urlparse(url).hostname or ''
+    stats = _host_stats.setdefault(host, {'requests': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+    start = time.monotonic()
+    try:
+        with _session.get(url, timeout=TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            body = bytearray()
+            for chunk in response.iter_content(CHUNK_BYTES):
+                body += chunk
+                if len(body) > MAX_BYTES:
+                    raise requests.RequestException(f"Response larger than {MAX_BYTES} bytes")
+                if time.monotonic() - start > TOTAL_TIMEOUT:
+                    raise requests.Timeout(f"Fetch took longer than {TOTAL_TIMEOUT}s")
+            return bytes(body)
+    except Exception:
+        stats['errors'] += 1
+        raise
+    finally:
+        elapsed_ms = (time.monotonic() - start) * 1000
+        stats['requests'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        logger.info("Scrape of %s took %.0f ms (host stats: %s)", host, elapsed_ms, stats)
+
+def get_scrape_stats():
+    """ Per-host scrape latency and error counts for this container. """
+    return {host: dict(stats, avg_ms=stats['total_ms'] / stats['requests']) for host, stats in _host_stats.items() if stats['requests']}
+
 def scrape_job_description(url):
     """
     Scrapes the text content from the given URL.
@@ -12,13 +67,9 @@ def scrape_job_description(url):
         return ""
         
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        content = _fetch(url)
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(content, 'html.parser')
         
         # Remove script and style elements
         for script in soup(["script", "style"]):